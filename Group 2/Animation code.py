@@ -1,8 +1,12 @@
 from manim import *
 
+from hanoi_moves import configuration_after, hanoi_moves
+
 class TowerOfHanoi(Scene):
+    n_disks = 5  # number of disks
+
     def construct(self):
-        n = 5  # number of disks
+        n = self.n_disks
 
         rods = self.create_rods()
         disks, stacks = self.create_disks(n, rods[0])
@@ -49,7 +53,10 @@ class TowerOfHanoi(Scene):
         disks = []
         stacks = [[], [], []]
 
+        # Widths shrink by 0.3 per disk, less when that would take the
+        # smallest disk below 0.4 (n > 8), so every disk stays wider than a rod
         width = 2.5
+        step = min(0.3, (width - 0.4) / max(n - 1, 1))
         height = 0.3
         for i in range(n):
             disk = RoundedRectangle(
@@ -64,7 +71,7 @@ class TowerOfHanoi(Scene):
             )
             disks.append(disk)
             stacks[0].append(disk)
-            width -= 0.3
+            width -= step
 
         return disks, stacks
 
@@ -83,3 +90,104 @@ class TowerOfHanoi(Scene):
         self.play(move, run_time=0.5)
 
         stacks[dst].append(disk)
+
+
+class FastTowerOfHanoi(TowerOfHanoi):
+    """
+    Same scene in a single animation: the whole disk trajectory (lift, then
+    slide to the target) is precomputed as a timeline, and one updater
+    places every disk from a ValueTracker counting moves. Above
+    keyframes_above moves no timeline is built; each frame just shows the
+    position after the current move count (configuration_after).
+    """
+    move_time = 0.8          # seconds per move, as lift + move in move_disk
+    lift_share = 0.3 / 0.8   # part of a move spent lifting
+    max_run_time = 60        # cap on the whole animation, in seconds
+    keyframes_above = 255    # beyond this, a move gets under 60/255 s (~4 frames at
+                             # low quality), so only keyframes are shown (n >= 9)
+
+    def construct(self):
+        n = self.n_disks
+
+        rods = self.create_rods()
+        disks, _ = self.create_disks(n, rods[0])
+
+        self.add(rods)
+        self.add(*disks)
+        self.wait()
+
+        total = 2**n - 1
+        tracker = ValueTracker(0)
+        if total > self.keyframes_above:
+            updater = self.keyframe_updater(n, disks, rods, tracker)
+        else:
+            updater = self.timeline_updater(n, disks, rods, tracker)
+        group = VGroup(*disks)
+        group.add_updater(updater)
+        self.play(tracker.animate.set_value(total),
+                  run_time=min(total * self.move_time, self.max_run_time), rate_func=linear)
+        group.remove_updater(updater)
+
+        self.wait()
+
+    def slot(self, rods, peg, level):
+        """Centre of the disk at `level` (0 = bottom) on a peg, as create_disks stacks them"""
+        return rods[peg].get_bottom() + UP * (0.15 + level * 0.3)
+
+    def timeline_updater(self, n, disks, rods, tracker):
+        # timeline[k]: (disk mobject, start, lifted, end) of move k
+        heights = [n, 0, 0]
+        timeline = []
+        for disk, src, dst in hanoi_moves(n, 0, 2, 1):
+            heights[src] -= 1
+            start = self.slot(rods, src, heights[src])
+            end = self.slot(rods, dst, heights[dst])
+            heights[dst] += 1
+            timeline.append((disks[n - disk], start, start + UP * 2, end))
+
+        applied = [0]  # moves already settled at their end position
+
+        def update(group):
+            t = tracker.get_value()
+            k = min(int(t), len(timeline) - 1)
+            for disk, _, _, end in timeline[applied[0]:k]:
+                disk.move_to(end)
+            applied[0] = max(applied[0], k)
+            disk, start, lifted, end = timeline[k]
+            frac = t - k
+            if frac < self.lift_share:
+                disk.move_to(interpolate(start, lifted, smooth(frac / self.lift_share)))
+            else:
+                frac = (frac - self.lift_share) / (1 - self.lift_share)
+                disk.move_to(interpolate(lifted, end, smooth(frac)))
+
+        return update
+
+    def keyframe_updater(self, n, disks, rods, tracker):
+        def update(group):
+            pegs = configuration_after(n, int(tracker.get_value()), 0, 2, 1)
+            for peg, stack in pegs.items():
+                for level, disk in enumerate(stack):
+                    disks[n - disk].move_to(self.slot(rods, peg, level))
+
+        return update
+
+
+if __name__ == "__main__":
+    import os
+    import time
+
+    # Render time and file size of both scenes at low quality, n = 3..10
+    print(f"  {'n':<4} {'Moves':<7} {'Scene':<18} {'Render (s)':<12} {'Size (KB)':<10}")
+    for n in range(3, 11):
+        for scene_class in (TowerOfHanoi, FastTowerOfHanoi):
+            name = f"{scene_class.__name__}_{n}"
+            with tempconfig({"quality": "low_quality", "disable_caching": True,
+                             "output_file": name, "verbosity": "ERROR"}):
+                scene = type(name, (scene_class,), {"n_disks": n})()
+                start_time = time.time()
+                scene.render()
+                runtime = time.time() - start_time
+                size = os.path.getsize(scene.renderer.file_writer.movie_file_path)
+            print(f"  {n:<4} {2**n - 1:<7} {scene_class.__name__:<18} {runtime:<12.2f} "
+                  f"{size / 1024:<10.0f}")
@@ -0,0 +1,117 @@
+from functools import lru_cache
+
+from hanoi_moves import hanoi_moves
+
+
+@lru_cache(maxsize=8)
+def frame_stewart_table(n, pegs):
+    """
+    Frame–Stewart DP over 0..n disks and 3..pegs pegs, bottom-up.
+
+    counts[p][m] is the fewest moves for m disks on p pegs, and
+    splits[p][m] the k that achieves it: move the top k disks aside using
+    all p pegs, the other m - k to the target on the p - 1 pegs left, then
+    the k back on top. Three pegs is the classic 2^m - 1 (split m - 1).
+    Rows below 3 pegs are None.
+    """
+    if pegs < 3:
+        raise ValueError("Tower of Hanoi needs at least 3 pegs")
+    counts = [None] * 3 + [[2**m - 1 for m in range(n + 1)]]
+    splits = [None] * 3 + [[max(m - 1, 0) for m in range(n + 1)]]
+    for p in range(4, pegs + 1):
+        fewer = counts[p - 1]
+        row = [0] * (n + 1)
+        split = [0] * (n + 1)
+        for m in range(1, n + 1):
+            best_k = 0
+            best = fewer[m]
+            for k in range(1, m):
+                moves = 2 * row[k] + fewer[m - k]
+                if moves < best:
+                    best, best_k = moves, k
+            row[m] = best
+            split[m] = best_k
+        counts.append(row)
+        splits.append(split)
+    return counts, splits
+
+
+def frame_stewart_count(n, pegs=4):
+    """Fewest moves for n disks on `pegs` pegs, without listing the moves"""
+    if pegs == 3:
+        return 2**n - 1
+    counts, _ = frame_stewart_table(n, pegs)
+    return counts[pegs][n]
+
+
+def frame_stewart_moves(n, pegs=('A', 'B', 'C', 'D')):
+    """
+    Yield the moves for n disks from pegs[0] to pegs[-1] as
+    (disk, from_peg, to_peg), lazily. Disk 1 is the smallest.
+    """
+    _, splits = frame_stewart_table(n, len(pegs))
+
+    def solve(m, offset, source, target, spare):
+        # m disks offset+1..offset+m, from source to target; spare: free pegs
+        if m == 0:
+            return
+        if len(spare) == 1:
+            for disk, a, b in hanoi_moves(m, source, target, spare[0]):
+                yield disk + offset, a, b
+            return
+        k = splits[len(spare) + 2][m]
+        middle = spare[-1]
+        yield from solve(k, offset, source, middle, spare[:-1] + (target,))
+        yield from solve(m - k, offset + k, source, target, spare[:-1])
+        yield from solve(k, offset, middle, target, spare[:-1] + (source,))
+
+    pegs = tuple(pegs)
+    yield from solve(n, 0, pegs[0], pegs[-1], pegs[1:-1])
+
+
+if __name__ == "__main__":
+    import time
+
+    def naive_count(m, p):
+        """Frame–Stewart by plain recursion over every split point"""
+        if m <= 1:
+            return m
+        if p == 3:
+            return 2**m - 1
+        return min(2 * naive_count(k, p) + naive_count(m - k, p - 1) for k in range(1, m))
+
+    # The generated moves are legal and as many as the table says
+    for p in range(3, 7):
+        pegs = tuple("ABCDEF"[:p])
+        for n in range(1, 13):
+            towers = {peg: [] for peg in pegs}
+            towers[pegs[0]] = list(range(n, 0, -1))
+            count = 0
+            for disk, a, b in frame_stewart_moves(n, pegs):
+                assert towers[a] and towers[a][-1] == disk, (n, p)
+                assert not towers[b] or towers[b][-1] > disk, (n, p)
+                towers[b].append(towers[a].pop())
+                count += 1
+            assert towers[pegs[-1]] == list(range(n, 0, -1)), (n, p)
+            assert count == frame_stewart_count(n, p), (n, p)
+    print("✅ frame_stewart_moves is legal and matches frame_stewart_count (n ≤ 12, 3-6 pegs)")
+
+    print(f"\n  {'n':<6} {'Pegs':<6} {'Moves':<32} {'DP (s)':<10} {'Naive (s)':<10}")
+    for n, p in ((12, 4), (16, 4), (20, 4), (12, 5), (20, 5), (100, 4), (100, 6),
+                 (1000, 4), (1000, 8)):
+        frame_stewart_table.cache_clear()
+        start_time = time.time()
+        count = frame_stewart_count(n, p)
+        dp_time = time.time() - start_time
+        naive = "-"
+        if n <= 20:
+            start_time = time.time()
+            assert naive_count(n, p) == count
+            naive = f"{time.time() - start_time:.3f}"
+        moves = str(count) if len(str(count)) <= 30 else f"~{count:.3e}"
+        print(f"  {n:<6} {p:<6} {moves:<32} {dp_time:<10.3f} {naive:<10}")
+
+    start_time = time.time()
+    total = sum(1 for _ in frame_stewart_moves(20, "ABCD"))
+    print(f"\n  Enumerating n=20 on 4 pegs: {total:,} moves in {time.time() - start_time:.3f}s "
+          f"(3 pegs would need {2**20 - 1:,})")
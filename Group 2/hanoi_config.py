@@ -0,0 +1,150 @@
+from hanoi_moves import hanoi_moves
+
+
+def third_peg(pegs, a, b):
+    return next(peg for peg in pegs if peg != a and peg != b)
+
+
+def check_config(config, target, pegs):
+    unknown = {peg for peg in config if peg not in pegs}
+    if unknown or target not in pegs:
+        raise ValueError(f"pegs must be among {list(pegs)}")
+
+
+def optimal_count(config, target='C', pegs='ABC'):
+    """
+    Fewest moves to gather every disk on `target`, in O(n).
+
+    config[i] is the peg disk i + 1 is on (disk 1 is the smallest); any
+    assignment is a legal position, since each peg's disks stack by size.
+    From the largest disk down: a disk already on the current target costs
+    nothing; otherwise it must move there once, after every smaller disk
+    has been stacked on the third peg, which becomes the target for them
+    (2^(d-1) moves for disk d and the d - 1 disks it has to restack).
+    """
+    check_config(config, target, pegs)
+    moves = 0
+    for disk in range(len(config), 0, -1):
+        peg = config[disk - 1]
+        if peg != target:
+            moves += 2**(disk - 1)
+            target = third_peg(pegs, peg, target)
+    return moves
+
+
+def optimal_moves(config, target='C', pegs='ABC'):
+    """
+    Yield the optimal moves from config (as in optimal_count) to all disks
+    on `target`, as (disk, from_peg, to_peg).
+    """
+    check_config(config, target, pegs)
+
+    def gather(d, target):
+        # Disks 1..d onto target; larger disks stay where they are
+        while d > 0 and config[d - 1] == target:
+            d -= 1
+        if d == 0:
+            return
+        source = config[d - 1]
+        other = third_peg(pegs, source, target)
+        yield from gather(d - 1, other)
+        yield d, source, target
+        # Disks 1..d-1 now form one tower on `other`
+        yield from hanoi_moves(d - 1, other, target, source)
+
+    yield from gather(len(config), target)
+
+
+def optimal_counts(configs, targets=2):
+    """
+    optimal_count over a batch: configs is an (m, n) integer array of peg
+    indices 0-2 (column i for disk i + 1), targets a peg index or an array
+    of m of them. The loop runs over the n disks, each step vectorized over
+    all m configurations. The pegs stay in the caller's integer dtype
+    (int8 is enough); only the returned counts are int64, so n is limited
+    to 63.
+    """
+    import numpy as np
+
+    configs = np.asarray(configs)
+    if configs.dtype.kind not in "iu":
+        raise ValueError("configs must be an integer array")
+    if configs.ndim != 2:
+        raise ValueError("configs must be a 2-D (configurations, disks) array")
+    m, n = configs.shape
+    if n > 63:
+        raise ValueError("optimal_counts supports at most 63 disks")
+    target = np.broadcast_to(np.asarray(targets, dtype=configs.dtype), (m,)).copy()
+    moves = np.zeros(m, dtype=np.int64)
+    for disk in range(n, 0, -1):
+        peg = configs[:, disk - 1]
+        wrong = peg != target
+        moves += wrong * np.int64(1 << (disk - 1))
+        target = np.where(wrong, 3 - peg - target, target)
+    return moves
+
+
+if __name__ == "__main__":
+    import itertools
+    import random
+    import time
+    from collections import deque
+
+    def bfs_distance(n, config, target):
+        """Shortest distance by brute-force search over all 3^n positions"""
+        goal = (target,) * n
+        seen = {tuple(config): 0}
+        queue = deque([tuple(config)])
+        while queue:
+            state = queue.popleft()
+            if state == goal:
+                return seen[state]
+            tops = {}
+            for disk in range(n, 0, -1):
+                tops[state[disk - 1]] = disk  # smallest disk ends up on top
+            for a, disk in tops.items():
+                for b in 'ABC':
+                    if b != a and (b not in tops or tops[b] > disk):
+                        new = state[:disk - 1] + (b,) + state[disk:]
+                        if new not in seen:
+                            seen[new] = seen[state] + 1
+                            queue.append(new)
+
+    # Against brute force, and the generated moves are legal
+    for n in range(1, 6):
+        for config in itertools.product('ABC', repeat=n):
+            count = optimal_count(config)
+            assert count == bfs_distance(n, config, 'C'), config
+            current = list(config)
+            moves = 0
+            for disk, a, b in optimal_moves(config):
+                assert current[disk - 1] == a
+                assert all(current[d] not in (a, b) for d in range(disk - 1))
+                current[disk - 1] = b
+                moves += 1
+            assert moves == count and current == ['C'] * n, config
+    print("✅ optimal_count and optimal_moves match brute-force search for n ≤ 5")
+
+    n = 30
+    config = [random.choice('ABC') for _ in range(n)]
+    print(f"\n  Random {n}-disk position: {optimal_count(config):,} moves "
+          f"(from scratch: {2**n - 1:,})")
+
+    try:
+        import numpy as np
+    except ImportError:
+        print("  NumPy is not installed: skipping the batch benchmark")
+    else:
+        rng = np.random.default_rng(0)
+        configs = rng.integers(0, 3, size=(2000000, 20), dtype=np.int8)
+        start_time = time.time()
+        counts = optimal_counts(configs)
+        runtime = time.time() - start_time
+        letters = [['ABC'[p] for p in row] for row in configs[:1000]]
+        assert list(counts[:1000]) == [optimal_count(row) for row in letters]
+        start_time = time.time()
+        for row in letters:
+            optimal_count(row)
+        loop = (time.time() - start_time) / len(letters) * len(configs)
+        print(f"  Batch of {len(configs):,} 20-disk positions: {runtime:.2f}s "
+              f"({len(configs) / runtime:,.0f}/s); one by one: ~{loop:.1f}s")
@@ -0,0 +1,113 @@
+def peg_order(n, source, destination, auxiliary):
+    """
+    Pegs in the order the bit formulas use: the tower moves from index 0
+    to index 2 when n is odd and to index 1 when n is even.
+    """
+    if n % 2 == 0:
+        return source, destination, auxiliary
+    return source, auxiliary, destination
+
+
+def kth_move(n, k, source='A', destination='C', auxiliary='B'):
+    """
+    Move k (1-based) of the optimal solution as (disk, from_peg, to_peg),
+    in O(1): the disk is the lowest set bit of k, and the pegs follow from
+    k & (k - 1) and k | (k - 1).
+    """
+    if not 1 <= k <= 2**n - 1:
+        raise ValueError(f"k must be between 1 and {2**n - 1}")
+    pegs = peg_order(n, source, destination, auxiliary)
+    disk = (k & -k).bit_length()
+    return disk, pegs[(k & (k - 1)) % 3], pegs[((k | (k - 1)) + 1) % 3]
+
+
+def hanoi_moves(n, source='A', destination='C', auxiliary='B'):
+    """
+    Yield the 2^n - 1 moves of the optimal solution lazily, as
+    (disk, from_peg, to_peg), using constant memory.
+    """
+    pegs = peg_order(n, source, destination, auxiliary)
+    for k in range(1, 2**n):
+        yield (k & -k).bit_length(), pegs[(k & (k - 1)) % 3], pegs[((k | (k - 1)) + 1) % 3]
+
+
+def configuration_after(n, k, source='A', destination='C', auxiliary='B'):
+    """
+    Peg contents after the first k moves, as {peg: [disks, bottom to top]}.
+
+    Walks the bits of k from disk n down: bit d-1 set means disk d has
+    already moved to its target, and the smaller disks are then on their
+    way from the other peg to the same target. O(n), no moves replayed.
+    """
+    if not 0 <= k <= 2**n - 1:
+        raise ValueError(f"k must be between 0 and {2**n - 1}")
+    pegs = {source: [], destination: [], auxiliary: []}
+    for disk in range(n, 0, -1):
+        if k >> (disk - 1) & 1:
+            pegs[destination].append(disk)
+            source, auxiliary = auxiliary, source
+        else:
+            pegs[source].append(disk)
+            destination, auxiliary = auxiliary, destination
+    return pegs
+
+
+if __name__ == "__main__":
+    import contextlib
+    import importlib.util
+    import io
+    import time
+
+    def load_script(filename):
+        """Import one of the Group 2 scripts (their names have spaces)"""
+        spec = importlib.util.spec_from_file_location(filename.split(".")[0].replace(" ", "_"),
+                                                      filename)
+        module = importlib.util.module_from_spec(spec)
+        with contextlib.redirect_stdout(io.StringIO()):
+            spec.loader.exec_module(module)  # runs the script's own n=3 demo
+        return module
+
+    recursive = load_script("Recursive algo.py")
+    iterative = load_script("Iterative.py")
+
+    # Same moves as the recursive version
+    for n in range(1, 11):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            recursive.tower_of_hanoi(n, 'A', 'C', 'B')
+        expected = output.getvalue().splitlines()
+        got = [f"Move disk {d} from {a} to {b}" for d, a, b in hanoi_moves(n)]
+        assert got == expected, n
+        assert configuration_after(n, 2**n - 1)['C'] == list(range(n, 0, -1))
+
+    # configuration_after agrees with replaying the moves
+    n = 8
+    pegs = {'A': list(range(n, 0, -1)), 'B': [], 'C': []}
+    for k, (d, a, b) in enumerate(hanoi_moves(n), 1):
+        assert kth_move(n, k) == (d, a, b), k
+        pegs[b].append(pegs[a].pop())
+        assert pegs == configuration_after(n, k), k
+    print("✅ hanoi_moves, kth_move and configuration_after match the recursive solution")
+
+    print(f"\n  {'n':<4} {'Recursive (s)':<15} {'Iterative (s)':<15} {'Generator (s)':<15}")
+    for n in (12, 16, 20):
+        times = []
+        for solve in (recursive.tower_of_hanoi, iterative.tower_of_hanoi_iterative):
+            start_time = time.time()
+            with contextlib.redirect_stdout(io.StringIO()):
+                solve(n, 'A', 'C', 'B')
+            times.append(time.time() - start_time)
+        start_time = time.time()
+        for move in hanoi_moves(n):
+            pass
+        times.append(time.time() - start_time)
+        print(f"  {n:<4} " + " ".join(f"{t:<15.3f}" for t in times))
+
+    for n in (30, 64):
+        start_time = time.time()
+        k = 2**n // 3
+        move = kth_move(n, k)
+        pegs = configuration_after(n, k)
+        print(f"\n  n={n}: move {k:,} is {move}; "
+              f"{[len(pegs[p]) for p in 'ABC']} disks on A/B/C after it "
+              f"({(time.time() - start_time) * 1e6:.0f} µs)")
@@ -8,15 +8,34 @@ let isAnimating = false;
 let autoplayInterval = null;
 let blockElements = {};
 let currentAlgorithm = null;
+let blockPositions = {};
+let loadToken = 0;
 
 function updateSpeed(value) {
     ANIMATION_SPEED = parseInt(value);
 }
 
+// Solution being viewed. Both export formats are loaded into the same shape:
+// the initial blocks once, then one [blockId, dx, dy] delta per move (dx = rows,
+// dy = cols), plus optional keyframes {moveIndex: [[row, col], ...]} for seeking.
+// Compact (.jsonl) exports are streamed, so `deltas` grows while playing.
+function newSolution(header) {
+    return Object.assign({}, header, {
+        deltas: [],
+        keyframes: {},
+        loaded: false
+    });
+}
+
+function stateCount() {
+    return currentSolution ? currentSolution.deltas.length + 1 : 0;
+}
+
 function initializeBoard(blocks) {
     const boardDiv = document.getElementById('board');
     boardDiv.innerHTML = '';
     blockElements = {};
+    blockPositions = {};
     
     blocks.forEach(block => {
         if (block.id === 0) return;
@@ -37,46 +56,170 @@ function initializeBoard(blocks) {
         
         boardDiv.appendChild(div);
         blockElements[block.id] = div;
+        blockPositions[block.id] = { row: block.row, col: block.col };
     });
 }
 
+function positionsAt(stateIndex) {
+    // Adjacent states are one delta away; anything else replays from the
+    // nearest keyframe (or the initial layout) at or before stateIndex
+    const positions = {};
+    Object.keys(blockPositions).forEach(id => {
+        positions[id] = Object.assign({}, blockPositions[id]);
+    });
+
+    if (stateIndex === currentStateIndex + 1) {
+        const [id, dx, dy] = currentSolution.deltas[currentStateIndex];
+        positions[id].row += dx;
+        positions[id].col += dy;
+        return positions;
+    }
+    if (stateIndex === currentStateIndex - 1) {
+        const [id, dx, dy] = currentSolution.deltas[stateIndex];
+        positions[id].row -= dx;
+        positions[id].col -= dy;
+        return positions;
+    }
+
+    let start = 0;
+    currentSolution.blocks.forEach(block => {
+        positions[block.id] = { row: block.row, col: block.col };
+    });
+    Object.keys(currentSolution.keyframes).forEach(k => {
+        k = parseInt(k);
+        if (k <= stateIndex && k > start) start = k;
+    });
+    if (start > 0) {
+        currentSolution.keyframes[start].forEach(([row, col], i) => {
+            positions[currentSolution.blocks[i].id] = { row, col };
+        });
+    }
+    for (let i = start; i < stateIndex; i++) {
+        const [id, dx, dy] = currentSolution.deltas[i];
+        positions[id].row += dx;
+        positions[id].col += dy;
+    }
+    return positions;
+}
+
 function animateToState(stateIndex, instant = false) {
-    if (!currentSolution || stateIndex < 0 || stateIndex >= currentSolution.states.length) {
+    if (!currentSolution || stateIndex < 0 || stateIndex >= stateCount()) {
         return;
     }
     
+    const positions = positionsAt(stateIndex);
     isAnimating = true;
     currentStateIndex = stateIndex;
-    const state = currentSolution.states[stateIndex];
     
     const animations = [];
-    state.forEach(block => {
-        if (block.id === 0 || !blockElements[block.id]) return;
-        
-        const div = blockElements[block.id];
-        const width = block.width * CELL_SIZE - CELL_GAP;
-        const height = block.height * CELL_SIZE - CELL_GAP;
-        const left = block.col * CELL_SIZE + CELL_GAP;
-        const top = block.row * CELL_SIZE + CELL_GAP;
+    Object.keys(positions).forEach(id => {
+        const div = blockElements[id];
+        const { row, col } = positions[id];
+        if (!div) return;
+        if (row === blockPositions[id].row && col === blockPositions[id].col && !instant) return;
+        blockPositions[id] = { row, col };
         
         animations.push(
             anime({
                 targets: div,
-                left: left,
-                top: top,
-                width: width,
-                height: height,
+                left: col * CELL_SIZE + CELL_GAP,
+                top: row * CELL_SIZE + CELL_GAP,
                 duration: instant ? 0 : ANIMATION_SPEED,
-                easing: 'easeInOutCubic',
-                complete: () => {
-                    isAnimating = false;
-                }
-            })
+                easing: 'easeInOutCubic'
+            }).finished
         );
     });
     
     updateUI();
-    return Promise.all(animations);
+    return Promise.all(animations).then(() => {
+        isAnimating = false;
+    });
+}
+
+function moveName(stateIndex) {
+    // Legacy exports carry move names; compact ones are labelled from the delta
+    if (currentSolution.moves) return currentSolution.moves[stateIndex - 1];
+    const [id, dx, dy] = currentSolution.deltas[stateIndex - 1];
+    const parts = [];
+    if (dx) parts.push((dx < 0 ? 'UP' : 'DOWN') + (Math.abs(dx) > 1 ? ` ×${Math.abs(dx)}` : ''));
+    if (dy) parts.push((dy < 0 ? 'LEFT' : 'RIGHT') + (Math.abs(dy) > 1 ? ` ×${Math.abs(dy)}` : ''));
+    return `${id} ${parts.join(' ')}`;
+}
+
+function fromLegacy(data) {
+    // Full-state export: turn consecutive states into deltas
+    const solution = newSolution(data);
+    delete solution.states;
+    solution.blocks = data.states[0];
+    for (let i = 1; i < data.states.length; i++) {
+        data.states[i].forEach((block, j) => {
+            const prev = data.states[i - 1][j];
+            if (block.row !== prev.row || block.col !== prev.col) {
+                solution.deltas.push([block.id, block.row - prev.row, block.col - prev.col]);
+            }
+        });
+    }
+    solution.loaded = true;
+    return solution;
+}
+
+async function streamSolution(response, onHeader, token) {
+    // Read the JSON Lines export chunk by chunk; the board is drawn as soon
+    // as the header line arrives and moves become playable as they stream in
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    let solution = null;
+
+    const handleLine = line => {
+        if (!line.trim()) return;
+        const record = JSON.parse(line);
+        if (!solution) {
+            solution = newSolution(record);
+            onHeader(solution);
+        } else if (Array.isArray(record)) {
+            solution.deltas.push(record);
+        } else {
+            solution.keyframes[record.keyframe] = record.positions;
+        }
+    };
+
+    while (true) {
+        const { done, value } = await reader.read();
+        if (token !== loadToken) {
+            reader.cancel();
+            return;
+        }
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+        const lines = buffer.split('\n');
+        buffer = lines.pop();
+        lines.forEach(handleLine);
+        if (solution) updateUI();
+    }
+    handleLine(buffer);
+    if (solution) {
+        solution.loaded = true;
+        updateUI();
+    }
+}
+
+function showSolution(solution, algorithm) {
+    currentSolution = solution;
+    currentStateIndex = 0;
+    
+    initializeBoard(solution.blocks);
+    updateUI();
+    enableControls();
+    
+    const algoNames = {
+        'bfs': 'BFS (Breadth-First Search)',
+        'dfs': 'DFS (Depth-First Search)',
+        'astar': 'A* (A-Star Search)'
+    };
+    
+    document.getElementById('moveDisplay').textContent = `${algoNames[algorithm]} loaded! ${solution.num_moves} moves`;
+    document.getElementById('moveDisplay').classList.remove('error');
 }
 
 async function runAlgorithm(algorithm) {
@@ -89,31 +232,25 @@ async function runAlgorithm(algorithm) {
     document.getElementById(`${algorithm}Btn`).classList.add('active');
     
     currentAlgorithm = algorithm;
+    const token = ++loadToken;
     
     try {
+        // Prefer the compact streamed export, fall back to the full JSON one
+        let response = await fetch(`${algorithm}_solution.jsonl`);
+        if (response.ok) {
+            await streamSolution(response, solution => showSolution(solution, algorithm), token);
+            return;
+        }
+
         const filename = `${algorithm}_solution.json`;
-        const response = await fetch(filename);
+        response = await fetch(filename);
         
         if (!response.ok) {
             throw new Error(`Could not load ${filename}. Make sure you ran main.py first!`);
         }
         
-        const solution = await response.json();
-        currentSolution = solution;
-        currentStateIndex = 0;
-        
-        initializeBoard(solution.states[0]);
-        updateUI();
-        enableControls();
-        
-        const algoNames = {
-            'bfs': 'BFS (Breadth-First Search)',
-            'dfs': 'DFS (Depth-First Search)',
-            'astar': 'A* (A-Star Search)'
-        };
-        
-        document.getElementById('moveDisplay').textContent = `${algoNames[algorithm]} loaded! ${solution.num_moves} moves`;
-        document.getElementById('moveDisplay').classList.remove('error');
+        const solution = fromLegacy(await response.json());
+        if (token === loadToken) showSolution(solution, algorithm);
     } catch (error) {
         const msg = document.getElementById('moveDisplay');
         msg.textContent = 'ERROR: Run "python main.py" first to generate JSON files, then start a web server';
@@ -124,7 +261,7 @@ async function runAlgorithm(algorithm) {
 
 function nextMove() {
     if (!currentSolution || isAnimating) return;
-    if (currentStateIndex < currentSolution.states.length - 1) {
+    if (currentStateIndex < stateCount() - 1) {
         animateToState(currentStateIndex + 1);
     }
 }
@@ -157,8 +294,10 @@ function startAutoplay() {
     btn.textContent = '⏸ PAUSE';
     
     autoplayInterval = setInterval(() => {
-        if (currentStateIndex < currentSolution.states.length - 1) {
+        if (currentStateIndex < stateCount() - 1) {
             nextMove();
+        } else if (!currentSolution.loaded) {
+            // Still streaming: wait for the next moves to arrive
         } else {
             stopAutoplay();
         }
@@ -187,8 +326,8 @@ function updateUI() {
     document.getElementById('timeComplex').textContent = currentSolution.time_complexity;
     document.getElementById('spaceComplex').textContent = currentSolution.space_complexity;
     
-    if (currentStateIndex > 0 && currentStateIndex <= currentSolution.moves.length) {
-        const move = currentSolution.moves[currentStateIndex - 1];
+    if (currentStateIndex > 0 && currentStateIndex < stateCount()) {
+        const move = moveName(currentStateIndex);
         document.getElementById('moveDisplay').textContent = `Move ${currentStateIndex}: ${move}`;
     } else if (currentStateIndex === 0) {
         document.getElementById('moveDisplay').textContent = 'Initial State';
@@ -197,7 +336,7 @@ function updateUI() {
     }
     
     document.getElementById('prevBtn').disabled = currentStateIndex === 0;
-    document.getElementById('nextBtn').disabled = currentStateIndex === currentSolution.states.length - 1;
+    document.getElementById('nextBtn').disabled = currentStateIndex === stateCount() - 1;
 }
 
 function enableControls() {
@@ -1,63 +1,275 @@
 import heapq
-from moves import get_neighbors
+import time
+from moves import START, encode_move, get_expander, make_closed_key
+from reconstruct import rebuild_goal
+from telemetry import SearchMetrics
 
 
-def a_star(start_state, max_states=100000):
+def a_star(start_state, max_states=100000, canonical=False, mirror=False, metric="step",
+           metrics=None):
     """
     A* Search with progress monitoring
+
+    canonical/mirror key g_scores on the shape-canonical form of a state,
+    as in bfs(). metric selects the move metric as in bfs(); the
+    heuristics are step counts, so they may overestimate slide counts.
+
+    Like bfs(), no State objects are kept while searching: the heap holds
+    packed keys, and g_scores/came_from map closed-set keys to the best
+    depth and the code of the move that reached it.
+
+    metrics is a telemetry.SearchMetrics collector, as in bfs().
     """
-    counter = 0
-    start_h = start_state.get_heuristic()
-    heap = [(start_h, counter, start_state)]
+    if metrics is None:
+        metrics = SearchMetrics()
+    metrics.start("A*", canonical=canonical, mirror=mirror, metric=metric,
+                  max_states=max_states)
+    layout = start_state.layout
+    expand = metrics.timed("move_generation", get_expander(metric))
+    closed_key = metrics.timed("hashing", make_closed_key(layout, canonical, mirror))
+    heuristic = metrics.timed("heuristic", layout.heuristic)
+    counter = 0  # heap pushes, one heuristic evaluation each
+    start_h = heuristic(start_state.key)
+    heap = [(start_h, counter, 0, start_state.key)]
     
-    g_scores = {start_state: 0}
+    start = closed_key(start_state.key)
+    g_scores = {start: 0}
+    came_from = {start: START}
     
     states_explored = 0
     max_heap_size = 1
     total_branches = 0
     nodes_expanded = 0
-    
-    print("  Progress: ", end="", flush=True)
+    next_sample = metrics.next_sample(0)
     
     while heap:
-        max_heap_size = max(max_heap_size, len(heap))
-        f_score, _, current = heapq.heappop(heap)
+        f_score, _, g, current = heapq.heappop(heap)
         
-        current_g = g_scores.get(current, float('inf'))
+        current_g = g_scores.get(closed_key(current), float('inf'))
         states_explored += 1
         
-        # Progress indicator
-        if states_explored % 1000 == 0:
-            print(f"{states_explored}...", end="", flush=True)
+        if states_explored == next_sample:
+            metrics.sample(states_explored, len(heap) + 1, len(g_scores),
+                           heuristic_evals=counter + 1, f=f_score)
+            next_sample = metrics.next_sample(states_explored)
         
         # Safety limit
         if states_explored > max_states:
-            print(f"\n   Reached exploration limit ({max_states} states)")
             avg_branching = total_branches / nodes_expanded if nodes_expanded > 0 else 0
+            metrics.finish(states_explored, False, max_frontier=max_heap_size,
+                           closed=len(g_scores), heuristic_evals=counter + 1,
+                           avg_branching=avg_branching, limit_reached=True)
+            print(f"   Reached exploration limit ({max_states} states)")
             return None, states_explored, max_heap_size, avg_branching
         
-        if current.is_goal():
-            print(f"{states_explored} ")
-            avg_branching = total_branches / nodes_expanded if nodes_expanded > 0 else 0
-            return current, states_explored, max_heap_size, avg_branching
-        
-        if current_g < current.depth:
+        # Stale entry: a shorter path was found after this one was pushed
+        if current_g < g:
             continue
         
-        neighbors = get_neighbors(current)
+        if layout.is_goal(current):
+            avg_branching = total_branches / nodes_expanded if nodes_expanded > 0 else 0
+            metrics.finish(states_explored, True, depth=g, max_frontier=max_heap_size,
+                           closed=len(g_scores), heuristic_evals=counter + 1,
+                           avg_branching=avg_branching)
+            goal = rebuild_goal(layout, came_from, current, closed_key)
+            return goal, states_explored, max_heap_size, avg_branching
+        
+        successors = expand(layout, current)
         nodes_expanded += 1
-        total_branches += len(neighbors)
+        total_branches += len(successors)
         
-        for neighbor in neighbors:
-            tentative_g = neighbor.depth
+        tentative_g = g + 1
+        for new_key, i, d in successors:
+            key = closed_key(new_key)
             
-            if neighbor not in g_scores or tentative_g < g_scores[neighbor]:
-                g_scores[neighbor] = tentative_g
-                h_score = neighbor.get_heuristic()
+            if key not in g_scores or tentative_g < g_scores[key]:
+                g_scores[key] = tentative_g
+                came_from[key] = encode_move(layout, i, d)
+                h_score = heuristic(new_key)
                 f_score = tentative_g + h_score
                 counter += 1
-                heapq.heappush(heap, (f_score, counter, neighbor))
+                heapq.heappush(heap, (f_score, counter, tentative_g, new_key))
+        
+        # The heap only grows while pushing, so its peak is seen here
+        if len(heap) > max_heap_size:
+            max_heap_size = len(heap)
     
-    print(f"{states_explored} ✗")
     avg_branching = total_branches / nodes_expanded if nodes_expanded > 0 else 0
+    metrics.finish(states_explored, False, max_frontier=max_heap_size, closed=len(g_scores),
+                   heuristic_evals=counter + 1, avg_branching=avg_branching)
     return None, states_explored, max_heap_size, avg_branching
+
+
+def report_solution(result):
+    """Default anytime_a_star callback: one line per improved solution"""
+    if result['optimal']:
+        status = "optimal"
+    elif result['bound'] is not None:
+        status = f"≤ {result['bound']:.3f} × optimal"
+    else:
+        status = "no bound without an admissible heuristic"
+    print(f"  w={result['weight']:.2f}: {result['moves']} moves ({status}), "
+          f"{result['states_explored']:,} states, {result['elapsed']:.2f}s")
+
+
+def anytime_a_star(start_state, callback=report_solution, weight=5.0, weight_step=0.5,
+                   deadline=None, max_states=1000000, canonical=False, mirror=False,
+                   metric="step", metrics=None):
+    """
+    Anytime weighted A* (ARA*-style) for quick hints that improve over time.
+
+    Searches with f = g + w*h starting from a large w. Each time a search
+    round settles with a shorter solution than the last one reported, it
+    is passed to callback as a dict (goal, moves, weight, bound, optimal,
+    states_explored, elapsed); then w is lowered by weight_step and the
+    next round reuses every g value found so far (states improved after
+    being expanded are carried over and re-opened), until w reaches 1 or
+    the solution is proven optimal, or until `deadline` seconds have passed.
+
+    bound is the proven suboptimality factor, min(w, cost / min(g + h))
+    over the states still open. It needs an admissible heuristic, so it is
+    only computed with pattern DBs attached (see pattern_db); otherwise
+    bound is None and optimal is never claimed. The final bound and
+    optimality, which may tighten without a new solution, are in the
+    summary of metrics, a telemetry.SearchMetrics collector.
+
+    Returns the best (goal, states_explored, max_space, avg_branching).
+    """
+    if metrics is None:
+        metrics = SearchMetrics(sample_every=0, progress=False)
+    metrics.start("Anytime A*", canonical=canonical, mirror=mirror, metric=metric,
+                  max_states=max_states, weight=weight, weight_step=weight_step)
+    layout = start_state.layout
+    expand = get_expander(metric)
+    closed_key = make_closed_key(layout, canonical, mirror)
+    heuristic = layout.heuristic
+    admissible = bool(layout.pattern_dbs)
+    start_time = time.perf_counter()
+    stop_at = start_time + deadline if deadline is not None else None
+
+    start = closed_key(start_state.key)
+    g_scores = {start: 0}
+    came_from = {start: START}
+    open_keys = {start: start_state.key}  # closed key -> real key, for re-sorting
+    incons = {}  # improved after expansion in this round
+
+    best_cost = float('inf')
+    best_key = None
+    goal = None
+    bound = None
+    reported = float('inf')  # cost of the last solution passed to callback
+    counter = 0
+    heap = [(weight * heuristic(start_state.key), counter, 0, start_state.key)]
+
+    states_explored = 0
+    max_heap_size = 1
+    total_branches = 0
+    nodes_expanded = 0
+    out_of_budget = False
+
+    while True:
+        # One round of weighted A*, stopped once the incumbent is w-suboptimal
+        closed = set()
+        while heap:
+            f_score, _, g, current = heap[0]
+            key = closed_key(current)
+            if key not in open_keys or g_scores[key] < g:
+                heapq.heappop(heap)  # stale entry
+                continue
+            if best_cost <= f_score:
+                break
+            # Checked before popping, so an unexpanded state stays open
+            # and still counts towards the bound
+            if states_explored >= max_states or (
+                    stop_at is not None and states_explored % 256 == 0
+                    and time.perf_counter() > stop_at):
+                out_of_budget = True
+                break
+            heapq.heappop(heap)
+            del open_keys[key]
+            closed.add(key)
+            states_explored += 1
+
+            if layout.is_goal(current):
+                continue
+
+            successors = expand(layout, current)
+            nodes_expanded += 1
+            total_branches += len(successors)
+
+            tentative_g = g + 1
+            for new_key, i, d in successors:
+                key = closed_key(new_key)
+                if tentative_g < g_scores.get(key, float('inf')):
+                    g_scores[key] = tentative_g
+                    came_from[key] = encode_move(layout, i, d)
+                    if layout.is_goal(new_key) and tentative_g < best_cost:
+                        best_cost = tentative_g
+                        best_key = new_key
+                    if key in closed:
+                        incons[key] = new_key
+                    else:
+                        open_keys[key] = new_key
+                        counter += 1
+                        heapq.heappush(heap, (tentative_g + weight * heuristic(new_key),
+                                              counter, tentative_g, new_key))
+            if len(heap) > max_heap_size:
+                max_heap_size = len(heap)
+
+        if best_key is not None:
+            # Parents may have improved since, so the rebuilt path can be shorter
+            goal = rebuild_goal(layout, came_from, best_key, closed_key)
+            best_cost = goal.depth
+            if admissible:
+                pending = list(open_keys.items()) + list(incons.items())
+                lower = min((g_scores[key] + heuristic(real) for key, real in pending),
+                            default=best_cost)
+                bound = best_cost / lower if lower > 0 else float('inf')
+                if not out_of_budget:
+                    bound = min(bound, weight)  # a finished round is w-suboptimal
+                bound = max(bound, 1.0)
+            if callback is not None and best_cost < reported:
+                reported = best_cost
+                callback({
+                    'goal': goal,
+                    'moves': best_cost,
+                    'weight': weight,
+                    'bound': bound,
+                    'optimal': bound == 1.0,
+                    'states_explored': states_explored,
+                    'elapsed': time.perf_counter() - start_time,
+                })
+            if bound == 1.0:
+                break
+
+        if out_of_budget or weight <= 1.0 or not (heap or incons):
+            break
+
+        # Next round: lower w, re-open the inconsistent states, re-sort OPEN
+        weight = max(1.0, weight - weight_step)
+        open_keys.update(incons)
+        incons = {}
+        heap = []
+        for key, real in open_keys.items():
+            g = g_scores[key]
+            counter += 1
+            heap.append((g + weight * heuristic(real), counter, g, real))
+        heapq.heapify(heap)
+
+    avg_branching = total_branches / nodes_expanded if nodes_expanded > 0 else 0
+    metrics.finish(states_explored, goal is not None, depth=goal.depth if goal else None,
+                   weight=weight, bound=bound, optimal=bound == 1.0,
+                   max_frontier=max_heap_size, closed=len(g_scores),
+                   avg_branching=avg_branching, limit_reached=out_of_budget)
+    return goal, states_explored, max_heap_size, avg_branching
+
+
+if __name__ == "__main__":
+    from main import create_initial_state
+
+    print("Anytime weighted A* on the start layout:")
+    metrics = SearchMetrics(sample_every=0, progress=False)
+    goal, states, space, _ = anytime_a_star(create_initial_state(), deadline=60,
+                                            metrics=metrics)
+    print(f"  best: {goal.depth} moves, {states:,} states, peak open list {space:,}"
+          f" (proven optimal: {metrics.summary['optimal']})")
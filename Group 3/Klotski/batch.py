@@ -0,0 +1,163 @@
+import contextlib
+import hashlib
+import io
+import json
+import multiprocessing as mp
+import os
+import time
+
+from astar import a_star
+from bfs import bfs
+from layout_file import load_layouts, state_from_spec
+from pattern_db import PatternDB, build_pattern_db, pattern_presets, use_pattern_dbs
+from reconstruct import reconstruct_path
+
+SOLVERS = {"bfs": bfs, "astar": a_star}
+
+# Per-process warm state: one Layout per piece set, reused across puzzles
+_options = {}
+_layouts = {}
+
+
+def pattern_db_files(layout, db_dir):
+    """Pattern DB filenames for a layout's piece set, keyed by its signature"""
+    signature = (layout.rows, layout.cols, layout.goal_cell,
+                 layout.ids, layout.widths, layout.heights)
+    tag = hashlib.sha1(repr(signature).encode()).hexdigest()[:12]
+    return {name: (pattern, os.path.join(db_dir, f"pdb_{tag}_{name}.db"))
+            for name, pattern in pattern_presets(layout).items()}
+
+
+def build_batch_pattern_dbs(specs, db_dir):
+    """Build (once, before the pool starts) the pattern DBs of every piece set in the batch"""
+    os.makedirs(db_dir, exist_ok=True)
+    layouts = {}
+    for spec in specs:
+        try:
+            layout = state_from_spec(spec, layouts).layout
+        except Exception:
+            continue  # solve_spec records the error for this layout
+        for pattern, filename in pattern_db_files(layout, db_dir).values():
+            if not os.path.exists(filename):
+                build_pattern_db(layout, pattern, filename)
+
+
+def init_worker(options):
+    """Pool initializer: set the batch options and start with an empty cache"""
+    _options.clear()
+    _options.update(options)
+    _layouts.clear()
+
+
+def solve_spec(spec):
+    """
+    Solve one layout spec with the batch options; returns its result record.
+    Any failure (a malformed spec, a solver error, running out of memory)
+    is recorded as solved=False with the error, so the batch carries on.
+    """
+    record = {"name": spec["name"], "algorithm": _options["algorithm"]}
+    try:
+        known = len(_layouts)
+        start_state = state_from_spec(spec, _layouts)
+        layout = start_state.layout
+        if _options["db_dir"] and len(_layouts) > known:
+            use_pattern_dbs(layout, [PatternDB(filename, layout) for _, filename in
+                                     pattern_db_files(layout, _options["db_dir"]).values()])
+
+        solver = SOLVERS[_options["algorithm"]]
+        start_time = time.time()
+        with contextlib.redirect_stdout(io.StringIO()):
+            goal, states_explored, max_space, _ = solver(
+                start_state, max_states=_options["max_states"],
+                canonical=_options["canonical"], mirror=_options["mirror"])
+        runtime = time.time() - start_time
+        _, moves = reconstruct_path(goal)
+    except Exception as e:
+        record.update(solved=False, error=f"{type(e).__name__}: {e}")
+        return record
+
+    record.update(solved=goal is not None,
+                  moves=len(moves) if goal else None,
+                  states_explored=states_explored,
+                  max_space=max_space,
+                  runtime=round(runtime, 4),
+                  solution=moves)
+    return record
+
+
+def solve_batch(specs, algorithm="astar", workers=None, max_states=1000000,
+                canonical=True, mirror=False, db_dir=None, output=None):
+    """
+    Solve a corpus of layout specs across a process pool. Each worker keeps
+    its own Layout cache, so puzzles sharing a piece set reuse the move
+    tables (and pattern DBs, when db_dir is given and algorithm is A*).
+    Records come back in input order; with `output` they are also written
+    as JSON Lines, one record per layout.
+    """
+    if algorithm not in SOLVERS:
+        raise ValueError(f"Unknown algorithm {algorithm!r}, expected one of {sorted(SOLVERS)}")
+    if workers is None:
+        workers = min(mp.cpu_count(), len(specs)) or 1
+    if db_dir and algorithm == "astar":
+        build_batch_pattern_dbs(specs, db_dir)
+    else:
+        db_dir = None
+
+    options = dict(algorithm=algorithm, max_states=max_states,
+                   canonical=canonical, mirror=mirror, db_dir=db_dir)
+
+    records = []
+    out = open(output, "w") if output else None
+    try:
+        if workers == 1:
+            init_worker(options)
+            results = map(solve_spec, specs)
+            pool = None
+        else:
+            pool = mp.Pool(workers, initializer=init_worker, initargs=(options,))
+            results = pool.imap(solve_spec, specs)
+
+        for record in results:
+            records.append(record)
+            if record["solved"]:
+                status = f"{record['moves']} moves"
+            else:
+                status = "✗ error" if "error" in record else "✗ not solved"
+            print(f"  {record['name']:<20} {status:<14} "
+                  f"{record.get('states_explored', 0):>10,} states "
+                  f"{record.get('runtime', 0):>8.2f}s")
+            if "error" in record:
+                print(f"    {record['error']}")
+            if out:
+                out.write(json.dumps(record) + "\n")
+                out.flush()
+
+        if pool:
+            pool.close()
+            pool.join()
+    finally:
+        if out:
+            out.close()
+    return records
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) < 2:
+        print("Usage: python batch.py LAYOUT_FILE [bfs|astar] [WORKERS] [OUTPUT.jsonl]")
+        sys.exit(1)
+
+    layout_file = sys.argv[1]
+    algorithm = sys.argv[2] if len(sys.argv) > 2 else "astar"
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else None
+    output = sys.argv[4] if len(sys.argv) > 4 else "batch_results.jsonl"
+
+    specs = load_layouts(layout_file)
+    print(f"🧩 Solving {len(specs)} layouts from {layout_file} with {algorithm}")
+    start_time = time.time()
+    records = solve_batch(specs, algorithm=algorithm, workers=workers,
+                          db_dir="pattern_dbs", output=output)
+    solved = sum(record["solved"] for record in records)
+    print(f"\n✓ {solved}/{len(records)} solved in {time.time() - start_time:.2f}s "
+          f"→ {output}")
@@ -0,0 +1,292 @@
+import contextlib
+import io
+import json
+import multiprocessing as mp
+import os
+import platform
+import sys
+import time
+import traceback
+
+from astar import a_star
+from bfs import bfs
+from bidirectional import bidirectional_bfs
+from bucket_astar import bucket_a_star
+from external_bfs import external_bfs
+from idastar import ida_star
+from layout_file import load_layouts, state_from_spec
+from memory import peak_rss, reset_peak_rss
+from parallel_bfs import parallel_bfs
+
+try:
+    from numpy_bfs import numpy_bfs
+except ImportError:  # NumPy is optional
+    numpy_bfs = None
+
+CORPUS = "benchmark_layouts.txt"
+BASELINE = "benchmark_baseline.json"
+MAX_STATES = 3000000
+
+# Solver modes under benchmark: name -> solver call on a start state
+MODES = {
+    "bfs": lambda s: bfs(s, max_states=MAX_STATES),
+    "bfs-canonical": lambda s: bfs(s, max_states=MAX_STATES, canonical=True, mirror=True),
+    "bfs-slide": lambda s: bfs(s, max_states=MAX_STATES, metric="slide"),
+    "bfs-slide-canonical": lambda s: bfs(s, max_states=MAX_STATES, canonical=True, mirror=True,
+                                         metric="slide"),
+    "astar": lambda s: a_star(s, max_states=MAX_STATES),
+    "astar-canonical": lambda s: a_star(s, max_states=MAX_STATES, canonical=True),
+    "bucket-astar": lambda s: bucket_a_star(s, max_states=MAX_STATES),
+    "bucket-astar-canonical": lambda s: bucket_a_star(s, max_states=MAX_STATES, canonical=True),
+    "bibfs": lambda s: bidirectional_bfs(s, max_states=MAX_STATES),
+    "external-bfs": lambda s: external_bfs(s, max_states=MAX_STATES),
+    # peak_rss covers the calling process only, not the shard workers
+    "parallel-bfs": lambda s: parallel_bfs(s, max_states=MAX_STATES, workers=2),
+    "ida-star": lambda s: ida_star(s, max_states=MAX_STATES, tt_size=100000),
+}
+if numpy_bfs is not None:
+    MODES["numpy-bfs"] = lambda s: numpy_bfs(s, max_states=MAX_STATES)
+
+# Cases left out: with four identical singles and four identical verticals
+# the exact-key modes exceed MAX_STATES on the classic layout, and IDA*
+# without pattern DBs cannot solve the full puzzles (see main.RUN_IDA_STAR)
+SKIPPED = {
+    "start": {"ida-star"},
+    "bing-fen-san-lu": {"ida-star"},
+    "heng-dao-li-ma": {"bfs", "bfs-slide", "astar", "bucket-astar", "bibfs", "external-bfs",
+                       "parallel-bfs", "ida-star", "numpy-bfs"},
+}
+
+# Metrics compared against the baseline; all of them are "higher is worse"
+COMPARED = ("wall_time", "peak_rss", "expanded", "max_space")
+
+# Metrics that depend on the machine; they are only compared against a
+# baseline recorded on the same one (see machine_info)
+MACHINE_DEPENDENT = ("wall_time", "peak_rss")
+
+# Absolute changes below these are timer/allocator noise, never regressions
+NOISE_FLOOR = {"wall_time": 0.05, "peak_rss": 2 * 1024 * 1024}
+
+
+def run_case(spec, mode):
+    """Solve one layout with one mode (in a fresh worker process) and measure it"""
+    start_state = state_from_spec(spec)
+    reset_peak_rss()
+    start_time = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        goal, expanded, max_space, _ = MODES[mode](start_state)
+    wall_time = time.perf_counter() - start_time
+    return {
+        "layout": spec["name"],
+        "mode": mode,
+        "solved": goal is not None,
+        "moves": goal.depth if goal else None,
+        "expanded": expanded,
+        "max_space": max_space,
+        "wall_time": round(wall_time, 4),
+        "states_per_sec": round(expanded / wall_time) if wall_time > 0 else None,
+        "peak_rss": peak_rss(),
+    }
+
+
+def case_worker(spec, mode, results):
+    """Worker process for one case; not a pool worker, so solvers may start processes"""
+    try:
+        results.put(run_case(spec, mode))
+    except Exception:
+        results.put({"error": traceback.format_exc()})
+
+
+def run_isolated(spec, mode):
+    """run_case in a fresh process"""
+    ctx = mp.get_context()
+    results = ctx.Queue()
+    process = ctx.Process(target=case_worker, args=(spec, mode, results))
+    process.start()
+    record = results.get()
+    process.join()
+    if "error" in record:
+        raise RuntimeError(f"{spec['name']} / {mode} failed:\n{record['error']}")
+    return record
+
+
+def machine_info():
+    """What the timings and memory figures of a run depend on"""
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def run_suite(corpus=CORPUS, modes=None, layouts=None, repeat=1):
+    """
+    Run every (layout, mode) case of the corpus. Each case runs in its own
+    process so peak memory is not inherited from earlier cases; with
+    repeat > 1 the fastest run is kept.
+    """
+    specs = load_layouts(corpus)
+    if layouts:
+        specs = [spec for spec in specs if spec["name"] in layouts]
+    modes = modes or list(MODES)
+    unknown = [mode for mode in modes if mode not in MODES]
+    if unknown:
+        hint = " (numpy-bfs needs NumPy)" if "numpy-bfs" in unknown else ""
+        raise ValueError(f"Unknown mode(s) {unknown}{hint}, expected some of {list(MODES)}")
+
+    print(f"  {'Layout':<18} {'Mode':<24} {'Moves':<7} {'Expanded':<11} "
+          f"{'Time (s)':<10} {'States/s':<10} {'Mem (MB)':<9}")
+    print(f"  {'-' * 93}")
+
+    records = []
+    for spec in specs:
+        for mode in modes:
+            if mode in SKIPPED.get(spec["name"], ()):
+                continue
+            best = None
+            for _ in range(repeat):
+                record = run_isolated(spec, mode)
+                if best is None or record["wall_time"] < best["wall_time"]:
+                    best = record
+            records.append(best)
+            moves = best["moves"] if best["solved"] else "✗"
+            print(f"  {best['layout']:<18} {mode:<24} {moves!s:<7} {best['expanded']:<11,} "
+                  f"{best['wall_time']:<10.3f} {best['states_per_sec'] or 0:<10,} "
+                  f"{best['peak_rss'] / 1024 / 1024:<9.1f}")
+
+    return {
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "machine": machine_info(),
+        "corpus": corpus,
+        "max_states": MAX_STATES,
+        "repeat": repeat,
+        "results": records,
+    }
+
+
+def save_results(results, filename):
+    with open(filename, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"✓ Exported to {filename}")
+
+
+def load_results(filename):
+    with open(filename) as f:
+        return json.load(f)
+
+
+def compare(current, baseline, threshold=0.10):
+    """
+    Compare a run against a baseline. A case regresses when any compared
+    metric grows by more than `threshold` (a fraction, and by more than its
+    NOISE_FLOOR) or when it no longer finds the same number of moves. Returns the list of regressions.
+
+    Time and memory (MACHINE_DEPENDENT) are only compared when both runs
+    come from the same machine, Python and CPU count; otherwise they are
+    shown as "-" and only the search counters are checked.
+    """
+    base = {(r["layout"], r["mode"]): r for r in baseline["results"]}
+    regressions = []
+
+    same_machine = current.get("machine") == baseline.get("machine")
+    if not same_machine:
+        theirs, ours = baseline.get("machine", {}), current.get("machine", {})
+        differences = [f"{key} {theirs.get(key)} → {ours.get(key)}"
+                       for key in sorted(set(theirs) | set(ours))
+                       if theirs.get(key) != ours.get(key)]
+        print(f"  Baseline was recorded on another machine ({', '.join(differences)}):")
+        print(f"  skipping {', '.join(MACHINE_DEPENDENT)}\n")
+
+    print(f"  {'Layout':<18} {'Mode':<24} " +
+          " ".join(f"{name:<12}" for name in COMPARED))
+    print(f"  {'-' * 96}")
+
+    for record in current["results"]:
+        case = (record["layout"], record["mode"])
+        old = base.get(case)
+        if old is None:
+            print(f"  {case[0]:<18} {case[1]:<24} (not in baseline)")
+            continue
+
+        cells = []
+        for name in COMPARED:
+            if name in MACHINE_DEPENDENT and not same_machine:
+                cells.append("-".ljust(12))
+                continue
+            before, after = old[name], record[name]
+            change = (after - before) / before if before else 0.0
+            noise = after - before <= NOISE_FLOOR.get(name, 0)
+            flag = " ⚠️" if change > threshold and not noise else ""
+            if flag:
+                regressions.append((case, name, before, after))
+            cells.append(f"{change:+.1%}{flag}".ljust(12))
+        if record["moves"] != old["moves"]:
+            regressions.append((case, "moves", old["moves"], record["moves"]))
+            cells.append(f"moves {old['moves']} → {record['moves']} ⚠️")
+        print(f"  {case[0]:<18} {case[1]:<24} " + " ".join(cells))
+
+    ran = {(r["layout"], r["mode"]) for r in current["results"]}
+    missing = [case for case in base if case not in ran]
+    if missing:
+        listed = ", ".join(f"{layout} / {mode}" for layout, mode in missing[:10])
+        more = f" and {len(missing) - 10} more" if len(missing) > 10 else ""
+        print(f"\n  {len(missing)} baseline case(s) not run: {listed}{more}")
+
+    print()
+    if regressions:
+        print(f"  ⚠️  {len(regressions)} regression(s) beyond {threshold:.0%}:")
+        for (layout, mode), name, before, after in regressions:
+            print(f"     {layout} / {mode}: {name} {before} → {after}")
+    else:
+        print(f"  ✓ No regressions beyond {threshold:.0%}")
+    return regressions
+
+
+def parse_options(args):
+    """Split --key=value options from positional arguments"""
+    options = {}
+    positional = []
+    for arg in args:
+        if arg.startswith("--"):
+            key, _, value = arg[2:].partition("=")
+            options[key] = value
+        else:
+            positional.append(arg)
+    return positional, options
+
+
+if __name__ == "__main__":
+    usage = """Usage:
+  python benchmark.py run [OUTPUT]              run the suite (default benchmark_results.json)
+  python benchmark.py baseline                  run the suite and store it as the baseline
+  python benchmark.py compare [RESULTS] [BASE]  compare RESULTS (or a fresh run) to BASE
+Options: --modes=bfs,astar  --layouts=start,...  --repeat=N  --threshold=0.10"""
+
+    positional, options = parse_options(sys.argv[1:])
+    if not positional or positional[0] not in ("run", "baseline", "compare"):
+        print(usage)
+        sys.exit(1)
+    command = positional[0]
+
+    suite = dict(
+        modes=options["modes"].split(",") if options.get("modes") else None,
+        layouts=options["layouts"].split(",") if options.get("layouts") else None,
+        repeat=int(options.get("repeat", 1)),
+    )
+
+    if command == "run":
+        save_results(run_suite(**suite),
+                     positional[1] if len(positional) > 1 else "benchmark_results.json")
+    elif command == "baseline":
+        save_results(run_suite(**suite), BASELINE)
+    else:
+        if len(positional) > 1:
+            current = load_results(positional[1])
+        else:
+            current = run_suite(**suite)
+        baseline = load_results(positional[2] if len(positional) > 2 else BASELINE)
+        print()
+        regressions = compare(current, baseline, float(options.get("threshold", 0.10)))
+        sys.exit(1 if regressions else 0)
@@ -1,55 +1,157 @@
-from collections import deque
-from moves import get_neighbors
+from array import array
+from bisect import bisect_left
+from moves import START, encode_move, get_expander, make_closed_key
+from reconstruct import rebuild_goal
+from telemetry import SearchMetrics
 
 
-def bfs(start_state, max_states=200000):
+class ClosedLayers:
+    """
+    Compact BFS closed table, one entry per depth layer. A finished layer
+    is frozen into a sorted array of closed-set keys plus a parallel array
+    of move codes (9 bytes per state for one-cell steps); only the few
+    layers a search still checks for duplicates are dicts.
+    Supports table[key] -> move code, as rebuild_goal expects.
+    """
+
+    def __init__(self, code_type):
+        self.code_type = code_type
+        self.layers = []
+
+    def add(self, layer):
+        """Append a layer dict (closed-set key -> move code)"""
+        self.layers.append(layer)
+
+    def freeze(self, depth):
+        """Replace layer dict at depth by its sorted-array form"""
+        layer = self.layers[depth]
+        if not isinstance(layer, dict) or START in layer.values():
+            return
+        keys = sorted(layer)
+        try:
+            frozen = (array("Q", keys), array(self.code_type, (layer[k] for k in keys)))
+        except OverflowError:
+            return  # keys wider than 64 bits: keep the dict
+        self.layers[depth] = frozen
+
+    def find(self, depth, key):
+        """Move code of key if it is in the given layer, else None"""
+        layer = self.layers[depth]
+        if isinstance(layer, dict):
+            return layer.get(key)
+        keys, codes = layer
+        i = bisect_left(keys, key)
+        if i < len(keys) and keys[i] == key:
+            return codes[i]
+        return None
+
+    def __getitem__(self, key):
+        for depth in range(len(self.layers) - 1, -1, -1):
+            code = self.find(depth, key)
+            if code is not None:
+                return code
+        raise KeyError(key)
+
+
+def bfs(start_state, max_states=200000, canonical=False, mirror=False, metric="step",
+        metrics=None):
     """
     Breadth-First Search with progress monitoring and safety limits
+
+    With canonical=True the visited set is keyed on piece shape rather than
+    block id (see Layout.canonical); mirror=True also folds left-right
+    mirror images together. The queue still holds real configurations,
+    so the returned path is an exact, id-accurate move sequence.
+
+    metric selects what counts as one move: "step" (one cell) or
+    "slide" (one block moved any distance); see moves.METRICS.
+
+    No State objects are kept while searching: the queue holds packed
+    keys and the closed table (ClosedLayers) maps each closed-set key to
+    the code of the move that reached it. The path is rebuilt at the end.
+
+    metrics is a telemetry.SearchMetrics collector; the default one only
+    prints progress.
     """
-    queue = deque([start_state])
-    visited = {start_state}
+    if metrics is None:
+        metrics = SearchMetrics()
+    metrics.start("BFS", canonical=canonical, mirror=mirror, metric=metric,
+                  max_states=max_states)
+    layout = start_state.layout
+    expand = metrics.timed("move_generation", get_expander(metric))
+    closed_key = metrics.timed("hashing", make_closed_key(layout, canonical, mirror))
+
+    # Successors of layer d can only lie in layers d-1, d or d+1, so those
+    # stay dicts for fast lookups; older layers are frozen and only needed
+    # again to rebuild the path
+    code_type = "B" if metric == "step" and 4 * len(layout.ids) < 256 else "Q"
+    closed = ClosedLayers(code_type)
+    closed.add({closed_key(start_state.key): START})
+    layer = [start_state.key]
+    depth = 0
     
     states_explored = 0
     max_queue_size = 1
     total_branches = 0
     nodes_expanded = 0
+    closed_size = 1  # states in the finished layers
+    next_sample = metrics.next_sample(0)
     
-    print("  Progress: ", end="", flush=True)
-    
-    while queue:
-        max_queue_size = max(max_queue_size, len(queue))
-        
-        current = queue.popleft()
-        states_explored += 1
-        
-        # Progress indicator every 1000 states
-        if states_explored % 1000 == 0:
-            print(f"{states_explored}...", end="", flush=True)
-        
-        # Safety limit to prevent infinite loops
-        if states_explored > max_states:
-            print(f"\n  ⚠️  Reached exploration limit ({max_states} states)")
-            print(f"  ⚠️  No solution found within limit")
-            avg_branching = total_branches / nodes_expanded if nodes_expanded > 0 else 0
-            return None, states_explored, max_queue_size, avg_branching
-        
-        # Check if goal reached
-        if current.is_goal():
-            print(f"{states_explored} ✓")
-            avg_branching = total_branches / nodes_expanded if nodes_expanded > 0 else 0
-            return current, states_explored, max_queue_size, avg_branching
+    while layer:
+        next_layer = []
+        next_codes = {}
+        closed.add(next_codes)
         
-        # Generate neighbors
-        neighbors = get_neighbors(current)
-        nodes_expanded += 1
-        total_branches += len(neighbors)
+        for index, current in enumerate(layer):
+            # Queue = rest of this layer + the part of the next one built so far
+            max_queue_size = max(max_queue_size, len(layer) - index + len(next_layer))
+            states_explored += 1
+            
+            if states_explored == next_sample:
+                metrics.sample(states_explored, len(layer) - index + len(next_layer),
+                               closed_size + len(next_codes), depth=depth)
+                next_sample = metrics.next_sample(states_explored)
+            
+            # Safety limit to prevent infinite loops
+            if states_explored > max_states:
+                avg_branching = total_branches / nodes_expanded if nodes_expanded > 0 else 0
+                metrics.finish(states_explored, False, max_frontier=max_queue_size,
+                               closed=closed_size + len(next_codes),
+                               avg_branching=avg_branching, limit_reached=True)
+                print(f"  ⚠️  Reached exploration limit ({max_states} states)")
+                print(f"  ⚠️  No solution found within limit")
+                return None, states_explored, max_queue_size, avg_branching
+            
+            # Check if goal reached
+            if layout.is_goal(current):
+                avg_branching = total_branches / nodes_expanded if nodes_expanded > 0 else 0
+                metrics.finish(states_explored, True, depth=depth, max_frontier=max_queue_size,
+                               closed=closed_size + len(next_codes),
+                               avg_branching=avg_branching)
+                goal = rebuild_goal(layout, closed, current, closed_key)
+                return goal, states_explored, max_queue_size, avg_branching
+            
+            # Generate neighbors
+            successors = expand(layout, current)
+            nodes_expanded += 1
+            total_branches += len(successors)
+            
+            for new_key, i, d in successors:
+                key = closed_key(new_key)
+                if (key in next_codes or closed.find(depth, key) is not None
+                        or (depth > 0 and closed.find(depth - 1, key) is not None)):
+                    continue
+                next_codes[key] = encode_move(layout, i, d)
+                next_layer.append(new_key)
         
-        for neighbor in neighbors:
-            if neighbor not in visited:
-                visited.add(neighbor)
-                queue.append(neighbor)
+        if depth > 0:
+            closed.freeze(depth - 1)
+        closed_size += len(next_codes)
+        layer = next_layer
+        depth += 1
     
     # No solution found
-    print(f"{states_explored} ✗")
     avg_branching = total_branches / nodes_expanded if nodes_expanded > 0 else 0
+    metrics.finish(states_explored, False, max_frontier=max_queue_size, closed=closed_size,
+                   avg_branching=avg_branching)
     return None, states_explored, max_queue_size, avg_branching
@@ -0,0 +1,184 @@
+from moves import START, encode_move, expand_key, make_closed_key, move_name
+from reconstruct import rebuild_goal
+from state import State
+from telemetry import SearchMetrics
+
+
+def goal_states(layout, canonical=False):
+    """
+    Enumerate every goal configuration of a layout's piece set:
+    block 1 at the goal cell and every other block placed anywhere
+    it fits without overlapping. Returns a list of packed keys.
+    With canonical=True, blocks of the same shape are only placed in
+    increasing position order, giving one key per Layout.canonical class.
+    """
+    red = layout.index.get(1)
+    if red is None:
+        return []
+
+    order = [i for i in range(len(layout.ids)) if i != red]
+    previous = {}  # block index -> the same-shape block placed before it
+    if canonical:
+        for group in layout.groups:
+            previous.update(zip(group[1:], group))
+    positions = [0] * len(layout.ids)
+    positions[red] = layout.goal_cell
+    keys = []
+
+    def place(k, occ):
+        if k == len(order):
+            keys.append(layout.pack(positions))
+            return
+        i = order[k]
+        first = positions[previous[i]] + 1 if i in previous else 0
+        for pos, mask in enumerate(layout.cell_masks[i][first:], first):
+            if mask is not None and not mask & occ:
+                positions[i] = pos
+                place(k + 1, occ | mask)
+
+    place(0, layout.cell_masks[red][layout.goal_cell])
+    return keys
+
+
+def find_key(frontier, key, closed_key):
+    """The packed key in a frontier whose closed-set key is key"""
+    return next(k for k in frontier if closed_key(k) == key)
+
+
+def join_paths(layout, forward, backward, forward_key, backward_key, closed_key):
+    """
+    Splice the two searches at a meeting point into one goal State whose
+    parent chain runs start -> goal, ready for reconstruct_path.
+
+    forward_key and backward_key are the meeting configuration as each
+    search reached it; with canonical keys they may differ by a swap of
+    same-shape blocks or a mirror flip. The backward chain is read as the
+    sequence of closed-set keys down to a goal, and replayed from
+    forward_key by taking, at each step, the successor with the next key
+    (equivalent configurations have equivalent moves).
+    """
+    state = rebuild_goal(layout, forward, forward_key, closed_key)
+
+    node = rebuild_goal(layout, backward, backward_key, closed_key).parent
+    while node is not None:
+        target = closed_key(node.key)
+        for new_key, i, d in expand_key(layout, state.key):
+            if closed_key(new_key) == target:
+                state = State.from_key(layout, new_key, state, move_name(layout, i, d),
+                                       state.depth + 1)
+                break
+        node = node.parent
+    return state
+
+
+def bidirectional_bfs(start_state, max_states=200000, goals=None, canonical=True, mirror=True,
+                      metrics=None):
+    """
+    Bidirectional Breadth-First Search.
+
+    The backward search is seeded with every goal configuration (or the
+    packed keys passed in goals), one per closed-set key: with canonical
+    and mirror (the default) goals that differ only by swapping same-shape
+    blocks or by a left-right flip are a single seed, which keeps the
+    backward frontier small (the flip is skipped when the goal is not
+    left-right symmetric). Both searches expand one whole layer at a
+    time, always growing the smaller frontier. Moves are reversible, so
+    the backward search uses the same successor function.
+
+    As in bfs(), the frontiers hold packed keys and each direction keeps
+    a dict of closed-set key -> move code; the path is rebuilt once the
+    searches meet. Returns the same (goal, states_explored, max_space,
+    avg_branching) tuple as bfs(); progress goes through metrics, a
+    telemetry.SearchMetrics collector.
+    """
+    if metrics is None:
+        metrics = SearchMetrics()
+    metrics.start("BiBFS", canonical=canonical, mirror=mirror, max_states=max_states)
+    layout = start_state.layout
+    closed_key = make_closed_key(layout, canonical, mirror and layout.mirror_symmetric)
+    if goals is None:
+        goals = goal_states(layout, canonical)
+
+    seeds = {}
+    for key in goals:
+        seeds.setdefault(closed_key(key), key)
+    forward = {closed_key(start_state.key): START}
+    backward = dict.fromkeys(seeds, START)
+
+    if closed_key(start_state.key) in backward:
+        metrics.finish(0, True, depth=0, seeds=len(seeds), max_frontier=1 + len(seeds),
+                       closed=1 + len(seeds), avg_branching=0)
+        return start_state, 0, 1, 0
+
+    forward_frontier = [start_state.key]
+    backward_frontier = list(seeds.values())
+
+    states_explored = 0
+    max_frontier_size = len(forward_frontier) + len(backward_frontier)
+    total_branches = 0
+    nodes_expanded = 0
+    next_sample = metrics.next_sample(0)
+
+    while forward_frontier and backward_frontier:
+        expand_forward = len(forward_frontier) <= len(backward_frontier)
+        if expand_forward:
+            frontier, seen, other = forward_frontier, forward, backward
+        else:
+            frontier, seen, other = backward_frontier, backward, forward
+
+        next_frontier = []
+        for current in frontier:
+            states_explored += 1
+
+            if states_explored == next_sample:
+                metrics.sample(states_explored, len(forward_frontier) + len(backward_frontier),
+                               len(forward) + len(backward))
+                next_sample = metrics.next_sample(states_explored)
+
+            # Safety limit to prevent infinite loops
+            if states_explored > max_states:
+                avg_branching = total_branches / nodes_expanded if nodes_expanded > 0 else 0
+                metrics.finish(states_explored, False, seeds=len(seeds),
+                               max_frontier=max_frontier_size,
+                               closed=len(forward) + len(backward),
+                               avg_branching=avg_branching, limit_reached=True)
+                return None, states_explored, max_frontier_size, avg_branching
+
+            successors = expand_key(layout, current)
+            nodes_expanded += 1
+            total_branches += len(successors)
+
+            for new_key, i, d in successors:
+                key = closed_key(new_key)
+                if key in seen:
+                    continue
+                seen[key] = encode_move(layout, i, d)
+                next_frontier.append(new_key)
+
+                # Frontiers touched: the match lies in the other frontier,
+                # since anything closer would have met in an earlier layer
+                if key in other:
+                    if expand_forward:
+                        meeting = (new_key, find_key(backward_frontier, key, closed_key))
+                    else:
+                        meeting = (find_key(forward_frontier, key, closed_key), new_key)
+                    goal = join_paths(layout, forward, backward, *meeting, closed_key)
+                    avg_branching = total_branches / nodes_expanded if nodes_expanded > 0 else 0
+                    metrics.finish(states_explored, True, depth=goal.depth, seeds=len(seeds),
+                                   max_frontier=max_frontier_size,
+                                   closed=len(forward) + len(backward),
+                                   avg_branching=avg_branching)
+                    return goal, states_explored, max_frontier_size, avg_branching
+
+        if expand_forward:
+            forward_frontier = next_frontier
+        else:
+            backward_frontier = next_frontier
+        max_frontier_size = max(max_frontier_size,
+                                len(forward_frontier) + len(backward_frontier))
+
+    # No solution found
+    avg_branching = total_branches / nodes_expanded if nodes_expanded > 0 else 0
+    metrics.finish(states_explored, False, seeds=len(seeds), max_frontier=max_frontier_size,
+                   closed=len(forward) + len(backward), avg_branching=avg_branching)
+    return None, states_explored, max_frontier_size, avg_branching
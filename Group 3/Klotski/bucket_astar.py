@@ -0,0 +1,214 @@
+from moves import START, encode_move, get_expander, make_closed_key
+from reconstruct import rebuild_goal
+from telemetry import SearchMetrics
+
+
+def blocking_masks(layout):
+    """
+    masks[i][red_pos]: bit p set when block i with its corner at p lies
+    below the goal block at red_pos and overlaps its columns, i.e. counts
+    towards the blocking penalty of Layout.heuristic.
+    """
+    cols = layout.cols
+    red = layout.index[1]
+    masks = []
+    for i, (w, cells) in enumerate(zip(layout.widths, layout.cell_masks)):
+        per_red = []
+        for red_pos, red_cells in enumerate(layout.cell_masks[red]):
+            mask = 0
+            if i != red and red_cells is not None:
+                red_row, red_col = divmod(red_pos, cols)
+                red_bottom = red_row + layout.heights[red]
+                red_right = red_col + layout.widths[red]
+                for pos, block_cells in enumerate(cells):
+                    row, col = divmod(pos, cols)
+                    if (block_cells is not None and row >= red_bottom
+                            and col < red_right and col + w > red_col):
+                        mask |= 1 << pos
+            per_red.append(mask)
+        masks.append(per_red)
+    return masks
+
+
+def doubled_heuristic(layout, masks, key):
+    """2 * Layout.heuristic(key) for the default heuristic, as an int"""
+    red = layout.index[1]
+    positions = layout.positions(key)
+    red_pos = positions[red]
+    red_row, red_col = divmod(red_pos, layout.cols)
+    goal_row, goal_col = divmod(layout.goal_cell, layout.cols)
+    blocking = sum((masks[i][red_pos] >> pos) & 1 for i, pos in enumerate(positions))
+    return 2 * (abs(red_row - goal_row) + abs(red_col - goal_col)) + blocking
+
+
+def bucket_a_star(start_state, max_states=100000, canonical=False, mirror=False,
+                  metric="step", metrics=None):
+    """
+    A* with a bucket-queue open list and an incremental heuristic.
+
+    f-values are small integers, so the open list is a list of buckets
+    indexed by f, each a list of stacks indexed by g; popping takes the
+    deepest g of the lowest f (ties broken toward deeper g) and an entry
+    is just the packed key. The default heuristic is kept doubled
+    (2 * Manhattan + blocking count) so it stays integral; a move changes
+    one block, so a successor's value is the parent's plus that block's
+    change in blocking, recomputed in full only when the goal block moves.
+    With pattern DBs attached their (integer) maximum is used as is.
+
+    Same options and (goal, states_explored, max_space, avg_branching)
+    result as a_star(); max_space is the peak open-list size.
+    """
+    if metrics is None:
+        metrics = SearchMetrics()
+    metrics.start("Bucket A*", canonical=canonical, mirror=mirror, metric=metric,
+                  max_states=max_states)
+    layout = start_state.layout
+    expand = metrics.timed("move_generation", get_expander(metric))
+    closed_key = metrics.timed("hashing", make_closed_key(layout, canonical, mirror))
+    shifts = layout.shifts
+    field = layout.field
+    red = layout.index.get(1)
+
+    if layout.pattern_dbs:
+        scale = 1
+        full_heuristic = layout.heuristic
+        masks = None
+    else:
+        scale = 2
+        masks = blocking_masks(layout)
+        full_heuristic = lambda key: doubled_heuristic(layout, masks, key)
+    full_heuristic = metrics.timed("heuristic", full_heuristic)
+    heuristic_evals = 1
+
+    start_h = full_heuristic(start_state.key)
+    start = closed_key(start_state.key)
+    g_scores = {start: 0}
+    came_from = {start: START}
+
+    # buckets[f][g]: stack of keys; f_min/g_top point at the next pop
+    buckets = []
+    open_size = 0
+
+    def push(f, g, key):
+        while len(buckets) <= f:
+            buckets.append([])
+        bucket = buckets[f]
+        while len(bucket) <= g:
+            bucket.append([])
+        bucket[g].append(key)
+
+    f_min = int(start_h)
+    push(f_min, 0, start_state.key)
+    g_top = 0
+    open_size = 1
+
+    states_explored = 0
+    max_open_size = 1
+    total_branches = 0
+    nodes_expanded = 0
+    next_sample = metrics.next_sample(0)
+
+    while open_size:
+        # Lowest f, deepest g
+        while True:
+            if f_min < len(buckets) and g_top >= 0:
+                stack = buckets[f_min][g_top] if g_top < len(buckets[f_min]) else None
+                if stack:
+                    break
+                g_top -= 1
+            else:
+                f_min += 1
+                g_top = len(buckets[f_min]) - 1 if f_min < len(buckets) else -1
+        current = stack.pop()
+        open_size -= 1
+        g = g_top
+        h = f_min - scale * g
+
+        states_explored += 1
+
+        if states_explored == next_sample:
+            metrics.sample(states_explored, open_size + 1, len(g_scores),
+                           heuristic_evals=heuristic_evals, f=f_min / scale)
+            next_sample = metrics.next_sample(states_explored)
+
+        # Safety limit
+        if states_explored > max_states:
+            avg_branching = total_branches / nodes_expanded if nodes_expanded > 0 else 0
+            metrics.finish(states_explored, False, max_frontier=max_open_size,
+                           closed=len(g_scores), heuristic_evals=heuristic_evals,
+                           avg_branching=avg_branching, limit_reached=True)
+            print(f"   Reached exploration limit ({max_states} states)")
+            return None, states_explored, max_open_size, avg_branching
+
+        # Stale entry: a shorter path was found after this one was pushed
+        if g_scores.get(closed_key(current), g) < g:
+            continue
+
+        if layout.is_goal(current):
+            avg_branching = total_branches / nodes_expanded if nodes_expanded > 0 else 0
+            metrics.finish(states_explored, True, depth=g, max_frontier=max_open_size,
+                           closed=len(g_scores), heuristic_evals=heuristic_evals,
+                           avg_branching=avg_branching)
+            goal = rebuild_goal(layout, came_from, current, closed_key)
+            return goal, states_explored, max_open_size, avg_branching
+
+        successors = expand(layout, current)
+        nodes_expanded += 1
+        total_branches += len(successors)
+
+        if masks is not None:
+            red_masks = [per_red[(current >> shifts[red]) & field] for per_red in masks]
+
+        tentative_g = g + 1
+        for new_key, i, d in successors:
+            key = closed_key(new_key)
+
+            if key not in g_scores or tentative_g < g_scores[key]:
+                if masks is None or i == red:
+                    new_h = full_heuristic(new_key)
+                    heuristic_evals += 1
+                    if new_h == float('inf'):
+                        continue  # pattern DB: goal unreachable from here
+                    new_h = int(new_h)
+                else:
+                    # Only block i moved: adjust its share of the blocking penalty
+                    mask = red_masks[i]
+                    new_h = (h - ((mask >> ((current >> shifts[i]) & field)) & 1)
+                             + ((mask >> ((new_key >> shifts[i]) & field)) & 1))
+                g_scores[key] = tentative_g
+                came_from[key] = encode_move(layout, i, d)
+                f = scale * tentative_g + new_h
+                push(f, tentative_g, new_key)
+                open_size += 1
+                if f < f_min or (f == f_min and tentative_g > g_top):
+                    f_min, g_top = f, tentative_g
+
+        if open_size > max_open_size:
+            max_open_size = open_size
+
+    avg_branching = total_branches / nodes_expanded if nodes_expanded > 0 else 0
+    metrics.finish(states_explored, False, max_frontier=max_open_size, closed=len(g_scores),
+                   heuristic_evals=heuristic_evals, avg_branching=avg_branching)
+    return None, states_explored, max_open_size, avg_branching
+
+
+if __name__ == "__main__":
+    import time
+    from astar import a_star
+    from main import create_initial_state
+
+    start_state = create_initial_state()
+    rows = []
+    for name, solver in (("heapq A*", a_star), ("bucket A*", bucket_a_star)):
+        for canonical in (False, True):
+            start_time = time.time()
+            goal, states, space, _ = solver(start_state, max_states=500000, canonical=canonical)
+            runtime = time.time() - start_time
+            rows.append((name + (" (canonical)" if canonical else ""),
+                         goal.depth if goal else None, states, space, runtime))
+
+    print(f"\n  {'Open list':<24} {'Moves':<8} {'Expanded':<12} {'Peak open':<12} "
+          f"{'Time (s)':<10} {'Exp/s':<10}")
+    for name, moves, states, space, runtime in rows:
+        print(f"  {name:<24} {moves!s:<8} {states:<12,} {space:<12,} {runtime:<10.2f} "
+              f"{states / runtime:<10,.0f}")
@@ -0,0 +1,219 @@
+import json
+import mmap
+import struct
+from array import array
+from bisect import bisect_left
+
+from bidirectional import goal_states
+from moves import expand_key, move_name
+from state import State
+
+MAGIC = b"KLOTSKDB"
+
+
+def layout_signature(layout):
+    """Everything a table depends on: board size, block order/shapes, goal"""
+    return {
+        "rows": layout.rows,
+        "cols": layout.cols,
+        "ids": list(layout.ids),
+        "widths": list(layout.widths),
+        "heights": list(layout.heights),
+        "goal_cell": layout.goal_cell,
+    }
+
+
+def build_distance_db(layout, filename, mirror=None):
+    """
+    Offline builder: retrograde BFS from every goal configuration over the
+    whole reachable state space of the layout's piece set, then write a
+    table mapping each canonical packed key to its optimal distance.
+
+    Keys are canonical (interchangeable pieces merged, and mirror images
+    folded when the goal is symmetric), so the table stays small while
+    still answering queries for any real configuration.
+    Returns (number of states, maximum distance).
+    """
+    if mirror is None:
+        mirror = layout.mirror_symmetric
+
+    distances = {}
+    frontier = []
+    for key in goal_states(layout):
+        canon = layout.canonical(key, mirror)
+        if canon not in distances:
+            distances[canon] = 0
+            frontier.append(key)
+
+    depth = 0
+    print("  Building: ", end="", flush=True)
+    while frontier:
+        depth += 1
+        next_frontier = []
+        for key in frontier:
+            for new_key, _, _ in expand_key(layout, key):
+                canon = layout.canonical(new_key, mirror)
+                if canon not in distances:
+                    distances[canon] = depth
+                    next_frontier.append(new_key)
+        frontier = next_frontier
+        print(f"{depth}:{len(frontier)}...", end="", flush=True)
+    max_distance = depth - 1
+    print(f" {len(distances):,} states ✓")
+
+    header = layout_signature(layout)
+    header.update(mirror=mirror, max_distance=max_distance)
+    write_table(filename, header, distances)
+
+    print(f"✓ Exported to {filename}")
+    return len(distances), max_distance
+
+
+def write_table(filename, header, distances):
+    """
+    Write a {packed key: distance} dict as a sorted key array and a
+    parallel distance array, behind a JSON header.
+    """
+    keys = array("Q", sorted(distances))
+    max_distance = max(distances.values(), default=0)
+    dist_type = "B" if max_distance < 256 else "H"
+    dists = array(dist_type, (distances[k] for k in keys))
+
+    header = dict(header, count=len(keys), dist_type=dist_type)
+    header_bytes = json.dumps(header).encode()
+    # Pad so the key array starts on an 8-byte boundary for memoryview.cast
+    offset = len(MAGIC) + 4 + len(header_bytes)
+    header_bytes += b" " * (-offset % 8)
+
+    with open(filename, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<I", len(header_bytes)))
+        f.write(header_bytes)
+        keys.tofile(f)
+        dists.tofile(f)
+
+
+class Table:
+    """
+    Memory-mapped table written by write_table.
+    Lookups binary-search the sorted key array in place, nothing is
+    loaded into Python objects.
+    """
+
+    def __init__(self, filename):
+        self._file = open(filename, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"{filename} is not a Klotski distance table")
+
+        (header_len,) = struct.unpack_from("<I", self._map, len(MAGIC))
+        start = len(MAGIC) + 4
+        self.header = json.loads(self._map[start:start + header_len])
+
+        count = self.header["count"]
+        keys_start = start + header_len
+        dists_start = keys_start + count * 8
+        view = memoryview(self._map)
+        self._keys = view[keys_start:dists_start].cast("Q")
+        dist_size = struct.calcsize(self.header["dist_type"])
+        self._dists = view[dists_start:dists_start + count * dist_size].cast(
+            self.header["dist_type"])
+
+    def __len__(self):
+        return len(self._keys)
+
+    def get(self, key):
+        """Stored distance for a key, or None"""
+        i = bisect_left(self._keys, key)
+        if i < len(self._keys) and self._keys[i] == key:
+            return self._dists[i]
+        return None
+
+    def items(self):
+        """Iterate over (key, distance) pairs in key order"""
+        return zip(self._keys, self._dists)
+
+    def close(self):
+        self._keys.release()
+        self._dists.release()
+        self._map.close()
+        self._file.close()
+
+
+class DistanceDB(Table):
+    """Distance-to-goal table for real configurations of one piece set"""
+
+    def __init__(self, filename):
+        super().__init__(filename)
+        self.mirror = self.header["mirror"]
+
+    def check_layout(self, layout):
+        """Raise ValueError if the table was built for another piece set"""
+        signature = layout_signature(layout)
+        if any(self.header[k] != v for k, v in signature.items()):
+            raise ValueError("distance table was built for a different layout")
+
+    def lookup(self, layout, key):
+        """Optimal distance to the goal for a packed key, or None if unreachable"""
+        return self.get(layout.canonical(key, self.mirror))
+
+    def distance(self, state):
+        """How many moves from here? None if the goal cannot be reached"""
+        return self.lookup(state.layout, state.key)
+
+
+def db_solve(start_state, db):
+    """
+    Solve by walking downhill through a distance table: from each state
+    take any move to a neighbour exactly one step closer to the goal.
+    No search - one table lookup per candidate move.
+    Returns the same (goal, states_explored, max_space, avg_branching)
+    tuple as bfs().
+    """
+    layout = start_state.layout
+    db.check_layout(layout)
+
+    distance = db.lookup(layout, start_state.key)
+    if distance is None:
+        return None, 0, 0, 0
+
+    current = start_state
+    states_explored = 1
+    total_branches = 0
+    while distance > 0:
+        successors = expand_key(layout, current.key)
+        total_branches += len(successors)
+        for new_key, i, d in successors:
+            states_explored += 1
+            if db.lookup(layout, new_key) == distance - 1:
+                current = State.from_key(layout, new_key, current,
+                                         move_name(layout, i, d), current.depth + 1)
+                distance -= 1
+                break
+        else:
+            raise ValueError("distance table is inconsistent with the move rules")
+
+    avg_branching = total_branches / current.depth if current.depth > 0 else 0
+    return current, states_explored, 1, avg_branching
+
+
+if __name__ == "__main__":
+    import time
+    from main import create_initial_state
+    from reconstruct import reconstruct_path
+
+    start_state = create_initial_state()
+    start_time = time.time()
+    count, max_distance = build_distance_db(start_state.layout, "klotski_distances.db")
+    print(f"  {count:,} canonical states, max distance {max_distance}, "
+          f"built in {time.time() - start_time:.2f}s")
+
+    db = DistanceDB("klotski_distances.db")
+    start_time = time.time()
+    goal, states_explored, _, _ = db_solve(start_state, db)
+    runtime = time.time() - start_time
+    states, moves = reconstruct_path(goal)
+    print(f"  Start position: {db.distance(start_state)} moves")
+    print(f"  Solution walked in {runtime * 1e6:.0f} µs "
+          f"({len(moves)} moves, {states_explored} lookups)")
+    db.close()
@@ -1,17 +1,42 @@
 import json
 
 
+def block_dict(b):
+    return {"id": b.id, "row": b.row, "col": b.col, "width": b.width, "height": b.height}
+
+
+def solution_deltas(states):
+    """Per move: (block id, dx, dy) with dx/dy in rows/cols, as in moves.apply_move"""
+    deltas = []
+    for before, after in zip(states, states[1:]):
+        for old, new in zip(before.blocks, after.blocks):
+            if (old.row, old.col) != (new.row, new.col):
+                deltas.append((old.id, new.row - old.row, new.col - old.col))
+                break
+    return deltas
+
+
 def export_solution(states, moves, algorithm, filename, runtime=None, 
-                   states_explored=None, max_space=None, branching_factor=None):
-    """Export solution to JSON for visualization"""
+                   states_explored=None, max_space=None, branching_factor=None,
+                   compact=False, keyframe_every=None):
+    """
+    Export solution to JSON for visualization.
+    compact=True writes the delta format instead (see write_compact).
+    """
     
     # Calculate complexity notation
-    if algorithm == "BFS":
+    if algorithm in ("BFS", "BFS-slide"):
         time_complex = "O(b^d)"
         space_complex = "O(b^d)"
     elif algorithm == "A*":
         time_complex = "O(b^d)"
         space_complex = "O(b^d)"
+    elif algorithm == "BiBFS":
+        time_complex = "O(b^(d/2))"
+        space_complex = "O(b^(d/2))"
+    elif algorithm == "IDA*":
+        time_complex = "O(b^d)"
+        space_complex = "O(d)"
     else:
         time_complex = "O(n)"
         space_complex = "O(n)"
@@ -26,23 +51,45 @@ def export_solution(states, moves, algorithm, filename, runtime=None,
         "branching_factor": round(branching_factor, 2) if branching_factor else None,
         "time_complexity": time_complex,
         "space_complexity": space_complex,
-        "states": []
     }
-    
+
+    if compact:
+        del data["moves"]
+        write_compact(data, states, filename, keyframe_every)
+        print(f"✓ Exported to {filename} (compact)")
+        return
+
     # Serialize each state's blocks
-    for state in states:
-        state_blocks = []
-        for b in state.blocks:
-            state_blocks.append({
-                "id": b.id,
-                "row": b.row,
-                "col": b.col,
-                "width": b.width,
-                "height": b.height
-            })
-        data["states"].append(state_blocks)
+    data["states"] = [[block_dict(b) for b in state.blocks] for state in states]
     
     with open(filename, "w") as f:
         json.dump(data, f, indent=2)
     
     print(f"✓ Exported to {filename}")
+
+
+def write_compact(data, states, filename, keyframe_every=None):
+    """
+    Compact, streamable export (JSON Lines):
+      line 1   header: the metadata plus "format": "delta", the board size
+               and the initial blocks
+      then     one [block id, dx, dy] line per move
+      and      every `keyframe_every` moves a {"keyframe": i, "positions":
+               [[row, col], ...]} line with all block positions after move i
+    A viewer can draw the start as soon as the header arrives and rebuild
+    each state incrementally; keyframes give random access.
+    """
+    start = states[0]
+    header = dict(data, format="delta",
+                  rows=start.layout.rows, cols=start.layout.cols,
+                  blocks=[block_dict(b) for b in start.blocks],
+                  keyframe_every=keyframe_every)
+
+    with open(filename, "w") as f:
+        f.write(json.dumps(header, separators=(",", ":")) + "\n")
+        for i, delta in enumerate(solution_deltas(states), 1):
+            f.write(json.dumps(delta, separators=(",", ":")) + "\n")
+            if keyframe_every and i % keyframe_every == 0:
+                positions = [[b.row, b.col] for b in states[i].blocks]
+                f.write(json.dumps({"keyframe": i, "positions": positions},
+                                   separators=(",", ":")) + "\n")
@@ -0,0 +1,240 @@
+import heapq
+import mmap
+import os
+import shutil
+import tempfile
+from array import array
+from bisect import bisect_left
+
+from moves import get_expander, make_closed_key, move_name
+from state import State
+from telemetry import SearchMetrics
+
+CHUNK = 1 << 16  # keys per read/write
+
+
+def write_keys(filename, keys):
+    """Write an iterable of sorted keys as raw 64-bit ints; returns the count"""
+    count = 0
+    buffer = array("Q")
+    with open(filename, "wb") as f:
+        for key in keys:
+            buffer.append(key)
+            if len(buffer) == CHUNK:
+                buffer.tofile(f)
+                count += len(buffer)
+                buffer = array("Q")
+        buffer.tofile(f)
+        count += len(buffer)
+    return count
+
+
+def read_keys(filename):
+    """Stream the keys of a run or layer file, one chunk in memory at a time"""
+    with open(filename, "rb") as f:
+        while True:
+            chunk = array("Q")
+            try:
+                chunk.fromfile(f, CHUNK)
+            except EOFError:
+                pass  # short last chunk: fromfile keeps what it read
+            if not chunk:
+                return
+            yield from chunk
+
+
+def unique(keys):
+    """Drop repeats from a sorted stream"""
+    previous = None
+    for key in keys:
+        if key != previous:
+            yield key
+            previous = key
+
+
+def subtract(keys, seen):
+    """Sorted keys minus the sorted stream seen (streaming merge)"""
+    seen = iter(seen)
+    other = next(seen, None)
+    for key in keys:
+        while other is not None and other < key:
+            other = next(seen, None)
+        if key != other:
+            yield key
+
+
+class LayerFile:
+    """Sorted layer file, memory-mapped for membership tests"""
+
+    def __init__(self, filename):
+        self._file = open(filename, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+        self._keys = memoryview(self._map).cast("Q") if size else []
+
+    def __contains__(self, key):
+        i = bisect_left(self._keys, key)
+        return i < len(self._keys) and self._keys[i] == key
+
+    def close(self):
+        if self._map is not None:
+            self._keys.release()
+            self._map.close()
+        self._file.close()
+
+
+def external_bfs(start_state, max_states=10000000, canonical=False, mirror=False,
+                 metric="step", work_dir=None, buffer_size=500000, metrics=None):
+    """
+    Disk-backed Breadth-First Search with delayed duplicate detection.
+
+    Each depth layer lives on disk as a sorted file of closed-set keys.
+    Expanding layer d streams it from disk; successors are collected in a
+    buffer of at most `buffer_size` keys, which is sorted and written out
+    as a run file whenever it fills. The runs are then merged, and keys
+    already in layer d or d-1 are removed by the same streaming merge
+    (moves are reversible, so a successor of layer d can only be in layer
+    d-1, d or d+1). The result is layer d+1. Memory stays at the buffer
+    plus one read chunk per run, whatever the size of the state space.
+
+    Closed-set keys are valid configurations, so layers are expanded
+    directly from them. The path is recovered at the end by walking back
+    through the layer files, which are kept until the search returns.
+
+    Returns the same (goal, states_explored, max_space, avg_branching)
+    tuple as bfs(); max_space is the largest layer. Per-layer sizes are
+    recorded as metrics samples and in the summary as "layer_sizes".
+    """
+    if metrics is None:
+        metrics = SearchMetrics(sample_every=0)
+    metrics.start("External BFS", canonical=canonical, mirror=mirror, metric=metric,
+                  max_states=max_states, buffer_size=buffer_size)
+    layout = start_state.layout
+    if len(layout.ids) * layout.bits > 64:
+        raise ValueError("external_bfs needs packed keys of at most 64 bits")
+    expand = get_expander(metric)
+    closed_key = make_closed_key(layout, canonical, mirror)
+
+    own_dir = work_dir is None
+    if own_dir:
+        work_dir = tempfile.mkdtemp(prefix="klotski_bfs_")
+    layer_file = lambda d: os.path.join(work_dir, f"layer_{d:04d}.bin")
+
+    layer_sizes = [write_keys(layer_file(0), [closed_key(start_state.key)])]
+    states_explored = 0
+    total_branches = 0
+    depth = 0
+
+    try:
+        while layer_sizes[depth]:
+            # Expand layer `depth` into sorted runs
+            runs = []
+            buffer = []
+            goal = None
+            for key in read_keys(layer_file(depth)):
+                states_explored += 1
+                if layout.is_goal(key):
+                    goal = key
+                    break
+                successors = expand(layout, key)
+                total_branches += len(successors)
+                for new_key, _, _ in successors:
+                    buffer.append(closed_key(new_key))
+                if len(buffer) >= buffer_size:
+                    runs.append(write_run(work_dir, depth, len(runs), buffer))
+                    buffer = []
+
+            avg_branching = total_branches / states_explored if states_explored else 0
+            if goal is not None:
+                metrics.finish(states_explored, True, depth=depth, max_frontier=max(layer_sizes),
+                               layer_sizes=layer_sizes, avg_branching=avg_branching)
+                path_goal = rebuild_path(start_state, goal, depth, layer_file, expand, closed_key)
+                return path_goal, states_explored, max(layer_sizes), avg_branching
+
+            if states_explored > max_states:
+                metrics.finish(states_explored, False, max_frontier=max(layer_sizes),
+                               layer_sizes=layer_sizes, avg_branching=avg_branching,
+                               limit_reached=True)
+                print(f"  ⚠️  Reached exploration limit ({max_states} states)")
+                return None, states_explored, max(layer_sizes), avg_branching
+
+            if buffer:
+                runs.append(write_run(work_dir, depth, len(runs), buffer))
+                buffer = []
+
+            # Merge runs, drop duplicates and keys of layers depth and depth-1
+            seen = [read_keys(layer_file(depth))]
+            if depth > 0:
+                seen.append(read_keys(layer_file(depth - 1)))
+            merged = unique(heapq.merge(*(read_keys(run) for run in runs)))
+            size = write_keys(layer_file(depth + 1), subtract(merged, heapq.merge(*seen)))
+            for run in runs:
+                os.remove(run)
+
+            layer_sizes.append(size)
+            depth += 1
+            metrics.sample(states_explored, size, sum(layer_sizes), depth=depth, runs=len(runs))
+
+        avg_branching = total_branches / states_explored if states_explored else 0
+        metrics.finish(states_explored, False, max_frontier=max(layer_sizes),
+                       layer_sizes=layer_sizes, avg_branching=avg_branching)
+        return None, states_explored, max(layer_sizes), avg_branching
+    finally:
+        if own_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def write_run(work_dir, depth, index, buffer):
+    """Sort a successor buffer and write it as a deduplicated run file"""
+    buffer.sort()
+    filename = os.path.join(work_dir, f"run_{depth:04d}_{index:04d}.bin")
+    write_keys(filename, unique(buffer))
+    return filename
+
+
+def rebuild_path(start_state, goal, depth, layer_file, expand, closed_key):
+    """
+    Recover a shortest path from the layer files: walk back from the goal,
+    at each layer picking a neighbour found in the layer before, then
+    replay the closed-key chain forward from the real start state.
+    """
+    layout = start_state.layout
+    chain = [goal]
+    for d in range(depth - 1, -1, -1):
+        layer = LayerFile(layer_file(d))
+        try:
+            chain.append(next(closed_key(new_key) for new_key, _, _ in expand(layout, chain[-1])
+                              if closed_key(new_key) in layer))
+        finally:
+            layer.close()
+    chain.reverse()
+
+    state = State.from_key(layout, start_state.key)
+    for target in chain[1:]:
+        new_key, i, d = next(move for move in expand(layout, state.key)
+                             if closed_key(move[0]) == target)
+        state = State.from_key(layout, new_key, state, move_name(layout, i, d), state.depth + 1)
+    return state
+
+
+if __name__ == "__main__":
+    import time
+    from bfs import bfs
+    from main import create_initial_state
+    from memory import peak_rss, reset_peak_rss
+
+    start_state = create_initial_state()
+
+    for name, solver, options in (
+            ("bfs()", bfs, {}),
+            ("external_bfs()", external_bfs, {"buffer_size": 50000})):
+        reset_peak_rss()
+        start_time = time.time()
+        metrics = SearchMetrics(sample_every=0) if solver is external_bfs else None
+        goal, states, space, _ = solver(start_state, max_states=1000000, metrics=metrics,
+                                        **options)
+        print(f"  {name}: {goal.depth} moves, {states:,} states, largest layer {space:,}, "
+              f"{time.time() - start_time:.2f}s, peak RSS {peak_rss() / 1024 / 1024:.1f} MB")
+        if metrics:
+            sizes = metrics.summary["layer_sizes"]
+            print(f"  layer sizes ({len(sizes)} layers): {sizes}")
@@ -0,0 +1,126 @@
+import sys
+from moves import expand_key, move_name, apply_move, undo_move, DIRECTION_NAMES
+from state import DIRECTIONS, State
+from telemetry import SearchMetrics
+
+FOUND = -1
+OPPOSITE_DIR = [DIRECTION_NAMES.index(name) for name in ("DOWN", "UP", "RIGHT", "LEFT")]
+
+
+def ida_star(start_state, max_states=100000, tt_size=0, metrics=None):
+    """
+    Iterative-Deepening A* with progress monitoring.
+
+    Depth-first search bounded by f = g + h, restarted with the smallest
+    f that exceeded the previous bound. A single State is mutated in place
+    with apply_move/undo_move, so memory is linear in solution depth.
+    tt_size > 0 enables a transposition table of at most that many
+    entries (cleared every iteration) that prunes states already reached
+    at a lower or equal depth in the current iteration.
+    Returns the same (goal, states_explored, max_space, avg_branching)
+    tuple as bfs(); max_space counts path length plus table entries.
+
+    metrics is a telemetry.SearchMetrics collector; the default one only
+    prints progress.
+    """
+    if metrics is None:
+        metrics = SearchMetrics()
+    metrics.start("IDA*", max_states=max_states, tt_size=tt_size)
+    layout = start_state.layout
+    state = start_state.copy()
+    state.parent = None
+    state.move = None
+    deltas = list(DIRECTIONS.values())
+
+    path = []
+    table = {} if tt_size > 0 else None
+
+    states_explored = 0
+    max_space = 1
+    total_branches = 0
+    nodes_expanded = 0
+    next_sample = metrics.next_sample(0)
+
+    def search(g, bound, prev):
+        nonlocal states_explored, max_space, total_branches, nodes_expanded, next_sample
+
+        f = g + state.get_heuristic()
+        if f > bound:
+            return f
+        if state.is_goal():
+            return FOUND
+
+        states_explored += 1
+        if states_explored == next_sample:
+            metrics.sample(states_explored, len(path), len(table) if table else 0,
+                           bound=bound, depth=g)
+            next_sample = metrics.next_sample(states_explored)
+        if states_explored > max_states:
+            return None
+
+        successors = expand_key(layout, state.key)
+        nodes_expanded += 1
+        total_branches += len(successors)
+
+        minimum = float('inf')
+        for new_key, i, d in successors:
+            # Never undo the move that was just made
+            if prev is not None and prev == (i, OPPOSITE_DIR[d]):
+                continue
+            if table is not None:
+                seen = table.get(new_key)
+                if seen is not None and seen <= g + 1:
+                    continue
+                if seen is not None or len(table) < tt_size:
+                    table[new_key] = g + 1
+
+            block_id = layout.ids[i]
+            dx, dy = deltas[d]
+            apply_move(state, block_id, dx, dy)
+            path.append((i, d))
+            max_space = max(max_space, len(path) + (len(table) if table else 0))
+
+            result = search(g + 1, bound, (i, d))
+            if result == FOUND or result is None:
+                return result
+
+            path.pop()
+            undo_move(state, block_id, dx, dy)
+            minimum = min(minimum, result)
+        return minimum
+
+    bound = state.get_heuristic()
+    limit = sys.getrecursionlimit()
+    while True:
+        if table is not None:
+            table.clear()
+        if bound + 50 > limit:
+            limit = int(bound) + 100
+            sys.setrecursionlimit(limit)
+
+        result = search(0, bound, None)
+        avg_branching = total_branches / nodes_expanded if nodes_expanded > 0 else 0
+
+        if result == FOUND:
+            metrics.finish(states_explored, True, depth=len(path), max_frontier=max_space,
+                           avg_branching=avg_branching, bound=bound)
+            goal = State.from_key(layout, start_state.key)
+            for i, d in path:
+                dx, dy = deltas[d]
+                key = goal.key + ((dx * layout.cols + dy) << layout.shifts[i])
+                goal = State.from_key(layout, key, goal, move_name(layout, i, d), goal.depth + 1)
+            return goal, states_explored, max_space, avg_branching
+
+        if result is None:
+            metrics.finish(states_explored, False, max_frontier=max_space,
+                           avg_branching=avg_branching, bound=bound, limit_reached=True)
+            print(f"  ⚠️  Reached exploration limit ({max_states} states)")
+            print(f"  ⚠️  No solution found within limit")
+            return None, states_explored, max_space, avg_branching
+
+        if result == float('inf'):
+            metrics.finish(states_explored, False, max_frontier=max_space,
+                           avg_branching=avg_branching)
+            return None, states_explored, max_space, avg_branching
+
+        bound = result
@@ -0,0 +1,139 @@
+import json
+
+from state import Block, Layout, State
+
+EMPTY_CELLS = (".", "_", "0")
+
+
+def blocks_from_board(board):
+    """
+    Derive the block list from a board grid: every non-zero id must fill
+    exactly its bounding rectangle. Blocks are returned sorted by id.
+    """
+    cells = {}
+    for r, row in enumerate(board):
+        for c, block_id in enumerate(row):
+            if block_id:
+                cells.setdefault(block_id, []).append((r, c))
+
+    blocks = []
+    for block_id in sorted(cells):
+        rows = [r for r, _ in cells[block_id]]
+        cols = [c for _, c in cells[block_id]]
+        row, col = min(rows), min(cols)
+        height, width = max(rows) - row + 1, max(cols) - col + 1
+        if len(cells[block_id]) != width * height:
+            raise ValueError(f"Block {block_id} is not a filled rectangle")
+        blocks.append(Block(block_id, row, col, width, height))
+    return blocks
+
+
+def default_goal(blocks, rows, cols):
+    """Block 1 at the bottom, horizontally centred (row=3, col=1 on 5x4)"""
+    red = next((b for b in blocks if b.id == 1), None)
+    if red is None:
+        raise ValueError("Layout has no block 1 (the goal block)")
+    return (rows - red.height, (cols - red.width) // 2)
+
+
+def parse_text(text):
+    """
+    Text format: one board per paragraph, one row per line, cells separated
+    by spaces ('.', '_' or '0' for empty). Optional '# name: ...' and
+    '# goal: row col' lines set the name and goal; other '#' lines are comments.
+    """
+    specs = []
+    spec = {"board": []}
+    for line in text.splitlines() + [""]:
+        line = line.strip()
+        if line.startswith("#"):
+            field, _, value = line[1:].partition(":")
+            field = field.strip().lower()
+            if field == "name":
+                spec["name"] = value.strip()
+            elif field == "goal":
+                spec["goal"] = [int(v) for v in value.split()]
+        elif line:
+            spec["board"].append([0 if cell in EMPTY_CELLS else int(cell)
+                                  for cell in line.split()])
+        elif spec["board"]:
+            specs.append(spec)
+            spec = {"board": []}
+    return specs
+
+
+def parse_json(text):
+    """JSON format: a list of {"name", "board", "goal"} objects, or {"layouts": [...]}"""
+    data = json.loads(text)
+    if isinstance(data, dict):
+        data = data["layouts"]
+    return [dict(spec) for spec in data]
+
+
+def load_layouts(filename):
+    """
+    Load a layout file (.json, anything else is read as text) into a list
+    of layout specs: {"name", "board", "goal"}. Specs are plain data so
+    they can be sent to worker processes; use state_from_spec to solve one.
+    """
+    with open(filename) as f:
+        text = f.read()
+    specs = parse_json(text) if filename.endswith(".json") else parse_text(text)
+
+    for number, spec in enumerate(specs, 1):
+        board = spec["board"]
+        if not board or any(len(row) != len(board[0]) for row in board):
+            raise ValueError(f"Layout {number} in {filename}: board is not rectangular")
+        spec.setdefault("name", f"layout-{number}")
+        if "goal" not in spec:
+            spec["goal"] = default_goal(blocks_from_board(board), len(board), len(board[0]))
+        spec["goal"] = tuple(spec["goal"])
+    return specs
+
+
+def canonical_blocks(blocks):
+    """
+    Relabel blocks onto the canonical ordering of their piece set: the goal
+    block keeps id 1, the others are numbered 2, 3, ... by shape (width,
+    height), then by position. Layouts with the same pieces then list the
+    same shapes in the same order. Returns (blocks, {old id: new id}).
+    """
+    red = [b for b in blocks if b.id == 1]
+    others = sorted((b for b in blocks if b.id != 1),
+                    key=lambda b: (b.width, b.height, b.row, b.col))
+    relabel = {}
+    canonical = []
+    for new_id, b in enumerate(red + others, 1 if red else 2):
+        relabel[b.id] = new_id
+        canonical.append(Block(new_id, b.row, b.col, b.width, b.height))
+    return canonical, relabel
+
+
+def piece_set(blocks, rows, cols, goal):
+    """
+    Key shared by every layout that can reuse the same Layout tables:
+    board size, goal and the shapes of canonically ordered blocks
+    (see canonical_blocks), so block ids do not matter
+    """
+    return (rows, cols, tuple(goal), tuple((b.width, b.height) for b in blocks))
+
+
+def state_from_spec(spec, layouts=None):
+    """
+    Build the start State of a layout spec. Pass a dict as `layouts` to
+    reuse one Layout (move tables, pattern DBs) across specs that share
+    a piece set. Blocks are renumbered with canonical_blocks, so move
+    names use the canonical ids rather than the ones in the file.
+    """
+    board = spec["board"]
+    rows, cols = len(board), len(board[0])
+    blocks, relabel = canonical_blocks(blocks_from_board(board))
+    board = [[relabel.get(cell, 0) for cell in row] for row in board]
+    key = piece_set(blocks, rows, cols, spec["goal"])
+
+    layout = layouts.get(key) if layouts is not None else None
+    if layout is None:
+        layout = Layout(blocks, rows=rows, cols=cols, goal=spec["goal"])
+        if layouts is not None:
+            layouts[key] = layout
+    return State(board, blocks, layout=layout)
@@ -1,27 +1,67 @@
 from state import State, Block
 from bfs import bfs
 from astar import a_star
+from bidirectional import bidirectional_bfs
+from idastar import ida_star
 from reconstruct import reconstruct_path
 from export_json import export_solution
 import time
+from memory import reset_peak_rss, peak_rss
+from telemetry import SearchMetrics
+from solution_cache import SolutionCache, solve_cached
+from runner import DEFAULT_SOLVERS, SOLVERS, run_solvers
+from pattern_db import PatternDB, build_pattern_db, use_pattern_dbs
+from batch import pattern_db_files
+import os
+import sys
+
+# Compact exports carry a full keyframe every this many moves (viewer seeking)
+KEYFRAME_EVERY = 20
+
+# Write each BFS/A* run's telemetry (samples + summary) to *_metrics.json;
+# METRICS_TIMING also splits time into move generation/hashing/heuristic
+DUMP_METRICS = True
+METRICS_TIMING = False
+
+# Keep BFS/A* results in a persistent solution cache, so a repeated run
+# (or a start on a cached path) is answered without searching. Off by
+# default: a hit reports the stored statistics of the original solve but
+# has no telemetry to dump, so leave it off when measuring the solvers.
+USE_CACHE = False
+CACHE_FILE = "solution_cache.db"
+
+# Concurrent mode (python main.py --concurrent): every solver in its own
+# worker process, each stopped after TIME_BUDGET seconds or MEMORY_BUDGET
+# bytes of RSS; CANCEL_ON_OPTIMAL stops the rest once BFS/BiBFS prove the optimum
+TIME_BUDGET = 120
+MEMORY_BUDGET = 1024 * 1024 * 1024
+CANCEL_ON_OPTIMAL = False
+
+# IDA* is not part of the default run: with the Manhattan heuristic it
+# cannot solve the classic layout within any sensible state limit, and
+# with the pattern DBs below attached it reaches the 56-move optimum only
+# after ~2.2M states (over a minute). Enable with python main.py --ida.
+RUN_IDA_STAR = False
+IDA_DB_DIR = "pattern_dbs"
 
 
 def create_initial_state():
     """
     Classic Klotski (Hua Rong Dao) puzzle configuration.
     Goal: Move block 1 (2x2 Cao Cao/red block) to the bottom center (row=3, col=1)
-    This is the standard configuration with 81-move optimal solution.
+    Optimal solutions: 56 moves counting one-cell steps, 35 counting
+    slides (one block moved any distance).
     
     Board layout (5 rows x 4 columns):
-    [1][1][2][2]   Row 0
-    [1][1][2][2]   Row 1
+    [1][1][2][_]   Row 0
+    [1][1][2][_]   Row 1
     [3][3][4][4]   Row 2
     [5][6][6][7]   Row 3
     [5][8][_][_]   Row 4 (_=empty)
     """
     start_board = [
-        [1, 1, 2, 2],
-        [1, 1, 2, 2],
+        [1, 1, 2, 0],
+        [1, 1, 2, 0],
         [3, 3, 4, 4],
         [5, 6, 6, 7],
         [5, 8, 0, 0]
@@ -49,44 +89,55 @@ def print_algorithm_header(algorithm):
 
 
 def print_solution_summary(algorithm, moves, states_explored, max_space, 
-                          branching_factor, runtime):
+                          branching_factor, runtime, peak_memory=None, metric="step"):
     """Print concise solution summary"""
-    if algorithm == "BFS":
+    if algorithm in ("BFS", "BFS-slide"):
         time_complex = "O(b^d)"
         space_complex = "O(b^d)"
     elif algorithm == "DFS":
         time_complex = "O(b^m)"
         space_complex = "O(bm)"
+    elif algorithm == "BiBFS":
+        time_complex = "O(b^(d/2))"
+        space_complex = "O(b^(d/2))"
+    elif algorithm == "IDA*":
+        time_complex = "O(b^d)"
+        space_complex = "O(d)"
     else:  # A*
         time_complex = "O(b^d)"
         space_complex = "O(b^d)"
     
     print(f"\n  Solution Found: {len(moves)} moves")
+    unit = "one-cell steps" if metric == "step" else "slides of one block"
+    print(f"  Move Metric: {metric} ({unit})")
     print(f"  States Explored: {states_explored:,}")
     print(f"  Max Space Used: {max_space:,} states")
     print(f"  Avg Branching Factor: {branching_factor:.2f}")
     print(f"  Runtime: {runtime:.4f} seconds")
+    if peak_memory is not None:
+        print(f"  Peak Memory: {peak_memory / 1024 / 1024:.2f} MB (RSS)")
     print(f"  Time Complexity: {time_complex}")
     print(f"  Space Complexity: {space_complex}")
 
 
 def print_comparison_table(results):
     """Print comparison table of all algorithms"""
-    print("\n" + "=" * 85)
+    print("\n" + "=" * 96)
     print("  ALGORITHM COMPARISON")
-    print("=" * 85)
+    print("=" * 96)
     
     # Header
-    print(f"  {'Algorithm':<12} {'Moves':<8} {'States':<12} {'Space':<10} {'Branch':<10} {'Time (s)':<10}")
-    print("  " + "-" * 83)
+    print(f"  {'Algorithm':<12} {'Moves':<8} {'States':<12} {'Space':<10} {'Branch':<10} {'Time (s)':<10} {'Mem (MB)':<10}")
+    print("  " + "-" * 94)
     
     # Data rows
     for algo, data in results.items():
         if data['goal']:
             print(f"  {algo:<12} {len(data['moves']):<8} {data['states']:<12,} "
-                  f"{data['space']:<10,} {data['branching']:<10.2f} {data['runtime']:<10.4f}")
+                  f"{data['space']:<10,} {data['branching']:<10.2f} {data['runtime']:<10.4f} "
+                  f"{data['memory'] / 1024 / 1024:<10.2f}")
     
-    print("=" * 85)
+    print("=" * 96)
     
     # Analysis
     valid_results = {k: v for k, v in results.items() if v['goal']}
@@ -94,17 +145,70 @@ def print_comparison_table(results):
     if len(valid_results) > 1:
         print("\nAnalysis:")
         
-        best_moves = min(valid_results.items(), key=lambda x: len(x[1]['moves']))
+        # Move counts are only comparable under the same metric
+        step_results = {k: v for k, v in valid_results.items()
+                        if v.get('metric', 'step') == 'step'} or valid_results
+        best_moves = min(step_results.items(), key=lambda x: len(x[1]['moves']))
         best_speed = min(valid_results.items(), key=lambda x: x[1]['runtime'])
         best_space = min(valid_results.items(), key=lambda x: x[1]['space'])
+        best_memory = min(valid_results.items(), key=lambda x: x[1]['memory'])
         
         print(f"  - Optimal Solution: {best_moves[0]} ({len(best_moves[1]['moves'])} moves)")
         print(f"  - Fastest Runtime:  {best_speed[0]} ({best_speed[1]['runtime']:.4f}s)")
         print(f"  - Space Efficient:  {best_space[0]} ({best_space[1]['space']:,} states)")
+        print(f"  - Lowest Memory:    {best_memory[0]} ({best_memory[1]['memory'] / 1024 / 1024:.2f} MB)")
         print()
 
 
-def main():
+def run_concurrent(start_state, names=None):
+    """Run the solvers in parallel worker processes, reporting each as it finishes"""
+    results = {}
+    names = names or DEFAULT_SOLVERS
+    print(f"  Running {', '.join(names)} concurrently "
+          f"(budget {TIME_BUDGET}s / {MEMORY_BUDGET / 1024 / 1024:.0f} MB each)...")
+    
+    for record in run_solvers(start_state, names, time_budget=TIME_BUDGET,
+                              memory_budget=MEMORY_BUDGET, cancel_on_optimal=CANCEL_ON_OPTIMAL,
+                              cache_file=CACHE_FILE if USE_CACHE else None):
+        name = record['name']
+        spec = SOLVERS[name]
+        print_algorithm_header(name)
+        
+        if record['status'] != 'solved':
+            reason = {
+                'unsolved': "no solution within the state limit",
+                'timeout': f"time budget of {TIME_BUDGET}s exceeded",
+                'memory': f"memory budget of {MEMORY_BUDGET / 1024 / 1024:.0f} MB exceeded",
+                'cancelled': f"cancelled, {record.get('by')} already proved the optimum",
+                'error': record.get('error', 'worker failed'),
+            }[record['status']]
+            print(f"\n  No solution found ({reason})")
+            print(f"  Runtime: {record['runtime']:.4f} seconds")
+            continue
+        
+        results[name] = {
+            'goal': record['goal'],
+            'moves': record['moves'],
+            'states': record['states'],
+            'space': record['space'],
+            'branching': record['branching'],
+            'runtime': record['runtime'],
+            'memory': record['memory'],
+            'metric': spec['metric']
+        }
+        print_solution_summary(name, record['moves'], record['states'], record['space'],
+                               record['branching'], record['runtime'], record['memory'],
+                               metric=spec['metric'])
+        states_list, _ = reconstruct_path(record['goal'])
+        export_solution(states_list, record['moves'], name, spec['export'],
+                       runtime=record['runtime'], states_explored=record['states'],
+                       max_space=record['space'], branching_factor=record['branching'],
+                       compact=True, keyframe_every=KEYFRAME_EVERY)
+    
+    return results
+
+
+def main(concurrent=False, ida=RUN_IDA_STAR):
     """Main solver - runs BFS, DFS, and A* on classic Klotski puzzle"""
     
     print("\n" + "=" * 70)
@@ -112,25 +216,44 @@ def main():
     print("=" * 70)
     print("  Classic Hua Rong Dao Configuration")
     print("  Goal: Move red block (ID 1) to row 3, column 1")
-    print("  Expected optimal solution: 81 moves")
+    print("  Expected optimal solution: 56 steps (35 slides)")
     print("=" * 70 + "\n")
     
     start_state = create_initial_state()
+    cache = SolutionCache(CACHE_FILE) if USE_CACHE else None
+    
+    def solve(solver, state, **options):
+        if cache is None:
+            return solver(state, **options)
+        return solve_cached(cache, solver, state, **options)
     
     print("Initial Board State:")
     start_state.display()
     
+    if concurrent:
+        if cache is not None:
+            cache.close()
+        results = run_concurrent(start_state)
+        if len(results) > 1:
+            print_comparison_table(results)
+        print("\nSolver complete! JSON files generated for visualization.\n")
+        return
+    
     results = {}
     
     # --------- BFS ---------
     print_algorithm_header("BREADTH-FIRST SEARCH (BFS)")
     print("  Strategy: Explore level-by-level, guarantees shortest path")
-    print("  Note: This will find the optimal 81-move solution")
+    print("  Note: This will find the optimal 56-move solution (one-cell steps)")
     print("  Running...")
     
+    metrics_bfs = SearchMetrics(timing=METRICS_TIMING, memory=True)
+    reset_peak_rss()
     start_time = time.time()
-    goal_bfs, states_bfs, space_bfs, branch_bfs = bfs(start_state, max_states=500000)
+    goal_bfs, states_bfs, space_bfs, branch_bfs = solve(bfs, start_state, max_states=500000,
+                                                        metrics=metrics_bfs)
     runtime_bfs = time.time() - start_time
+    memory_bfs = peak_rss()
     
     if goal_bfs:
         states_list_bfs, moves_bfs = reconstruct_path(goal_bfs)
@@ -140,14 +263,65 @@ def main():
             'states': states_bfs,
             'space': space_bfs,
             'branching': branch_bfs,
-            'runtime': runtime_bfs
+            'runtime': runtime_bfs,
+            'memory': memory_bfs
         }
-        print_solution_summary("BFS", moves_bfs, states_bfs, space_bfs, branch_bfs, runtime_bfs)
-        export_solution(states_list_bfs, moves_bfs, "BFS", "bfs_solution.json",
+        print_solution_summary("BFS", moves_bfs, states_bfs, space_bfs, branch_bfs, runtime_bfs,
+                               memory_bfs)
+        export_solution(states_list_bfs, moves_bfs, "BFS", "bfs_solution.jsonl",
                        runtime=runtime_bfs, states_explored=states_bfs,
-                       max_space=space_bfs, branching_factor=branch_bfs)
+                       max_space=space_bfs, branching_factor=branch_bfs,
+                       compact=True, keyframe_every=KEYFRAME_EVERY)
+    else:
+        print("\n  No solution found")
+    if DUMP_METRICS:
+        if metrics_bfs.summary:
+            metrics_bfs.dump("bfs_metrics.json")
+        else:
+            print("  (cache hit: no metrics to write to bfs_metrics.json)")
+    
+
+    # --------- BFS (SLIDE METRIC) ---------
+    print_algorithm_header("BREADTH-FIRST SEARCH (SLIDE METRIC)")
+    print("  Strategy: BFS where sliding one block any distance is one move")
+    print("  Note: This is how the classic 81-move figure (for Heng Dao Li Ma) is")
+    print("        counted; this layout needs 35 slides")
+    print("  Running...")
+    
+    metrics_slide = SearchMetrics(timing=METRICS_TIMING, memory=True)
+    reset_peak_rss()
+    start_time = time.time()
+    goal_slide, states_slide, space_slide, branch_slide = solve(bfs, start_state,
+                                                                max_states=800000, metric="slide",
+                                                                metrics=metrics_slide)
+    runtime_slide = time.time() - start_time
+    memory_slide = peak_rss()
+    
+    if goal_slide:
+        states_list_slide, moves_slide = reconstruct_path(goal_slide)
+        results['BFS-slide'] = {
+            'goal': goal_slide,
+            'moves': moves_slide,
+            'states': states_slide,
+            'space': space_slide,
+            'branching': branch_slide,
+            'runtime': runtime_slide,
+            'memory': memory_slide,
+            'metric': 'slide'
+        }
+        print_solution_summary("BFS-slide", moves_slide, states_slide, space_slide, branch_slide,
+                               runtime_slide, memory_slide, metric="slide")
+        export_solution(states_list_slide, moves_slide, "BFS-slide", "bfs_slide_solution.jsonl",
+                       runtime=runtime_slide, states_explored=states_slide,
+                       max_space=space_slide, branching_factor=branch_slide,
+                       compact=True, keyframe_every=KEYFRAME_EVERY)
     else:
         print("\n  No solution found")
+    if DUMP_METRICS:
+        if metrics_slide.summary:
+            metrics_slide.dump("bfs_slide_metrics.json")
+        else:
+            print("  (cache hit: no metrics to write to bfs_slide_metrics.json)")
     
 
     # --------- A* ---------
@@ -156,9 +330,14 @@ def main():
     print("  Note: Should find optimal solution efficiently")
     print("  Running...")
     
+    metrics_astar = SearchMetrics(timing=METRICS_TIMING, memory=True)
+    reset_peak_rss()
     start_time = time.time()
-    goal_astar, states_astar, space_astar, branch_astar = a_star(start_state, max_states=500000)
+    goal_astar, states_astar, space_astar, branch_astar = solve(a_star, start_state,
+                                                                max_states=500000,
+                                                                metrics=metrics_astar)
     runtime_astar = time.time() - start_time
+    memory_astar = peak_rss()
     
     if goal_astar:
         states_list_astar, moves_astar = reconstruct_path(goal_astar)
@@ -168,21 +347,115 @@ def main():
             'states': states_astar,
             'space': space_astar,
             'branching': branch_astar,
-            'runtime': runtime_astar
+            'runtime': runtime_astar,
+            'memory': memory_astar
         }
-        print_solution_summary("A*", moves_astar, states_astar, space_astar, branch_astar, runtime_astar)
-        export_solution(states_list_astar, moves_astar, "A*", "astar_solution.json",
+        print_solution_summary("A*", moves_astar, states_astar, space_astar, branch_astar, runtime_astar,
+                               memory_astar)
+        export_solution(states_list_astar, moves_astar, "A*", "astar_solution.jsonl",
                        runtime=runtime_astar, states_explored=states_astar,
-                       max_space=space_astar, branching_factor=branch_astar)
+                       max_space=space_astar, branching_factor=branch_astar,
+                       compact=True, keyframe_every=KEYFRAME_EVERY)
     else:
         print("\n  No solution found")
+    if DUMP_METRICS:
+        if metrics_astar.summary:
+            metrics_astar.dump("astar_metrics.json")
+        else:
+            print("  (cache hit: no metrics to write to astar_metrics.json)")
+    
+    # --------- BIDIRECTIONAL BFS ---------
+    print_algorithm_header("BIDIRECTIONAL BFS")
+    print("  Strategy: Grow the smaller of a forward frontier and a backward")
+    print("            frontier seeded with every goal position (one per")
+    print("            shape/mirror class, as the closed sets are keyed)")
+    print("  Note: Returns the same optimal path length as BFS")
+    print("  Running...")
+    
+    reset_peak_rss()
+    start_time = time.time()
+    goal_bibfs, states_bibfs, space_bibfs, branch_bibfs = bidirectional_bfs(start_state, max_states=500000)
+    runtime_bibfs = time.time() - start_time
+    memory_bibfs = peak_rss()
+    
+    if goal_bibfs:
+        states_list_bibfs, moves_bibfs = reconstruct_path(goal_bibfs)
+        results['BiBFS'] = {
+            'goal': goal_bibfs,
+            'moves': moves_bibfs,
+            'states': states_bibfs,
+            'space': space_bibfs,
+            'branching': branch_bibfs,
+            'runtime': runtime_bibfs,
+            'memory': memory_bibfs
+        }
+        print_solution_summary("BiBFS", moves_bibfs, states_bibfs, space_bibfs, branch_bibfs, runtime_bibfs,
+                               memory_bibfs)
+        export_solution(states_list_bibfs, moves_bibfs, "BiBFS", "bibfs_solution.jsonl",
+                       runtime=runtime_bibfs, states_explored=states_bibfs,
+                       max_space=space_bibfs, branching_factor=branch_bibfs,
+                       compact=True, keyframe_every=KEYFRAME_EVERY)
+    else:
+        print("\n  No solution found")
+    
+    # --------- IDA* (opt-in, see RUN_IDA_STAR) ---------
+    if ida:
+        print_algorithm_header("ITERATIVE-DEEPENING A* (IDA*)")
+        print("  Strategy: Depth-first search with a growing f = g + h bound")
+        print("  Note: Memory stays linear in solution depth (plus a bounded table)")
+        print(f"  Heuristic: max over the pattern databases in {IDA_DB_DIR}/")
+
+        layout = start_state.layout
+        dbs = []
+        for pattern, filename in pattern_db_files(layout, IDA_DB_DIR).values():
+            if not os.path.exists(filename):
+                os.makedirs(IDA_DB_DIR, exist_ok=True)
+                print(f"  Building {filename}...")
+                build_pattern_db(layout, pattern, filename)
+            dbs.append(PatternDB(filename, layout))
+        use_pattern_dbs(layout, dbs)
+        print("  Running...")
+
+        reset_peak_rss()
+        start_time = time.time()
+        goal_ida, states_ida, space_ida, branch_ida = ida_star(start_state, max_states=5000000,
+                                                               tt_size=1000000)
+        runtime_ida = time.time() - start_time
+        memory_ida = peak_rss()
+        use_pattern_dbs(layout, [])
+        
+        if goal_ida:
+            states_list_ida, moves_ida = reconstruct_path(goal_ida)
+            results['IDA*'] = {
+                'goal': goal_ida,
+                'moves': moves_ida,
+                'states': states_ida,
+                'space': space_ida,
+                'branching': branch_ida,
+                'runtime': runtime_ida,
+                'memory': memory_ida
+            }
+            print_solution_summary("IDA*", moves_ida, states_ida, space_ida, branch_ida, runtime_ida,
+                                   memory_ida)
+            export_solution(states_list_ida, moves_ida, "IDA*", "idastar_solution.jsonl",
+                           runtime=runtime_ida, states_explored=states_ida,
+                           max_space=space_ida, branching_factor=branch_ida,
+                           compact=True, keyframe_every=KEYFRAME_EVERY)
+        else:
+            print("\n  No solution found")
+            print(f"  Runtime: {runtime_ida:.4f} seconds")
+            print(f"  Peak Memory: {memory_ida / 1024 / 1024:.2f} MB (RSS)")
     
     # --------- COMPARISON ---------
     if len(results) > 1:
         print_comparison_table(results)
     
+    if cache is not None:
+        print(f"\n  Solution cache: {cache.hits} hits, {cache.misses} misses ({CACHE_FILE})")
+        cache.close()
+    
     print("\nSolver complete! JSON files generated for visualization.\n")
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main(concurrent="--concurrent" in sys.argv, ida=RUN_IDA_STAR or "--ida" in sys.argv)
\ No newline at end of file
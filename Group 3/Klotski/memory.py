@@ -0,0 +1,61 @@
+import sys
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def read_status(pid, field):
+    """A kB field of /proc/<pid>/status in bytes, or None without /proc"""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+def reset_peak_rss():
+    """
+    Reset the process peak-RSS counter so the next peak_rss() reading
+    covers only what runs after this call. Supported on Linux. Where
+    neither /proc nor the resource module exists (Windows), this starts
+    tracemalloc instead, and peak_rss() then reports the peak of Python
+    allocations since this call. Elsewhere (macOS) it is a no-op and
+    peak_rss() reports the peak since process start.
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return
+    except OSError:
+        pass
+    if resource is None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+
+
+def peak_rss():
+    """Peak resident set size of this process in bytes (see reset_peak_rss)"""
+    peak = read_status("self", "VmHWM")
+    if peak is not None:
+        return peak
+
+    if resource is not None:
+        # ru_maxrss is in bytes on macOS and kilobytes on Linux
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+    if tracemalloc.is_tracing():
+        return tracemalloc.get_traced_memory()[1]
+    return 0
+
+
+def rss_of(pid):
+    """Current resident set size of another process in bytes, or None if unknown"""
+    return read_status(pid, "VmRSS")
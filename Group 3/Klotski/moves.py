@@ -1,9 +1,6 @@
-DIRECTIONS = {
-    "UP": (-1, 0),
-    "DOWN": (1, 0),
-    "LEFT": (0, -1),
-    "RIGHT": (0, 1)
-}
+from state import DIRECTIONS, State
+
+DIRECTION_NAMES = list(DIRECTIONS)
 
 
 def can_move(block, board, dx, dy):
@@ -27,26 +24,155 @@ def can_move(block, board, dx, dy):
     return True
 
 
+# Move metrics: "step" moves a block one cell, "slide" moves one block
+# any number of cells (turns included) and counts it as a single move,
+# which is how the classic "81 moves" figure is counted.
+METRICS = ("step", "slide")
+
+
+def check_metric(metric):
+    if metric not in METRICS:
+        raise ValueError(f"unknown move metric {metric!r}, expected one of {METRICS}")
+
+
+def get_expander(metric):
+    """Key-level successor function for a move metric"""
+    check_metric(metric)
+    return expand_slides if metric == "slide" else expand_key
+
+
+def expand_key(layout, key, empty=None):
+    """
+    Generate successors of a packed key using bit operations only.
+    Driven by the empty cells: blocks whose halo does not touch an empty
+    cell are skipped without looking at their moves.
+    Returns a list of (new_key, block_index, dir_index) tuples.
+    """
+    field = layout.field
+    if empty is None:
+        empty = layout.empty_cells(key)
+
+    successors = []
+    for i, s in enumerate(layout.shifts):
+        pos = (key >> s) & field
+        if not layout.halo[i][pos] & empty:
+            continue
+        for d, need, delta in layout.move_table[i][pos]:
+            if need & empty == need:
+                successors.append((key + delta, i, d))
+    return successors
+
+
+def expand_slides(layout, key, empty=None):
+    """
+    Slide-metric successors: every position one block can reach through
+    empty cells, found by a small BFS over that block's own moves.
+    Returns a list of (new_key, block_index, dir_indices) tuples, where
+    dir_indices is the shortest sequence of one-cell steps.
+    """
+    field = layout.field
+    if empty is None:
+        empty = layout.empty_cells(key)
+
+    successors = []
+    for i, s in enumerate(layout.shifts):
+        pos = (key >> s) & field
+        if not layout.halo[i][pos] & empty:
+            continue
+
+        # The block may pass back over the cells it starts on
+        free = empty | layout.cell_masks[i][pos]
+        base = key - (pos << s)
+        seen = {pos: ()}
+        frontier = [pos]
+        while frontier:
+            next_frontier = []
+            for p in frontier:
+                for d, need, delta in layout.move_table[i][p]:
+                    if need & free == need:
+                        q = p + (delta >> s)
+                        if q not in seen:
+                            seen[q] = seen[p] + (d,)
+                            next_frontier.append(q)
+            frontier = next_frontier
+
+        for q, dirs in seen.items():
+            if q != pos:
+                successors.append((base + (q << s), i, dirs))
+    return successors
+
+
+def move_name(layout, block_index, dir_index):
+    """Human readable move string, e.g. '3 LEFT' (or '7 DOWN LEFT' for a slide)"""
+    if isinstance(dir_index, tuple):
+        return f"{layout.ids[block_index]} " + " ".join(DIRECTION_NAMES[d] for d in dir_index)
+    return f"{layout.ids[block_index]} {DIRECTION_NAMES[dir_index]}"
+
+
+def make_closed_key(layout, canonical=False, mirror=False):
+    """
+    Return the function (packed key -> closed-set key) searches use to
+    key their closed set.
+    Plain searches key on the exact packed state; canonical mode keys on
+    piece shape (interchangeable blocks merged), optionally folding
+    left-right mirror images as well.
+    """
+    if mirror and not layout.mirror_symmetric:
+        raise ValueError("mirror folding needs a left-right symmetric goal")
+    if not (canonical or mirror):
+        return lambda key: key
+    return lambda key: layout.canonical(key, mirror)
+
+
+# Move code stored in closed tables for the start state
+START = -1
+
+
+def encode_move(layout, block_index, dirs):
+    """
+    Pack a move into a small int: block index plus the direction, or for a
+    slide the step sequence in base 4 behind a leading 1. One-cell steps
+    stay below 4 * number of blocks, so they are shared cached ints.
+    """
+    n = len(layout.ids)
+    if not isinstance(dirs, tuple):
+        return block_index + n * dirs
+    seq = 1
+    for d in dirs:
+        seq = seq * 4 + d
+    return block_index + n * seq
+
+
+def decode_move(layout, code):
+    """Inverse of encode_move: (block_index, dir_index or tuple of them)"""
+    n = len(layout.ids)
+    block_index, seq = code % n, code // n
+    if seq < 4:
+        return block_index, seq
+    dirs = []
+    while seq > 1:
+        dirs.append(seq % 4)
+        seq //= 4
+    return block_index, tuple(reversed(dirs))
+
+
+def move_delta(layout, block_index, dirs):
+    """Change of the packed key when a block makes the move"""
+    deltas = list(DIRECTIONS.values())
+    cells = 0
+    for d in (dirs if isinstance(dirs, tuple) else (dirs,)):
+        dr, dc = deltas[d]
+        cells += dr * layout.cols + dc
+    return cells << layout.shifts[block_index]
+
+
 def apply_move(state, block_id, dx, dy):
     """
     Apply move in-place (mutates state).
     More efficient than creating new state for validation.
     """
-    block = next(b for b in state.blocks if b.id == block_id)
-    
-    # Clear old position
-    for r in range(block.row, block.row + block.height):
-        for c in range(block.col, block.col + block.width):
-            state.board[r][c] = 0
-    
-    # Update position
-    block.row += dx
-    block.col += dy
-    
-    # Place in new position
-    for r in range(block.row, block.row + block.height):
-        for c in range(block.col, block.col + block.width):
-            state.board[r][c] = block.id
+    layout = state.layout
+    state.key += (dx * layout.cols + dy) << layout.shifts[layout.index[block_id]]
 
 
 def undo_move(state, block_id, dx, dy):
@@ -54,26 +180,16 @@ def undo_move(state, block_id, dx, dy):
     apply_move(state, block_id, -dx, -dy)
 
 
-def get_neighbors(state):
+def get_neighbors(state, metric="step"):
     """
     Generate all valid neighboring states.
-    Each neighbor represents a single block move.
+    Each neighbor represents a single block move under the given
+    metric: a one-cell step, or a whole slide of one block.
     """
-    neighbors = []
+    layout = state.layout
+    depth = state.depth + 1
+    expand = get_expander(metric)
     
-    for block in state.blocks:
-        for dir_name, (dx, dy) in DIRECTIONS.items():
-            if can_move(block, state.board, dx, dy):
-                # Create new state by copying current
-                new_state = state.copy()
-                new_state.depth = state.depth + 1
-                new_state.parent = state
-                
-                # Apply the move
-                apply_move(new_state, block.id, dx, dy)
-                new_state.move = f"{block.id} {dir_name}"
-                
-                neighbors.append(new_state)
-    
-    return neighbors
-
+    return [State.from_key(layout, new_key, state, move_name(layout, i, d), depth)
+            for new_key, i, d in expand(layout, state.key)]
+                
\ No newline at end of file
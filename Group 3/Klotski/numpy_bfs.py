@@ -0,0 +1,249 @@
+from array import array
+
+import numpy as np
+
+from bfs import ClosedLayers
+from moves import START, make_closed_key
+from reconstruct import rebuild_goal
+from telemetry import SearchMetrics
+
+
+class VectorLayout:
+    """
+    NumPy lookup tables for a Layout, indexed by block corner position:
+    occupancy masks, and for every (block, direction) the cells a step
+    needs empty and the key delta it adds. Keys are uint64, so deltas of
+    steps towards lower cells are stored in two's complement and wrap.
+    """
+
+    def __init__(self, layout):
+        if len(layout.ids) * layout.bits > 64:
+            raise ValueError("numpy_bfs needs packed keys of at most 64 bits")
+        self.layout = layout
+        self.n = len(layout.ids)
+        cells = layout.rows * layout.cols
+        self.shifts = [np.uint64(s) for s in layout.shifts]
+        self.field = np.uint64(layout.field)
+        self.full_mask = np.uint64(layout.full_mask)
+        self.goal_cell = layout.goal_cell
+        self.red = layout.index.get(1)
+
+        self.cell_masks = [np.array([m or 0 for m in masks], dtype=np.uint64)
+                           for masks in layout.cell_masks]
+        self.mirror_table = [np.array([0 if p is None else p for p in table], dtype=np.int64)
+                             for table in layout.mirror_table]
+
+        # moves[i]: list of (d, valid, need, delta) arrays over positions
+        self.moves = []
+        for table in layout.move_table:
+            per_dir = {}
+            for pos, entries in enumerate(table):
+                for d, need, delta in entries:
+                    if d not in per_dir:
+                        per_dir[d] = (np.zeros(cells, dtype=bool),
+                                      np.zeros(cells, dtype=np.uint64),
+                                      np.zeros(cells, dtype=np.uint64))
+                    valid, needs, deltas = per_dir[d]
+                    valid[pos] = True
+                    needs[pos] = need
+                    deltas[pos] = delta % (1 << 64)
+            self.moves.append([(d,) + per_dir[d] for d in sorted(per_dir)])
+
+    def positions(self, keys):
+        """(len(keys), n) array of block corner positions"""
+        return np.stack([((keys >> s) & self.field).astype(np.int64) for s in self.shifts],
+                        axis=1)
+
+    def pack(self, positions):
+        keys = np.zeros(len(positions), dtype=np.uint64)
+        for i, s in enumerate(self.shifts):
+            keys |= positions[:, i].astype(np.uint64) << s
+        return keys
+
+    def _sorted_keys(self, positions):
+        for group in self.layout.groups:
+            positions[:, group] = np.sort(positions[:, group], axis=1)
+        return self.pack(positions)
+
+    def canonical(self, keys, mirror=False):
+        """Layout.canonical over a whole array of keys"""
+        positions = self.positions(keys)
+        best = self._sorted_keys(positions.copy())
+        if mirror:
+            flipped = np.stack([self.mirror_table[i][positions[:, i]] for i in range(self.n)],
+                               axis=1)
+            best = np.minimum(best, self._sorted_keys(flipped))
+        return best
+
+    def is_goal(self, keys):
+        if self.red is None:
+            return np.zeros(len(keys), dtype=bool)
+        return ((keys >> self.shifts[self.red]) & self.field) == self.goal_cell
+
+    def expand(self, keys):
+        """
+        All one-cell successors of every key at once. Returns (new_keys,
+        parent, code) arrays in the order bfs() generates them: by parent,
+        then block index, then direction.
+        """
+        occupied = np.zeros(len(keys), dtype=np.uint64)
+        positions = []
+        for i, s in enumerate(self.shifts):
+            pos = ((keys >> s) & self.field).astype(np.intp)
+            positions.append(pos)
+            occupied |= self.cell_masks[i][pos]
+        empty = ~occupied & self.full_mask
+
+        new_keys, parents, codes, order = [], [], [], []
+        for i, pos in enumerate(positions):
+            for d, valid, need, delta in self.moves[i]:
+                needed = need[pos]
+                idx = np.nonzero(valid[pos] & ((needed & empty) == needed))[0]
+                new_keys.append(keys[idx] + delta[pos[idx]])
+                parents.append(idx)
+                codes.append(np.full(len(idx), i + self.n * d, dtype=np.int64))
+                order.append(idx * (4 * self.n) + 4 * i + d)
+
+        if not new_keys:
+            empty_result = np.zeros(0, dtype=np.int64)
+            return np.zeros(0, dtype=np.uint64), empty_result, empty_result
+        order = np.argsort(np.concatenate(order), kind="stable")
+        return (np.concatenate(new_keys)[order], np.concatenate(parents)[order],
+                np.concatenate(codes)[order])
+
+
+def numpy_bfs(start_state, max_states=200000, canonical=False, mirror=False, metric="step",
+              metrics=None):
+    """
+    Breadth-First Search that expands a whole depth layer at once with NumPy.
+
+    The layer is a uint64 array of packed keys; move legality for every
+    (state, block, direction) is one vectorized mask test against the
+    precomputed tables in VectorLayout. Duplicates are removed with
+    np.unique (first occurrence wins) and against the two previous layers
+    with np.isin. Successors keep bfs()'s generation order, so the goal,
+    path, states_explored and max_space are exactly those of bfs().
+
+    One-cell steps only (metric="step"); keys must fit in 64 bits.
+    """
+    if metric != "step":
+        raise ValueError("numpy_bfs supports the step metric only")
+    if metrics is None:
+        metrics = SearchMetrics(sample_every=0)
+    metrics.start("NumPy BFS", canonical=canonical, mirror=mirror, metric=metric,
+                  max_states=max_states)
+    layout = start_state.layout
+    vector = VectorLayout(layout)
+    closed_key = make_closed_key(layout, canonical, mirror)
+    if canonical or mirror:
+        closed_keys = lambda keys: vector.canonical(keys, mirror)
+    else:
+        closed_keys = lambda keys: keys
+
+    closed = ClosedLayers("q")
+    closed.add({closed_key(start_state.key): START})
+    layer = np.array([start_state.key], dtype=np.uint64)
+    seen = [np.sort(closed_keys(layer))]  # closed keys of the last two layers, sorted
+
+    states_explored = 0
+    max_queue_size = 1
+    total_branches = 0
+    nodes_expanded = 0
+    depth = 0
+
+    while len(layer):
+        # Pops bfs() makes in this layer: up to the first goal, or past the limit
+        goals = np.nonzero(vector.is_goal(layer))[0]
+        goal_index = int(goals[0]) if len(goals) else None
+        limit_index = max_states - states_explored
+        stop = min(i for i in (goal_index, limit_index, len(layer)) if i is not None)
+        expanded = min(stop, len(layer))
+
+        new_keys, parents, codes = vector.expand(layer[:expanded])
+        keys = closed_keys(new_keys)
+        total_branches += len(new_keys)
+        nodes_expanded += expanded
+
+        # First occurrence of each closed key, minus the previous two layers
+        _, first = np.unique(keys, return_index=True)
+        first.sort()
+        first = first[~np.isin(keys[first], seen[-1])]
+        if len(seen) > 1:
+            first = first[~np.isin(keys[first], seen[-2])]
+
+        # bfs() measures its queue before each pop: rest of this layer plus
+        # the next-layer states added by earlier parents
+        pops = min(stop + 1, len(layer))
+        added = np.bincount(parents[first], minlength=len(layer))[:pops]
+        before = np.concatenate(([0], np.cumsum(added)[:-1]))
+        queue = len(layer) - np.arange(pops) + before
+        max_queue_size = max(max_queue_size, int(queue.max()))
+
+        if stop == limit_index and (goal_index is None or limit_index <= goal_index):
+            states_explored += limit_index + 1
+            avg_branching = total_branches / nodes_expanded if nodes_expanded > 0 else 0
+            metrics.finish(states_explored, False, max_frontier=max_queue_size,
+                           avg_branching=avg_branching, limit_reached=True)
+            print(f"  ⚠️  Reached exploration limit ({max_states} states)")
+            print(f"  ⚠️  No solution found within limit")
+            return None, states_explored, max_queue_size, avg_branching
+
+        if goal_index is not None:
+            states_explored += goal_index + 1
+            avg_branching = total_branches / nodes_expanded if nodes_expanded > 0 else 0
+            metrics.finish(states_explored, True, depth=depth, max_frontier=max_queue_size,
+                           avg_branching=avg_branching)
+            goal = rebuild_goal(layout, closed, int(layer[goal_index]), closed_key)
+            return goal, states_explored, max_queue_size, avg_branching
+
+        states_explored += len(layer)
+
+        # Store the new layer sorted by closed key for rebuild_goal's lookups
+        layer_keys = keys[first]
+        by_key = np.argsort(layer_keys, kind="stable")
+        sorted_keys = layer_keys[by_key]
+        stored = array("Q")
+        stored.frombytes(sorted_keys.tobytes())
+        stored_codes = array("q")
+        stored_codes.frombytes(codes[first][by_key].tobytes())
+        closed.add((stored, stored_codes))
+
+        seen = [seen[-1], sorted_keys]
+        layer = new_keys[first]
+        depth += 1
+        metrics.sample(states_explored, len(layer), states_explored + len(layer), depth=depth)
+
+    avg_branching = total_branches / nodes_expanded if nodes_expanded > 0 else 0
+    metrics.finish(states_explored, False, max_frontier=max_queue_size,
+                   avg_branching=avg_branching)
+    return None, states_explored, max_queue_size, avg_branching
+
+
+if __name__ == "__main__":
+    import contextlib
+    import io
+    import time
+    from bfs import bfs
+    from layout_file import load_layouts, state_from_spec
+
+    cases = [(spec["name"], state_from_spec(spec), options)
+             for spec in load_layouts("benchmark_layouts.txt")
+             if spec["name"] in ("start", "bing-fen-san-lu", "heng-dao-li-ma")
+             for options in ({}, {"canonical": True, "mirror": True})
+             if options or spec["name"] != "heng-dao-li-ma"]
+
+    print(f"  {'Layout':<18} {'Mode':<11} {'Solver':<11} {'Moves':<7} {'States':<11} "
+          f"{'Time (s)':<10} {'States/s':<10}")
+    for name, start_state, options in cases:
+        results = []
+        for solver in (bfs, numpy_bfs):
+            start_time = time.time()
+            with contextlib.redirect_stdout(io.StringIO()):
+                goal, states, space, branching = solver(start_state, max_states=2000000,
+                                                        **options)
+            runtime = time.time() - start_time
+            results.append((goal.key, states, space, branching))
+            print(f"  {name:<18} {'canonical' if options else 'exact':<11} "
+                  f"{solver.__name__:<11} {goal.depth:<7} {states:<11,} {runtime:<10.2f} "
+                  f"{states / runtime:<10,.0f}")
+        print(f"  {'':<18} identical results: {results[0] == results[1]}")
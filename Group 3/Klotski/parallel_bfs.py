@@ -0,0 +1,250 @@
+import multiprocessing as mp
+from array import array
+
+from moves import START, encode_move, get_expander, make_closed_key
+from reconstruct import rebuild_goal
+from telemetry import SearchMetrics
+
+# Seconds a worker gets to exit after "stop" before it is terminated
+STOP_TIMEOUT = 5
+
+
+def shard_of(key, num_shards):
+    """Owner shard of a closed-set key (multiplicative hash, same in every process)"""
+    return ((key * 0x9E3779B97F4A7C15) >> 32) % num_shards
+
+
+def pack_batch(keys, codes, code_type):
+    """
+    One shard's successors for a layer as two arrays (packed keys, move
+    codes), which pickle as two raw byte strings instead of a tuple per
+    successor. Keys wider than 64 bits stay a list.
+    """
+    try:
+        keys = array("Q", keys)
+    except OverflowError:
+        pass
+    return keys, array(code_type, codes)
+
+
+def shard_worker(index, num_shards, layout, canonical, mirror, metric, conn, inboxes):
+    """
+    One shard of the visited set. Per layer it expands the frontier states
+    it owns and sorts the successors by owning shard, dropping the ones
+    already seen: its own keys against its closed table, the others within
+    the layer's batch. Each other shard then gets the batch as one packed
+    message; what arrives is deduplicated against the local closed table.
+    No state is shared between shards, so there is no lock.
+    """
+    expand = get_expander(metric)
+    closed_key = make_closed_key(layout, canonical, mirror)
+    code_type = "B" if metric == "step" and 4 * len(layout.ids) < 256 else "Q"
+    came_from = {}
+    frontier = []
+
+    while True:
+        command, arg = conn.recv()
+
+        if command == "seed":
+            came_from[closed_key(arg)] = START
+            frontier = [arg]
+            conn.send(None)
+
+        elif command == "expand":
+            next_frontier = []
+            goal = None
+            outgoing = [{} for _ in range(num_shards)]  # closed key -> (key, code)
+            branches = 0
+            for current in frontier:
+                successors = expand(layout, current)
+                branches += len(successors)
+                for new_key, i, d in successors:
+                    key = closed_key(new_key)
+                    if key in came_from:
+                        continue
+                    target = shard_of(key, num_shards)
+                    if target == index:
+                        came_from[key] = encode_move(layout, i, d)
+                        next_frontier.append(new_key)
+                        if goal is None and layout.is_goal(new_key):
+                            goal = new_key
+                    elif key not in outgoing[target]:
+                        outgoing[target][key] = (new_key, encode_move(layout, i, d))
+            expanded = len(frontier)
+            for target, batch in enumerate(outgoing):
+                if target != index:
+                    keys = [new_key for new_key, _ in batch.values()]
+                    codes = [code for _, code in batch.values()]
+                    inboxes[target].put(pack_batch(keys, codes, code_type))
+
+            for _ in range(num_shards - 1):
+                keys, codes = inboxes[index].get()
+                for new_key, code in zip(keys, codes):
+                    key = closed_key(new_key)
+                    if key in came_from:
+                        continue
+                    came_from[key] = code
+                    next_frontier.append(new_key)
+                    if goal is None and layout.is_goal(new_key):
+                        goal = new_key
+            frontier = next_frontier
+            conn.send((expanded, branches, len(frontier), goal))
+
+        elif command == "code":
+            conn.send(came_from[arg])
+
+        elif command == "stop":
+            conn.send(None)
+            return
+
+
+class ShardedTable:
+    """Read-only view of the sharded closed tables for rebuild_goal"""
+
+    def __init__(self, conns):
+        self.conns = conns
+
+    def __getitem__(self, key):
+        conn = self.conns[shard_of(key, len(self.conns))]
+        conn.send(("code", key))
+        return conn.recv()
+
+
+def parallel_bfs(start_state, max_states=200000, workers=None, canonical=False,
+                 mirror=False, metric="step", metrics=None):
+    """
+    Level-synchronous Breadth-First Search over a pool of worker processes.
+
+    The visited set is partitioned by hash of the closed-set key; each
+    worker owns one shard, expands the frontier states it owns and
+    deduplicates incoming successors locally. Layers are expanded in
+    lockstep, so the first layer containing a goal gives the optimal depth,
+    as in bfs(). Returns the same (goal, states_explored, max_space,
+    avg_branching) tuple as bfs(); max_space is the largest layer.
+
+    metrics is a telemetry.SearchMetrics collector; the default one only
+    prints progress. It is sampled once per layer.
+    """
+    if metrics is None:
+        metrics = SearchMetrics()
+    if workers is None:
+        workers = mp.cpu_count()
+    layout = start_state.layout
+    closed_key = make_closed_key(layout, canonical, mirror)
+
+    ctx = mp.get_context()
+    inboxes = [ctx.Queue() for _ in range(workers)]
+    conns = []
+    processes = []
+    for index in range(workers):
+        parent_conn, child_conn = ctx.Pipe()
+        process = ctx.Process(target=shard_worker,
+                              args=(index, workers, layout, canonical, mirror, metric,
+                                    child_conn, inboxes),
+                              daemon=True)
+        process.start()
+        conns.append(parent_conn)
+        processes.append(process)
+
+    states_explored = 0
+    max_layer_size = 1
+    total_branches = 0
+    nodes_expanded = 0
+    depth = 0
+    next_sample = metrics.next_sample(0)
+
+    metrics.start("Parallel BFS", workers=workers, canonical=canonical, mirror=mirror,
+                  metric=metric, max_states=max_states)
+
+    try:
+        owner = conns[shard_of(closed_key(start_state.key), workers)]
+        owner.send(("seed", start_state.key))
+        owner.recv()
+
+        if layout.is_goal(start_state.key):
+            metrics.finish(1, True, depth=0, max_frontier=1, avg_branching=0)
+            return rebuild_goal(layout, ShardedTable(conns), start_state.key, closed_key), 1, 1, 0
+
+        layer_size = 1
+        while layer_size:
+            for conn in conns:
+                conn.send(("expand", None))
+            replies = [conn.recv() for conn in conns]
+
+            layer_size = 0
+            goal = None
+            for expanded, branches, size, shard_goal in replies:
+                nodes_expanded += expanded
+                total_branches += branches
+                layer_size += size
+                if goal is None:
+                    goal = shard_goal
+            states_explored = nodes_expanded
+            max_layer_size = max(max_layer_size, layer_size)
+            depth += 1
+            if 0 <= next_sample <= states_explored:
+                metrics.sample(states_explored, layer_size, states_explored + layer_size,
+                               depth=depth)
+                next_sample = metrics.next_sample(states_explored)
+            avg_branching = total_branches / nodes_expanded if nodes_expanded > 0 else 0
+
+            if goal is not None:
+                states_explored += 1
+                metrics.finish(states_explored, True, depth=depth, max_frontier=max_layer_size,
+                               avg_branching=avg_branching)
+                goal_state = rebuild_goal(layout, ShardedTable(conns), goal, closed_key)
+                return goal_state, states_explored, max_layer_size, avg_branching
+
+            # Safety limit to prevent infinite loops
+            if states_explored > max_states:
+                metrics.finish(states_explored, False, max_frontier=max_layer_size,
+                               avg_branching=avg_branching, limit_reached=True)
+                print(f"  ⚠️  Reached exploration limit ({max_states} states)")
+                print(f"  ⚠️  No solution found within limit")
+                return None, states_explored, max_layer_size, avg_branching
+
+        # No solution found
+        avg_branching = total_branches / nodes_expanded if nodes_expanded > 0 else 0
+        metrics.finish(states_explored, False, max_frontier=max_layer_size,
+                       avg_branching=avg_branching)
+        return None, states_explored, max_layer_size, avg_branching
+    finally:
+        # A worker stuck mid-layer (or already dead) never answers "stop",
+        # so the request is best-effort and stragglers are terminated
+        for conn in conns:
+            try:
+                conn.send(("stop", None))
+            except OSError:
+                pass
+        for process in processes:
+            process.join(STOP_TIMEOUT)
+            if process.is_alive():
+                process.terminate()
+                process.join()
+        for conn in conns:
+            conn.close()
+
+
+if __name__ == "__main__":
+    import time
+    from bfs import bfs
+    from main import create_initial_state
+
+    start_state = create_initial_state()
+
+    start_time = time.time()
+    goal, states, _, _ = bfs(start_state, max_states=1000000)
+    serial = time.time() - start_time
+    print(f"  bfs(): {goal.depth} moves, {states:,} states, {serial:.2f}s\n")
+
+    print(f"  {'Workers':<10} {'Moves':<8} {'States':<12} {'Time (s)':<10} {'Speedup':<10}")
+    workers = 1
+    while workers <= mp.cpu_count():
+        start_time = time.time()
+        goal, states, _, _ = parallel_bfs(start_state, max_states=1000000, workers=workers)
+        runtime = time.time() - start_time
+        print(f"  {workers:<10} {goal.depth:<8} {states:<12,} {runtime:<10.2f} "
+              f"{serial / runtime:<10.2f}")
+        workers *= 2
+    if mp.cpu_count() == 1:
+        print("  (one CPU: more workers would only share it, so no speedup is measurable)")
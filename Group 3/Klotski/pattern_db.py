@@ -0,0 +1,248 @@
+from itertools import combinations
+
+from distance_db import Table, layout_signature, write_table
+from state import DIRECTIONS
+
+
+class Abstraction:
+    """
+    Projection of a layout onto a pattern: the pattern blocks (always
+    including block 1) are tracked exactly, the empty cells are tracked
+    as a bit mask, and every other block becomes anonymous filler.
+
+    An abstract state is packed as pattern positions in the low bits and
+    the empty-cell mask above them. Abstract moves are:
+      - a pattern block moves like a real block (newly covered cells empty)
+      - a filler piece of any non-pattern shape moves, provided all of its
+        cells are filler and the cells it moves into are empty.
+    Every real move maps to an abstract move, so abstract distances never
+    exceed real ones: the heuristic is admissible and consistent.
+    """
+
+    def __init__(self, layout, pattern_ids):
+        if 1 not in pattern_ids:
+            raise ValueError("the pattern must contain the goal block (id 1)")
+        self.layout = layout
+        self.pattern_ids = sorted(pattern_ids, key=layout.index.__getitem__)
+        self.pattern = [layout.index[block_id] for block_id in self.pattern_ids]
+        self.empty_shift = len(self.pattern) * layout.bits
+        self.num_empty = layout.rows * layout.cols - sum(
+            layout.widths[i] * layout.heights[i] for i in range(len(layout.ids)))
+
+        # Pattern block moves: per block and corner, (need, vacated, new corner)
+        self.pattern_moves = []
+        for i in self.pattern:
+            masks = layout.cell_masks[i]
+            table = []
+            for pos, mask in enumerate(masks):
+                entries = []
+                if mask is not None:
+                    for new_pos in self._shifted(pos, masks):
+                        new_mask = masks[new_pos]
+                        entries.append((new_mask & ~mask, mask & ~new_mask, new_pos))
+                table.append(entries)
+            self.pattern_moves.append(table)
+
+        # Filler moves: (piece cells, need, vacated), indexed by one of the
+        # needed cells so only moves next to an empty cell are looked at
+        filler_shapes = {(layout.widths[i], layout.heights[i])
+                         for i in range(len(layout.ids)) if i not in self.pattern}
+        self.filler_moves = [[] for _ in range(layout.rows * layout.cols)]
+        for w, h in filler_shapes:
+            masks = self._shape_masks(w, h)
+            for pos, mask in enumerate(masks):
+                if mask is None:
+                    continue
+                for new_pos in self._shifted(pos, masks):
+                    new_mask = masks[new_pos]
+                    need = new_mask & ~mask
+                    low_cell = (need & -need).bit_length() - 1
+                    self.filler_moves[low_cell].append((mask, need, mask & ~new_mask))
+
+    def _shape_masks(self, w, h):
+        for i in range(len(self.layout.ids)):
+            if (self.layout.widths[i], self.layout.heights[i]) == (w, h):
+                return self.layout.cell_masks[i]
+
+    def _shifted(self, pos, masks):
+        """Corners reachable from pos by a one-cell step that stay on the board"""
+        rows, cols = self.layout.rows, self.layout.cols
+        r, c = divmod(pos, cols)
+        for dr, dc in DIRECTIONS.values():
+            nr, nc = r + dr, c + dc
+            if 0 <= nr < rows and 0 <= nc < cols and masks[nr * cols + nc] is not None:
+                yield nr * cols + nc
+
+    def pack(self, positions, empty):
+        key = 0
+        for k, pos in enumerate(positions):
+            key |= pos << (k * self.layout.bits)
+        return key | (empty << self.empty_shift)
+
+    def unpack(self, key):
+        field = self.layout.field
+        bits = self.layout.bits
+        positions = [(key >> (k * bits)) & field for k in range(len(self.pattern))]
+        return positions, key >> self.empty_shift
+
+    def project(self, key):
+        """Abstract key of a real packed key"""
+        layout = self.layout
+        positions = layout.positions(key)
+        empty = layout.full_mask & ~layout.occupancy(key)
+        return self.pack([positions[i] for i in self.pattern], empty)
+
+    def goal_keys(self):
+        """Every abstract goal: block 1 on the goal cell, anything else free"""
+        layout = self.layout
+        positions = [0] * len(self.pattern)
+        keys = []
+
+        def place(k, occ):
+            if k == len(self.pattern):
+                free = [c for c in range(layout.rows * layout.cols) if not occ >> c & 1]
+                for cells in combinations(free, self.num_empty):
+                    empty = 0
+                    for c in cells:
+                        empty |= 1 << c
+                    keys.append(self.pack(positions, empty))
+                return
+            i = self.pattern[k]
+            if layout.ids[i] == 1:
+                candidates = [layout.goal_cell]
+            else:
+                candidates = range(layout.rows * layout.cols)
+            for pos in candidates:
+                mask = layout.cell_masks[i][pos]
+                if mask is not None and not mask & occ:
+                    positions[k] = pos
+                    place(k + 1, occ | mask)
+
+        place(0, 0)
+        return keys
+
+    def successors(self, key):
+        layout = self.layout
+        positions, empty = self.unpack(key)
+
+        pattern_occ = 0
+        for i, pos in zip(self.pattern, positions):
+            pattern_occ |= layout.cell_masks[i][pos]
+        blocked = pattern_occ | empty
+
+        result = []
+        for k, pos in enumerate(positions):
+            for need, vacated, new_pos in self.pattern_moves[k][pos]:
+                if need & ~empty == 0:
+                    moved = positions[:]
+                    moved[k] = new_pos
+                    result.append(self.pack(moved, (empty & ~need) | vacated))
+
+        base = key & ((1 << self.empty_shift) - 1)
+        cells = empty
+        while cells:
+            low = cells & -cells
+            cells ^= low
+            for mask, need, vacated in self.filler_moves[low.bit_length() - 1]:
+                if not mask & blocked and need & ~empty == 0:
+                    result.append(base | (((empty & ~need) | vacated) << self.empty_shift))
+        return result
+
+
+def build_pattern_db(layout, pattern_ids, filename):
+    """
+    Offline builder: retrograde BFS over the abstract state space from every
+    abstract goal, written as a distance table. Returns the number of entries.
+    """
+    abstraction = Abstraction(layout, pattern_ids)
+
+    distances = {}
+    frontier = abstraction.goal_keys()
+    for key in frontier:
+        distances[key] = 0
+
+    depth = 0
+    while frontier:
+        depth += 1
+        next_frontier = []
+        for key in frontier:
+            for new_key in abstraction.successors(key):
+                if new_key not in distances:
+                    distances[new_key] = depth
+                    next_frontier.append(new_key)
+        frontier = next_frontier
+
+    header = layout_signature(layout)
+    header.update(pattern=abstraction.pattern_ids, max_distance=depth - 1)
+    write_table(filename, header, distances)
+    print(f"✓ Exported to {filename} ({len(distances):,} abstract states)")
+    return len(distances)
+
+
+class PatternDB:
+    """
+    Pattern database loaded from disk into a dict for O(1) lookups.
+    Abstract states missing from the table cannot reach the goal.
+    """
+
+    def __init__(self, filename, layout):
+        table = Table(filename)
+        try:
+            signature = layout_signature(layout)
+            if any(table.header[k] != v for k, v in signature.items()):
+                raise ValueError("pattern database was built for a different layout")
+            self.abstraction = Abstraction(layout, table.header["pattern"])
+            self.distances = dict(table.items())
+        finally:
+            table.close()
+
+    def heuristic(self, key):
+        return self.distances.get(self.abstraction.project(key), float('inf'))
+
+
+def pattern_presets(layout):
+    """
+    Ready-made patterns: block 1 alone (2x2 piece + empty cells), and
+    block 1 together with every vertical (1x2) piece.
+    """
+    verticals = [block_id for block_id, w, h in zip(layout.ids, layout.widths, layout.heights)
+                 if block_id != 1 and w == 1 and h == 2]
+    return {"red": [1], "verticals": [1] + verticals}
+
+
+def use_pattern_dbs(layout, dbs):
+    """Make State.get_heuristic take the max over these pattern databases"""
+    layout.pattern_dbs = list(dbs)
+
+
+if __name__ == "__main__":
+    import time
+    from astar import a_star
+    from main import create_initial_state
+
+    start_state = create_initial_state()
+    layout = start_state.layout
+
+    print("Current heuristic (Manhattan + blocking penalty):")
+    start_time = time.time()
+    goal, states, space, _ = a_star(start_state, max_states=500000)
+    base = (goal.depth if goal else None, states, space, time.time() - start_time)
+
+    dbs = []
+    for name, pattern in pattern_presets(layout).items():
+        filename = f"pdb_{name}.db"
+        start_time = time.time()
+        build_pattern_db(layout, pattern, filename)
+        print(f"  built {name} in {time.time() - start_time:.2f}s")
+        dbs.append(PatternDB(filename, layout))
+
+    print("Pattern database heuristic (max over presets):")
+    use_pattern_dbs(layout, dbs)
+    start_time = time.time()
+    goal, states, space, _ = a_star(start_state, max_states=500000)
+    pdb = (goal.depth if goal else None, states, space, time.time() - start_time)
+    use_pattern_dbs(layout, [])
+
+    print(f"\n  {'Heuristic':<12} {'Moves':<8} {'Expanded':<12} {'Space':<10} {'Time (s)':<10}")
+    for name, (moves, states, space, runtime) in (("current", base), ("pattern db", pdb)):
+        print(f"  {name:<12} {moves:<8} {states:<12,} {space:<10,} {runtime:<10.4f}")
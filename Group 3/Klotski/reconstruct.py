@@ -1,3 +1,7 @@
+from moves import START, decode_move, move_delta, move_name
+from state import State
+
+
 def reconstruct_path(goal_state):
     """
     Reconstruct solution path from goal to start.
@@ -23,3 +27,30 @@ def reconstruct_path(goal_state):
     
     return states, moves
 
+
+
+def rebuild_goal(layout, came_from, goal_key, closed_key=None):
+    """
+    Rebuild the goal State, with its parent chain back to the start, from
+    a parent-free closed table mapping closed-set key -> move code.
+    Predecessors are recovered by undoing each move, so only the final
+    path is ever turned into State objects.
+    """
+    if closed_key is None:
+        closed_key = lambda key: key
+
+    codes = []
+    key = goal_key
+    code = came_from[closed_key(key)]
+    while code != START:
+        codes.append(code)
+        block_index, dirs = decode_move(layout, code)
+        key -= move_delta(layout, block_index, dirs)
+        code = came_from[closed_key(key)]
+
+    state = State.from_key(layout, key)
+    for code in reversed(codes):
+        block_index, dirs = decode_move(layout, code)
+        state = State.from_key(layout, state.key + move_delta(layout, block_index, dirs),
+                               state, move_name(layout, block_index, dirs), state.depth + 1)
+    return state
@@ -0,0 +1,163 @@
+import contextlib
+import io
+import multiprocessing as mp
+import os
+import time
+import traceback
+from multiprocessing.connection import wait
+
+from astar import a_star
+from bfs import bfs
+from bidirectional import bidirectional_bfs
+from idastar import ida_star
+from memory import peak_rss, reset_peak_rss, rss_of
+from reconstruct import reconstruct_path
+from solution_cache import SolutionCache, solve_cached
+from state import State
+
+# Solvers main.py can run, with the options it uses. "optimal" marks the
+# ones whose first solution is a proven optimum for their metric.
+SOLVERS = {
+    "BFS": dict(solver=bfs, options={"max_states": 500000}, metric="step",
+                optimal=True, export="bfs_solution.jsonl"),
+    "BFS-slide": dict(solver=bfs, options={"max_states": 800000, "metric": "slide"},
+                      metric="slide", optimal=True, export="bfs_slide_solution.jsonl"),
+    "A*": dict(solver=a_star, options={"max_states": 500000}, metric="step",
+               optimal=False, export="astar_solution.jsonl"),
+    "BiBFS": dict(solver=bidirectional_bfs, options={"max_states": 500000}, metric="step",
+                  optimal=True, export="bibfs_solution.jsonl"),
+    "IDA*": dict(solver=ida_star, options={"max_states": 500000, "tt_size": 100000},
+                 metric="step", optimal=False, export="idastar_solution.jsonl"),
+}
+
+# IDA* needs pattern DBs to solve the classic layout (see main.RUN_IDA_STAR);
+# run it concurrently only when asked for by name
+DEFAULT_SOLVERS = [name for name in SOLVERS if name != "IDA*"]
+
+POLL_INTERVAL = 0.05  # seconds between budget checks
+
+
+def solver_worker(name, start_state, conn, cache_file):
+    """Worker process: run one solver and send back a plain result record on conn"""
+    spec = SOLVERS[name]
+    record = {"name": name, "status": "unsolved"}
+    try:
+        reset_peak_rss()
+        start_time = time.time()
+        with contextlib.redirect_stdout(io.StringIO()):
+            if cache_file and spec["solver"] in (bfs, a_star):
+                cache = SolutionCache(cache_file)
+                result = solve_cached(cache, spec["solver"], start_state, **spec["options"])
+                cache.close()
+            else:
+                result = spec["solver"](start_state, **spec["options"])
+        goal, states, space, branching = result
+        record.update(runtime=time.time() - start_time, memory=peak_rss(),
+                      states=states, space=space, branching=branching)
+        if goal is not None:
+            # Keys and move names only: cheap to pickle, rebuilt by the parent
+            path, moves = reconstruct_path(goal)
+            record.update(status="solved", keys=[s.key for s in path], moves=moves)
+    except Exception:
+        record.update(status="error", error=traceback.format_exc())
+    conn.send(record)
+    conn.close()
+
+
+def goal_from_record(start_state, record):
+    """Rebuild the goal State (with parents) from a worker's record"""
+    state = State.from_key(start_state.layout, record["keys"][0])
+    for key, move in zip(record["keys"][1:], record["moves"]):
+        state = State.from_key(start_state.layout, key, state, move, state.depth + 1)
+    return state
+
+
+def run_solvers(start_state, names=None, time_budget=None, memory_budget=None,
+                cancel_on_optimal=False, cache_file=None):
+    """
+    Run the selected solvers concurrently, one worker process each, and
+    yield a result record per solver as it finishes.
+
+    A solver is stopped with status "timeout" once it has run for
+    time_budget seconds, or "memory" once its resident set exceeds
+    memory_budget bytes. With cancel_on_optimal, the first solution from
+    a solver marked optimal cancels the others still running on the same
+    move metric (status "cancelled"), since none can find a shorter path.
+    Solved records carry "goal", a State with its parent chain.
+
+    Each worker sends its record over a pipe of its own, so terminating
+    one mid-send can only break that worker's pipe, never another's.
+    The memory budget needs /proc (see memory.rss_of); without it the
+    budget is not enforced and a warning is printed.
+    """
+    names = list(names or DEFAULT_SOLVERS)
+    if memory_budget is not None and rss_of(os.getpid()) is None:
+        print("  ⚠️  Memory budget not enforced: no /proc to read worker memory from")
+        memory_budget = None
+    ctx = mp.get_context()
+    processes = {}
+    conns = {}
+    started = {}
+    for name in names:
+        reader, writer = ctx.Pipe(duplex=False)
+        process = ctx.Process(target=solver_worker, args=(name, start_state, writer, cache_file),
+                              daemon=True)
+        process.start()
+        writer.close()  # the worker holds the only write end, so its exit means EOF
+        processes[name] = process
+        conns[name] = reader
+        started[name] = time.time()
+
+    pending = set(names)
+
+    def stop(name, status, **extra):
+        processes[name].terminate()
+        processes[name].join()
+        conns[name].close()
+        pending.discard(name)
+        return dict({"name": name, "status": status,
+                     "runtime": time.time() - started[name]}, **extra)
+
+    try:
+        while pending:
+            ready = wait([conns[name] for name in pending], timeout=POLL_INTERVAL)
+
+            finished = []
+            for name in sorted(name for name in pending if conns[name] in ready):
+                if name not in pending:
+                    continue  # cancelled by an earlier record of this round
+                try:
+                    record = conns[name].recv()
+                except EOFError:
+                    processes[name].join()
+                    finished.append(stop(name, "error", error=f"worker exited with code "
+                                                              f"{processes[name].exitcode}"))
+                    continue
+                processes[name].join()
+                conns[name].close()
+                pending.discard(name)
+                if record["status"] == "solved":
+                    record["goal"] = goal_from_record(start_state, record)
+                finished.append(record)
+
+                if cancel_on_optimal and record["status"] == "solved" and SOLVERS[name]["optimal"]:
+                    metric = SOLVERS[name]["metric"]
+                    for other in sorted(pending):
+                        if SOLVERS[other]["metric"] == metric:
+                            finished.append(stop(other, "cancelled", by=name))
+
+            for name in sorted(pending):
+                process = processes[name]
+                if time_budget is not None and time.time() - started[name] > time_budget:
+                    finished.append(stop(name, "timeout"))
+                    continue
+                rss = rss_of(process.pid) if memory_budget is not None else None
+                if rss is not None and rss > memory_budget:
+                    finished.append(stop(name, "memory", memory=rss))
+
+            yield from finished
+    finally:
+        for name in pending:
+            processes[name].terminate()
+            processes[name].join()
+            conns[name].close()
@@ -0,0 +1,230 @@
+import hashlib
+import json
+import sqlite3
+import time
+
+from distance_db import layout_signature
+from moves import get_expander, move_name
+from state import State
+
+# Solver options that do not change which path is found
+NOT_SETTINGS = ("max_states", "metrics")
+
+# Bumped whenever the tables change; an older cache file is emptied
+SCHEMA_VERSION = 4
+
+# Solvers whose paths are shortest paths, so every suffix is optimal too;
+# the A* variants only with an admissible heuristic: pattern DBs attached,
+# and one-cell steps, since a PDB distance counts steps and can exceed the
+# number of slides
+OPTIMAL_SOLVERS = ("bfs", "numpy_bfs", "external_bfs", "parallel_bfs",
+                   "bidirectional_bfs", "db_solve")
+ADMISSIBLE_SOLVERS = ("a_star", "bucket_a_star")
+
+
+def proves_optimal(algorithm, layout, metric="step"):
+    """True when this solver's paths are proven shortest on this layout and metric"""
+    return algorithm in OPTIMAL_SOLVERS or (algorithm in ADMISSIBLE_SOLVERS
+                                            and bool(layout.pattern_dbs)
+                                            and metric == "step")
+
+
+class SolutionCache:
+    """
+    Persistent solution cache (one SQLite file).
+
+    An entry is a solved path stored as its chain of canonical keys, keyed
+    by a hash of the solver settings and the canonical start key. For
+    solvers that prove optimality (proves_optimal) every position of the
+    path is indexed too, so a start that lies anywhere on such a path is
+    answered with the rest of it; when several paths pass through the same
+    position the one with the shortest remaining distance answers. Other
+    solvers' paths only answer their own start. Because keys are
+    canonical (identical pieces merged, mirror images folded when the goal
+    is symmetric), relabelled or mirrored starts hit as well; the real
+    path is replayed move by move from the caller's own start state.
+
+    Each entry also keeps the search statistics of the solve that produced
+    it, which a hit on that same start returns.
+
+    Entries are evicted least-recently-used first once the stored paths
+    exceed max_bytes. Every entry owns its own position rows, so evicting
+    one never drops a position another cached path still passes through.
+    """
+
+    def __init__(self, filename="solution_cache.db", max_bytes=16 * 1024 * 1024):
+        self.filename = filename
+        self.max_bytes = max_bytes
+        self.db = sqlite3.connect(filename)
+        if self.db.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            self.db.executescript("""
+                DROP TABLE IF EXISTS entries;
+                DROP TABLE IF EXISTS positions;
+            """)
+            self.db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS entries (
+                id TEXT PRIMARY KEY, settings TEXT, chain TEXT, stats TEXT,
+                size INTEGER, last_used REAL);
+            CREATE TABLE IF NOT EXISTS positions (
+                settings TEXT, position TEXT, entry TEXT, step INTEGER,
+                distance INTEGER, PRIMARY KEY (settings, position, entry));
+            CREATE INDEX IF NOT EXISTS positions_entry ON positions (entry);
+        """)
+        self.hits = 0
+        self.misses = 0
+
+    def settings_hash(self, layout, algorithm, options):
+        """Hash of everything besides the start that decides the cached path"""
+        settings = dict(layout_signature(layout), algorithm=algorithm,
+                        pattern_dbs=bool(layout.pattern_dbs),
+                        options={k: v for k, v in options.items() if k not in NOT_SETTINGS})
+        return hashlib.sha1(json.dumps(settings, sort_keys=True).encode()).hexdigest()
+
+    def canonical(self, layout, key):
+        return layout.canonical(key, layout.mirror_symmetric)
+
+    def get(self, start_state, algorithm, **options):
+        """
+        (goal, stats) for these settings, or None: goal is the cached goal
+        State with its parent chain back to start_state, stats the stored
+        (states_explored, max_space, avg_branching) of the original solve.
+        Positions further along a cached path hit as well, with zero stats
+        since no search was ever run from them.
+        """
+        layout = start_state.layout
+        settings = self.settings_hash(layout, algorithm, options)
+        row = self.db.execute(
+            "SELECT entries.id, entries.chain, entries.stats, positions.step FROM positions "
+            "JOIN entries ON entries.id = positions.entry "
+            "WHERE positions.settings = ? AND positions.position = ? "
+            "ORDER BY positions.distance LIMIT 1",
+            (settings, str(self.canonical(layout, start_state.key)))).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+
+        entry, chain, stats, step = row
+        self.db.execute("UPDATE entries SET last_used = ? WHERE id = ?", (time.time(), entry))
+        self.db.commit()
+        self.hits += 1
+        chain = json.loads(chain)[step:]
+        stats = tuple(json.loads(stats)) if step == 0 else (0, 0, 0)
+        return self.replay(start_state, chain, options.get("metric", "step")), stats
+
+    def replay(self, start_state, chain, metric):
+        """Turn a canonical key chain back into real moves from start_state"""
+        layout = start_state.layout
+        expand = get_expander(metric)
+        state = State.from_key(layout, start_state.key)
+        for target in chain[1:]:
+            new_key, i, d = next(move for move in expand(layout, state.key)
+                                 if self.canonical(layout, move[0]) == target)
+            state = State.from_key(layout, new_key, state, move_name(layout, i, d),
+                                   state.depth + 1)
+        return state
+
+    def put(self, start_state, goal, algorithm, stats=(0, 0, 0), **options):
+        """
+        Store the path from start_state to goal (a State with parents),
+        with the (states_explored, max_space, avg_branching) of its solve.
+        Positions past the start are indexed only for optimal solvers.
+        """
+        layout = start_state.layout
+        settings = self.settings_hash(layout, algorithm, options)
+        chain = []
+        state = goal
+        while state is not None:
+            chain.append(self.canonical(layout, state.key))
+            state = state.parent
+        chain.reverse()
+
+        entry = hashlib.sha1(f"{settings}:{chain[0]}".encode()).hexdigest()
+        text = json.dumps(chain)
+        self.db.execute("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?)",
+                        (entry, settings, text, json.dumps(list(stats)), len(text),
+                         time.time()))
+        if not proves_optimal(algorithm, layout, options.get("metric", "step")):
+            chain_positions = chain[:1]
+        else:
+            chain_positions = chain
+        self.db.execute("DELETE FROM positions WHERE entry = ?", (entry,))
+        self.db.executemany(
+            "INSERT OR IGNORE INTO positions VALUES (?, ?, ?, ?, ?)",
+            ((settings, str(key), entry, step, len(chain) - 1 - step)
+             for step, key in enumerate(chain_positions)))
+        self.evict()
+        self.db.commit()
+
+    def size(self):
+        """Bytes of stored paths"""
+        return self.db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def evict(self):
+        """Drop least-recently-used entries until the cache fits in max_bytes"""
+        total = self.size()
+        rows = self.db.execute("SELECT id, size FROM entries ORDER BY last_used").fetchall()
+        for entry, size in rows:
+            if total <= self.max_bytes:
+                break
+            self.db.execute("DELETE FROM positions WHERE entry = ?", (entry,))
+            self.db.execute("DELETE FROM entries WHERE id = ?", (entry,))
+            total -= size
+
+    def close(self):
+        self.db.close()
+
+
+def solve_cached(cache, solver, start_state, **options):
+    """
+    Call solver(start_state, **options) through the cache. Returns the
+    solver's (goal, states_explored, max_space, avg_branching) tuple; a
+    cache hit returns the cached path with the statistics of the solve
+    that stored it (zeros for a hit part-way along a cached path).
+    """
+    algorithm = solver.__name__
+    hit = cache.get(start_state, algorithm, **options)
+    if hit is not None:
+        goal, stats = hit
+        print(f"  ⚡ Cache hit: {goal.depth} moves from {cache.filename}")
+        return (goal,) + stats
+
+    result = solver(start_state, **options)
+    if result[0] is not None:
+        cache.put(start_state, result[0], algorithm, stats=result[1:], **options)
+    return result
+
+
+if __name__ == "__main__":
+    import os
+    from astar import a_star
+    from bfs import bfs
+    from main import create_initial_state
+    from reconstruct import reconstruct_path
+
+    filename = "solution_cache_demo.db"
+    cache = SolutionCache(filename)
+    start_state = create_initial_state()
+
+    goals = {}
+    for solver in (bfs, a_star):
+        for attempt in ("cold", "warm"):
+            start_time = time.time()
+            goal, states, _, _ = solve_cached(cache, solver, start_state, max_states=500000)
+            goals[solver] = goal
+            print(f"  {solver.__name__} ({attempt}): {goal.depth} moves, {states:,} states, "
+                  f"{time.time() - start_time:.4f}s")
+
+    # A position 20 moves into the BFS path is answered without search; A*
+    # paths are not proven optimal, so they only answer their own start
+    path, _ = reconstruct_path(goals[bfs])
+    start_time = time.time()
+    middle, states, _, _ = solve_cached(cache, bfs, path[20], max_states=500000)
+    print(f"  bfs (suffix): {middle.depth} moves, {states:,} states, "
+          f"{time.time() - start_time:.4f}s")
+    path, _ = reconstruct_path(goals[a_star])
+    print(f"  a_star suffix cached: {cache.get(path[20], 'a_star') is not None}")
+
+    print(f"  cache: {cache.hits} hits, {cache.misses} misses, {cache.size():,} bytes")
+    cache.close()
+    os.remove(filename)
@@ -13,40 +13,279 @@ class Block:
         return f"Block({self.id}, r={self.row}, c={self.col}, {self.width}x{self.height})"
 
 
+# Move directions as (row delta, col delta), in the order successors are generated
+DIRECTIONS = {
+    "UP": (-1, 0),
+    "DOWN": (1, 0),
+    "LEFT": (0, -1),
+    "RIGHT": (0, 1)
+}
+
+
+class Layout:
+    """
+    Fixed part of a puzzle shared by all of its states: board size,
+    block ids and shapes, and precomputed bit masks for move generation.
+
+    A state is packed into a single integer holding, for every block,
+    the cell index (row * cols + col) of its top-left corner in a
+    fixed-width bit field. Block i lives at bits [i * bits, (i + 1) * bits).
+    """
+    __slots__ = ['rows', 'cols', 'ids', 'widths', 'heights', 'bits', 'field',
+                 'shifts', 'index', 'goal_cell', 'full_mask', 'cell_masks',
+                 'move_table', 'halo', 'groups', 'mirror_table', 'mirror_symmetric',
+                 'pattern_dbs']
+
+    def __init__(self, blocks, rows=5, cols=4, goal=(3, 1)):
+        self.rows = rows
+        self.cols = cols
+        self.ids = tuple(b.id for b in blocks)
+        self.widths = tuple(b.width for b in blocks)
+        self.heights = tuple(b.height for b in blocks)
+        self.bits = max(1, (rows * cols - 1).bit_length())
+        self.field = (1 << self.bits) - 1
+        self.shifts = tuple(i * self.bits for i in range(len(blocks)))
+        self.index = {block_id: i for i, block_id in enumerate(self.ids)}
+        self.goal_cell = goal[0] * cols + goal[1]
+        self.full_mask = (1 << (rows * cols)) - 1
+        self.pattern_dbs = []  # see pattern_db.use_pattern_dbs
+
+        # cell_masks[i][pos]: occupancy bits of block i with its corner at pos
+        # (None when the block would stick out of the board)
+        self.cell_masks = []
+        for w, h in zip(self.widths, self.heights):
+            masks = []
+            for pos in range(rows * cols):
+                r, c = divmod(pos, cols)
+                if r + h > rows or c + w > cols:
+                    masks.append(None)
+                    continue
+                mask = 0
+                for rr in range(r, r + h):
+                    for cc in range(c, c + w):
+                        mask |= 1 << (rr * cols + cc)
+                masks.append(mask)
+            self.cell_masks.append(masks)
+
+        # move_table[i][pos]: list of (dir_index, need_mask, key_delta) for
+        # every direction that keeps block i on the board. need_mask holds
+        # the cells the block newly covers; they must all be empty.
+        self.move_table = []
+        for i, masks in enumerate(self.cell_masks):
+            table = []
+            for pos, mask in enumerate(masks):
+                entries = []
+                if mask is not None:
+                    r, c = divmod(pos, cols)
+                    for d, (dr, dc) in enumerate(DIRECTIONS.values()):
+                        nr, nc = r + dr, c + dc
+                        if not (0 <= nr < rows and 0 <= nc < cols):
+                            continue
+                        new_mask = masks[nr * cols + nc]
+                        if new_mask is None:
+                            continue
+                        delta = (nr * cols + nc - pos) << self.shifts[i]
+                        entries.append((d, new_mask & ~mask, delta))
+                table.append(tuple(entries))
+            self.move_table.append(table)
+
+        # halo[i][pos]: every cell block i could step into from pos. A block
+        # whose halo holds no empty cell cannot move and is skipped outright.
+        self.halo = []
+        for table in self.move_table:
+            halo = []
+            for entries in table:
+                mask = 0
+                for _, need, _ in entries:
+                    mask |= need
+                halo.append(mask)
+            self.halo.append(halo)
+
+        # Blocks of identical shape are interchangeable, except the goal
+        # block which is always kept on its own so is_goal stays valid
+        red = self.index.get(1)
+        by_shape = {}
+        for i, shape in enumerate(zip(self.widths, self.heights)):
+            if i != red:
+                by_shape.setdefault(shape, []).append(i)
+        self.groups = [g for g in by_shape.values() if len(g) > 1]
+
+        # mirror_table[i][pos]: corner of block i after a left-right flip
+        self.mirror_table = []
+        for w, masks in zip(self.widths, self.cell_masks):
+            self.mirror_table.append(
+                [None if mask is None else pos - pos % cols + (cols - pos % cols - w)
+                 for pos, mask in enumerate(masks)])
+        goal_mirror = (None if red is None
+                       else self.mirror_table[red][self.goal_cell])
+        self.mirror_symmetric = goal_mirror == self.goal_cell
+
+    def positions(self, key):
+        """Unpack a key into the corner cell index of every block"""
+        field = self.field
+        return [(key >> s) & field for s in self.shifts]
+
+    def pack(self, positions):
+        """Pack corner cell indices (in block order) into a key"""
+        key = 0
+        for pos, s in zip(positions, self.shifts):
+            key |= pos << s
+        return key
+
+    def occupancy(self, key):
+        """Bit mask of all occupied cells"""
+        occ = 0
+        field = self.field
+        for masks, s in zip(self.cell_masks, self.shifts):
+            occ |= masks[(key >> s) & field]
+        return occ
+
+    def empty_cells(self, key):
+        """Bit mask of all empty cells"""
+        return self.full_mask & ~self.occupancy(key)
+
+    def canonical(self, key, mirror=False):
+        """
+        Canonical key of a configuration: blocks of the same shape are
+        sorted by position, so swapping them gives the same key. With
+        mirror=True the smaller of the key and its left-right mirror image
+        is returned (only valid when the goal is mirror symmetric).
+        """
+        positions = self.positions(key)
+        best = self._sorted_key(positions)
+        if mirror:
+            flipped = [table[pos] for table, pos in zip(self.mirror_table, positions)]
+            best = min(best, self._sorted_key(flipped))
+        return best
+
+    def _sorted_key(self, positions):
+        for group in self.groups:
+            for i, pos in zip(group, sorted(positions[i] for i in group)):
+                positions[i] = pos
+        return self.pack(positions)
+
+    def key_from_blocks(self, blocks):
+        """Pack a list of Block objects (any order) into a key"""
+        positions = [0] * len(self.ids)
+        for b in blocks:
+            positions[self.index[b.id]] = b.row * self.cols + b.col
+        return self.pack(positions)
+
+    def blocks_from_key(self, key):
+        """Rebuild Block objects for a key, in layout order"""
+        cols = self.cols
+        return [Block(block_id, pos // cols, pos % cols, w, h)
+                for block_id, pos, w, h in zip(self.ids, self.positions(key),
+                                               self.widths, self.heights)]
+
+    def board_from_key(self, key):
+        """Rebuild the rows x cols board matrix of block ids for a key"""
+        board = [[0] * self.cols for _ in range(self.rows)]
+        for b in self.blocks_from_key(key):
+            for r in range(b.row, b.row + b.height):
+                for c in range(b.col, b.col + b.width):
+                    board[r][c] = b.id
+        return board
+
+    def is_goal(self, key):
+        """Check if red block (id=1) is on the goal cell"""
+        i = self.index.get(1)
+        if i is None:
+            return False
+        return (key >> self.shifts[i]) & self.field == self.goal_cell
+
+    def heuristic(self, key):
+        """
+        Heuristic for A*: Manhattan distance + blocking penalty.
+        Lower is better - guides search toward goal.
+        If pattern databases are attached to the layout, their
+        (admissible) maximum is used instead.
+        """
+        if self.pattern_dbs:
+            return max(db.heuristic(key) for db in self.pattern_dbs)
+
+        red = self.index.get(1)
+        if red is None:
+            return float('inf')
+
+        cols = self.cols
+        positions = self.positions(key)
+        red_row, red_col = divmod(positions[red], cols)
+        red_bottom = red_row + self.heights[red]
+        red_right = red_col + self.widths[red]
+
+        # Goal: row 3, col 1
+        goal_row, goal_col = divmod(self.goal_cell, cols)
+
+        # Manhattan distance of red block to goal
+        distance = abs(red_row - goal_row) + abs(red_col - goal_col)
+
+        # Penalty for blocks blocking the path
+        blocking_penalty = 0
+        for i, pos in enumerate(positions):
+            if i != red:
+                row, col = divmod(pos, cols)
+                # Check if block is between red block and goal
+                if row >= red_bottom:
+                    if col < red_right and col + self.widths[i] > red_col:
+                        blocking_penalty += 1
+
+        return distance + blocking_penalty * 0.5
+
+
 class State:
-    """Represents a board state in the puzzle"""
-    __slots__ = ['board', 'blocks', 'parent', 'move', 'depth', '_hash']
+    """
+    Represents a board state in the puzzle.
+    The configuration is stored as a packed integer key (see Layout);
+    board and blocks are derived from it on demand.
+    """
+    __slots__ = ['layout', 'key', 'parent', 'move', 'depth']
     
-    def __init__(self, board, blocks, parent=None, move=None, depth=0):
-        self.board = board
-        self.blocks = blocks
+    def __init__(self, board, blocks, parent=None, move=None, depth=0, layout=None):
+        if layout is None:
+            layout = Layout(blocks, rows=len(board), cols=len(board[0]))
+        self.layout = layout
+        self.key = layout.key_from_blocks(blocks)
         self.parent = parent
         self.move = move
         self.depth = depth
-        self._hash = None  # Cache hash for efficiency
+
+    @classmethod
+    def from_key(cls, layout, key, parent=None, move=None, depth=0):
+        """Create a state directly from a packed key (no board building)"""
+        state = cls.__new__(cls)
+        state.layout = layout
+        state.key = key
+        state.parent = parent
+        state.move = move
+        state.depth = depth
+        return state
+
+    @property
+    def board(self):
+        return self.layout.board_from_key(self.key)
+
+    @property
+    def blocks(self):
+        return self.layout.blocks_from_key(self.key)
     
     def __eq__(self, other):
-        """States are equal if their boards are identical"""
+        """States are equal if their packed configurations are identical"""
         if not isinstance(other, State):
             return False
-        return self.board == other.board
+        return self.key == other.key
     
     def __hash__(self):
-        """Hash based on board configuration - cached for efficiency"""
-        if self._hash is None:
-            self._hash = hash(tuple(tuple(row) for row in self.board))
-        return self._hash
+        """Hash of the packed key - a plain int, so no caching needed"""
+        return hash(self.key)
     
     def copy(self):
-        """Create a deep copy of the state"""
-        new_board = [row[:] for row in self.board]
-        new_blocks = [Block(b.id, b.row, b.col, b.width, b.height) for b in self.blocks]
-        return State(new_board, new_blocks, self.parent, self.move, self.depth)
+        """Create a copy of the state (the key is immutable, so this is cheap)"""
+        return State.from_key(self.layout, self.key, self.parent, self.move, self.depth)
     
     def is_goal(self):
         """Check if red block (id=1) reached the goal: row 3, col 1"""
-        red_block = next((b for b in self.blocks if b.id == 1), None)
-        return red_block and red_block.row == 3 and red_block.col == 1
+        return self.layout.is_goal(self.key)
     
     def display(self):
         """Pretty print the board state"""
@@ -55,27 +294,6 @@ class State:
         print()
     
     def get_heuristic(self):
-        """
-        Heuristic for A*: Manhattan distance + blocking penalty.
-        Lower is better - guides search toward goal.
-        """
-        red_block = next((b for b in self.blocks if b.id == 1), None)
-        if not red_block:
-            return float('inf')
-        
-        # Goal: row 3, col 1
-        goal_row, goal_col = 3, 1
-        
-        # Manhattan distance of red block to goal
-        distance = abs(red_block.row - goal_row) + abs(red_block.col - goal_col)
-        
-        # Penalty for blocks blocking the path
-        blocking_penalty = 0
-        for b in self.blocks:
-            if b.id != 1:
-                # Check if block is between red block and goal
-                if b.row >= red_block.row + red_block.height:
-                    if b.col < red_block.col + red_block.width and b.col + b.width > red_block.col:
-                        blocking_penalty += 1
-        
-        return distance + blocking_penalty * 0.5
\ No newline at end of file
+        """Heuristic for A* (see Layout.heuristic)"""
+        return self.layout.heuristic(self.key)
+        
\ No newline at end of file
@@ -0,0 +1,120 @@
+import json
+import time
+
+from memory import peak_rss
+
+
+class SearchMetrics:
+    """
+    Telemetry collector for bfs() and a_star() (pass it as metrics=...).
+
+    The solvers call sample() every `sample_every` popped states and
+    finish() once at the end; between samples they do no extra work, so
+    the default collector costs the same as the old progress printing.
+
+    Options:
+      sample_every  states between samples (0 = only the final summary)
+      timing        wrap move generation, hashing and heuristic calls with
+                    timers (adds a perf_counter pair per call, so it is off
+                    by default)
+      memory        read the peak RSS at each sample and at the end
+      progress      print the "Progress: 1000...2000..." tokens
+      callback      called with every sample dict as it is recorded
+    """
+
+    def __init__(self, sample_every=1000, timing=False, memory=False, progress=True,
+                 callback=None):
+        self.sample_every = sample_every
+        self.timing = timing
+        self.memory = memory
+        self.progress = progress
+        self.callback = callback
+        self.algorithm = None
+        self.info = {}
+        self.samples = []
+        self.timings = {}
+        self.summary = {}
+        self.start_time = None
+
+    def next_sample(self, explored):
+        """Explored count at which the solver should call sample() next"""
+        if not self.sample_every:
+            return -1
+        return explored + self.sample_every
+
+    def start(self, algorithm, **info):
+        """Called by the solver before searching"""
+        self.algorithm = algorithm
+        self.info = info
+        self.samples = []
+        self.timings = {}
+        self.summary = {}
+        if self.progress:
+            print("  Progress: ", end="", flush=True)
+        self.start_time = time.perf_counter()
+
+    def timed(self, name, func):
+        """func itself, or a wrapper accumulating its run time under name if timing is on"""
+        if not self.timing:
+            return func
+        timings = self.timings
+        timings[name] = 0.0
+        perf_counter = time.perf_counter
+
+        def wrapper(*args):
+            begin = perf_counter()
+            result = func(*args)
+            timings[name] += perf_counter() - begin
+            return result
+        return wrapper
+
+    def sample(self, explored, frontier, closed, **extra):
+        """Record one sample: throughput, frontier and closed-set sizes"""
+        elapsed = time.perf_counter() - self.start_time
+        record = {
+            "time": round(elapsed, 4),
+            "explored": explored,
+            "nodes_per_sec": round(explored / elapsed) if elapsed > 0 else None,
+            "frontier": frontier,
+            "closed": closed,
+        }
+        record.update(extra)
+        if self.memory:
+            record["peak_rss"] = peak_rss()
+        self.samples.append(record)
+        if self.progress:
+            print(f"{explored}...", end="", flush=True)
+        if self.callback:
+            self.callback(record)
+
+    def finish(self, explored, solved, **summary):
+        """Called once by the solver with the final counters"""
+        elapsed = time.perf_counter() - self.start_time
+        if self.progress:
+            print(f"{explored} {'✓' if solved else '✗'}")
+        self.summary = {
+            "runtime": round(elapsed, 4),
+            "explored": explored,
+            "solved": solved,
+            "nodes_per_sec": round(explored / elapsed) if elapsed > 0 else None,
+        }
+        self.summary.update(summary)
+        if self.timing:
+            self.summary["timings"] = {name: round(t, 4) for name, t in self.timings.items()}
+        if self.memory:
+            self.summary["peak_rss"] = peak_rss()
+
+    def as_dict(self):
+        return {
+            "algorithm": self.algorithm,
+            "info": self.info,
+            "sample_every": self.sample_every,
+            "summary": self.summary,
+            "samples": self.samples,
+        }
+
+    def dump(self, filename):
+        """Write the collected metrics as JSON"""
+        with open(filename, "w") as f:
+            json.dump(self.as_dict(), f, indent=2)
+        print(f"✓ Exported to {filename}")
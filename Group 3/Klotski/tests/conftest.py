@@ -0,0 +1,35 @@
+import os
+import sys
+
+# The solvers are flat modules in the directory above
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from distance_db import DistanceDB, build_distance_db
+from main import create_initial_state
+
+
+@pytest.fixture(scope="session")
+def distance_db(tmp_path_factory):
+    """Distance table of the classic layout's piece set"""
+    filename = str(tmp_path_factory.mktemp("db") / "distances.db")
+    build_distance_db(create_initial_state().layout, filename)
+    db = DistanceDB(filename)
+    yield db
+    db.close()
+
+
+@pytest.fixture(scope="session")
+def pattern_dbs(tmp_path_factory):
+    """The preset pattern DBs of the classic layout (red, verticals)"""
+    from pattern_db import PatternDB, build_pattern_db, pattern_presets
+
+    layout = create_initial_state().layout
+    directory = tmp_path_factory.mktemp("pdb")
+    dbs = []
+    for name, pattern in pattern_presets(layout).items():
+        filename = str(directory / f"pdb_{name}.db")
+        build_pattern_db(layout, pattern, filename)
+        dbs.append(PatternDB(filename, layout))
+    return dbs
@@ -0,0 +1,29 @@
+import os
+
+from layout_file import load_layouts, state_from_spec
+from moves import get_neighbors
+from reconstruct import reconstruct_path
+
+KLOTSKI_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def benchmark_layout(name):
+    """Start state of a layout in benchmark_layouts.txt"""
+    specs = load_layouts(os.path.join(KLOTSKI_DIR, "benchmark_layouts.txt"))
+    return state_from_spec(next(spec for spec in specs if spec["name"] == name))
+
+
+def check_path(start_state, goal, metric="step"):
+    """
+    Assert that the path to goal starts at start_state, makes only legal
+    moves under metric and ends in a goal; returns its moves.
+    """
+    assert goal is not None
+    states, moves = reconstruct_path(goal)
+    assert states[0].key == start_state.key
+    assert len(moves) == len(states) - 1 == goal.depth
+    for state, following in zip(states, states[1:]):
+        assert any(n.key == following.key and n.move == following.move
+                   for n in get_neighbors(state, metric)), following.move
+    assert states[-1].is_goal()
+    return moves
@@ -0,0 +1,57 @@
+import pytest
+
+from astar import a_star, anytime_a_star
+from pattern_db import PatternDB, build_pattern_db, pattern_presets, use_pattern_dbs
+from solver_checks import benchmark_layout, check_path
+from telemetry import SearchMetrics
+
+
+@pytest.fixture(scope="module")
+def endgame(tmp_path_factory):
+    """endgame-10 (10 moves) with its preset pattern DBs attached"""
+    start_state = benchmark_layout("endgame-10")
+    layout = start_state.layout
+    directory = tmp_path_factory.mktemp("endgame_pdb")
+    dbs = []
+    for name, pattern in pattern_presets(layout).items():
+        filename = str(directory / f"pdb_{name}.db")
+        build_pattern_db(layout, pattern, filename)
+        dbs.append(PatternDB(filename, layout))
+    use_pattern_dbs(layout, dbs)
+    return start_state
+
+
+def test_a_star_path():
+    start_state = benchmark_layout("midgame-20")
+    goal, _, _, _ = a_star(start_state, max_states=100000)
+    assert len(check_path(start_state, goal)) == 20
+
+
+def test_anytime_improves_without_claiming_a_bound():
+    start_state = benchmark_layout("midgame-20")
+    reported = []
+    metrics = SearchMetrics(progress=False)
+    goal, _, _, _ = anytime_a_star(start_state, callback=reported.append, max_states=100000,
+                                   metrics=metrics)
+    costs = [result["moves"] for result in reported]
+    assert costs == sorted(set(costs), reverse=True)
+    assert len(check_path(start_state, goal)) == costs[-1]
+    assert all(result["bound"] is None and not result["optimal"] for result in reported)
+    assert metrics.summary["bound"] is None and not metrics.summary["optimal"]
+
+
+def test_anytime_proves_optimal_with_pattern_dbs(endgame):
+    metrics = SearchMetrics(progress=False)
+    goal, _, _, _ = anytime_a_star(endgame, callback=None, metrics=metrics)
+    assert len(check_path(endgame, goal)) == 10
+    assert metrics.summary["optimal"] and not metrics.summary["limit_reached"]
+
+
+@pytest.mark.parametrize("budget", [dict(max_states=132), dict(deadline=0)])
+def test_cut_short_search_does_not_claim_optimal(endgame, budget):
+    metrics = SearchMetrics(progress=False)
+    goal, _, _, _ = anytime_a_star(endgame, callback=None, metrics=metrics, **budget)
+    assert metrics.summary["limit_reached"] and not metrics.summary["optimal"]
+    if goal is not None:
+        # The bound must hold against the 10-move optimum
+        assert goal.depth > 10 and metrics.summary["bound"] >= goal.depth / 10
@@ -0,0 +1,36 @@
+import pytest
+
+from bfs import bfs
+from bidirectional import bidirectional_bfs, goal_states
+from main import create_initial_state
+from solver_checks import benchmark_layout, check_path
+from telemetry import SearchMetrics
+
+
+def test_canonical_goal_states_are_one_per_class():
+    layout = create_initial_state().layout
+    every = goal_states(layout)
+    canonical = goal_states(layout, canonical=True)
+    assert len(canonical) < len(every)
+    assert set(canonical) == {layout.canonical(key) for key in every}
+
+
+@pytest.mark.parametrize("canonical", [True, False])
+@pytest.mark.parametrize("name", ["endgame-10", "midgame-20"])
+def test_same_length_as_bfs(name, canonical):
+    start_state = benchmark_layout(name)
+    expected, _, _, _ = bfs(start_state, max_states=100000)
+    goal, _, _, _ = bidirectional_bfs(start_state, max_states=100000,
+                                      canonical=canonical, mirror=canonical)
+    assert len(check_path(start_state, goal)) == expected.depth
+
+
+def test_classic_layout_reports_through_metrics(capsys):
+    start_state = create_initial_state()
+    metrics = SearchMetrics(sample_every=0, progress=False)
+    goal, states_explored, _, _ = bidirectional_bfs(start_state, max_states=500000,
+                                                    metrics=metrics)
+    assert len(check_path(start_state, goal)) == 56
+    assert states_explored < 346558 // 10
+    assert metrics.summary["solved"] and metrics.summary["depth"] == 56
+    assert capsys.readouterr().out == ""
@@ -0,0 +1,31 @@
+import random
+
+from astar import a_star
+from bucket_astar import blocking_masks, bucket_a_star, doubled_heuristic
+from main import create_initial_state
+from moves import expand_key
+from solver_checks import benchmark_layout, check_path
+
+
+def test_doubled_heuristic_matches_layout():
+    start_state = create_initial_state()
+    layout = start_state.layout
+    masks = blocking_masks(layout)
+    key = start_state.key
+    rng = random.Random(0)
+    for _ in range(300):
+        assert doubled_heuristic(layout, masks, key) == 2 * layout.heuristic(key)
+        key = rng.choice(expand_key(layout, key))[0]
+
+
+def test_same_length_as_a_star():
+    start_state = benchmark_layout("midgame-20")
+    expected, _, _, _ = a_star(start_state, max_states=100000)
+    goal, _, _, _ = bucket_a_star(start_state, max_states=100000)
+    assert len(check_path(start_state, goal)) == expected.depth == 20
+
+
+def test_classic_layout():
+    start_state = create_initial_state()
+    goal, _, _, _ = bucket_a_star(start_state, max_states=500000)
+    assert len(check_path(start_state, goal)) == 56
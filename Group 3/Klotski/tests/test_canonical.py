@@ -0,0 +1,57 @@
+import pytest
+
+from astar import a_star
+from bfs import bfs
+from main import create_initial_state
+from moves import make_closed_key
+from solver_checks import benchmark_layout, check_path
+from state import Block, Layout, State
+
+
+def test_same_shape_swap_has_one_canonical_key():
+    layout = create_initial_state().layout
+    positions = layout.positions(create_initial_state().key)
+    a, b = layout.index[7], layout.index[8]  # the two singles
+    swapped = list(positions)
+    swapped[a], swapped[b] = positions[b], positions[a]
+    key, other = layout.pack(positions), layout.pack(swapped)
+    assert key != other
+    assert layout.canonical(key) == layout.canonical(other)
+
+
+def test_mirror_image_has_one_canonical_key():
+    layout = create_initial_state().layout
+    key = create_initial_state().key
+    flipped = layout.pack([table[pos] for table, pos in
+                           zip(layout.mirror_table, layout.positions(key))])
+    assert layout.canonical(key) != layout.canonical(flipped)
+    assert layout.canonical(key, mirror=True) == layout.canonical(flipped, mirror=True)
+
+
+def test_goal_block_is_never_merged():
+    layout = create_initial_state().layout
+    red = layout.index[1]
+    assert all(red not in group for group in layout.groups)
+
+
+def test_mirror_needs_symmetric_goal():
+    blocks = [Block(1, 0, 0, 2, 2), Block(2, 0, 2, 1, 1)]
+    board = [[1, 1, 2, 0], [1, 1, 0, 0], [0] * 4, [0] * 4, [0] * 4]
+    layout = State(board, blocks, layout=Layout(blocks, goal=(3, 0))).layout
+    assert not layout.mirror_symmetric
+    with pytest.raises(ValueError):
+        make_closed_key(layout, canonical=True, mirror=True)
+
+
+def test_canonical_bfs_state_count():
+    start_state = create_initial_state()
+    goal, states_explored, _, _ = bfs(start_state, max_states=500000, canonical=True, mirror=True)
+    assert len(check_path(start_state, goal)) == 56
+    assert states_explored == 25440
+
+
+@pytest.mark.parametrize("solver", [bfs, a_star])
+def test_canonical_search_keeps_id_accurate_moves(solver):
+    start_state = benchmark_layout("midgame-20")
+    goal, _, _, _ = solver(start_state, max_states=100000, canonical=True, mirror=True)
+    assert len(check_path(start_state, goal)) == 20
@@ -0,0 +1,37 @@
+import pytest
+
+from bfs import bfs
+from distance_db import db_solve
+from main import create_initial_state
+from moves import expand_key
+from solver_checks import check_path
+from state import Block, State
+
+
+def test_db_solve_finds_56_moves(distance_db):
+    start_state = create_initial_state()
+    assert distance_db.distance(start_state) == 56
+    goal, _, _, _ = db_solve(start_state, distance_db)
+    assert len(check_path(start_state, goal)) == 56
+
+
+def test_distances_are_consistent(distance_db):
+    # Along the BFS frontier every stored distance matches a real search,
+    # and neighbours differ by at most one
+    start_state = create_initial_state()
+    layout = start_state.layout
+    key = start_state.key
+    for _ in range(30):
+        here = distance_db.lookup(layout, key)
+        successors = [new_key for new_key, _, _ in expand_key(layout, key)]
+        assert all(abs(distance_db.lookup(layout, k) - here) <= 1 for k in successors)
+        key = successors[0]
+    goal, _, _, _ = bfs(State.from_key(layout, key), max_states=500000)
+    assert goal.depth == distance_db.lookup(layout, key)
+
+
+def test_rejects_another_layout(distance_db):
+    blocks = [Block(1, 0, 0, 2, 2), Block(2, 0, 2, 1, 1)]
+    board = [[1, 1, 2, 0], [1, 1, 0, 0], [0] * 4, [0] * 4, [0] * 4]
+    with pytest.raises(ValueError):
+        db_solve(State(board, blocks), distance_db)
@@ -0,0 +1,35 @@
+import os
+
+from bfs import bfs
+from external_bfs import external_bfs, read_keys, subtract, unique, write_keys
+from solver_checks import benchmark_layout, check_path
+from telemetry import SearchMetrics
+
+
+def test_key_files_round_trip(tmp_path, monkeypatch):
+    monkeypatch.setattr("external_bfs.CHUNK", 4)
+    filename = str(tmp_path / "keys.bin")
+    keys = list(range(0, 30, 3))
+    assert write_keys(filename, keys) == len(keys)
+    assert list(read_keys(filename)) == keys
+    assert list(unique([1, 1, 2, 5, 5, 5])) == [1, 2, 5]
+    assert list(subtract([1, 2, 5, 7], iter([2, 3, 7]))) == [1, 5]
+
+
+def test_same_as_bfs(tmp_path):
+    start_state = benchmark_layout("midgame-20")
+    expected, _, _, _ = bfs(start_state, max_states=100000)
+    metrics = SearchMetrics(progress=False)
+    goal, _, _, _ = external_bfs(start_state, max_states=100000, work_dir=str(tmp_path),
+                                 buffer_size=1000, metrics=metrics)
+    assert len(check_path(start_state, goal)) == expected.depth == 20
+    assert len(metrics.summary["layer_sizes"]) >= 20
+    # Run files are merged away; a caller's work_dir keeps the layers
+    assert all(name.startswith("layer_") for name in os.listdir(tmp_path))
+
+
+def test_canonical_slide_search(tmp_path):
+    start_state = benchmark_layout("midgame-20")
+    goal, _, _, _ = external_bfs(start_state, max_states=100000, canonical=True, mirror=True,
+                                 metric="slide", work_dir=str(tmp_path))
+    assert len(check_path(start_state, goal, metric="slide")) == 13
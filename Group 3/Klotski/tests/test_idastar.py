@@ -0,0 +1,28 @@
+from idastar import ida_star
+from solver_checks import benchmark_layout, check_path
+from telemetry import SearchMetrics
+
+
+def test_finds_optimal_path():
+    start_state = benchmark_layout("midgame-20")
+    goal, _, _, _ = ida_star(start_state, max_states=1000000, tt_size=100000)
+    assert len(check_path(start_state, goal)) == 20
+
+
+def test_reports_through_metrics(capsys):
+    start_state = benchmark_layout("midgame-20")
+    metrics = SearchMetrics(sample_every=100, progress=False)
+    goal, states_explored, _, _ = ida_star(start_state, max_states=1000000, tt_size=100000,
+                                           metrics=metrics)
+    assert goal.depth == 20
+    assert metrics.summary["solved"] and metrics.summary["depth"] == 20
+    assert metrics.summary["explored"] == states_explored
+    assert metrics.samples
+    assert capsys.readouterr().out == ""
+
+
+def test_limit_is_reported():
+    metrics = SearchMetrics(progress=False)
+    goal, _, _, _ = ida_star(benchmark_layout("midgame-20"), max_states=50, metrics=metrics)
+    assert goal is None
+    assert metrics.summary["limit_reached"] and not metrics.summary["solved"]
@@ -0,0 +1,28 @@
+import pytest
+
+from bfs import bfs
+from main import create_initial_state
+from moves import expand_key, get_expander
+from solver_checks import benchmark_layout, check_path
+
+
+def test_every_step_is_a_slide():
+    start_state = create_initial_state()
+    layout = start_state.layout
+    keys = [start_state.key]
+    for key in keys[:200]:
+        steps = {new_key for new_key, _, _ in expand_key(layout, key)}
+        slides = {new_key for new_key, _, _ in get_expander("slide")(layout, key)}
+        assert steps <= slides
+        keys.extend(steps)
+
+
+def test_slide_metric_path():
+    start_state = benchmark_layout("midgame-20")
+    goal, _, _, _ = bfs(start_state, max_states=100000, metric="slide")
+    assert len(check_path(start_state, goal, metric="slide")) == 13
+
+
+def test_unknown_metric():
+    with pytest.raises(ValueError):
+        get_expander("jump")
@@ -0,0 +1,31 @@
+import pytest
+
+pytest.importorskip("numpy")
+
+from bfs import bfs
+from main import create_initial_state
+from numpy_bfs import numpy_bfs
+from solver_checks import benchmark_layout, check_path
+
+
+@pytest.mark.parametrize("canonical", [False, True])
+@pytest.mark.parametrize("name", ["endgame-10", "midgame-20"])
+def test_same_result_as_bfs(name, canonical):
+    start_state = benchmark_layout(name)
+    options = dict(max_states=100000, canonical=canonical, mirror=canonical)
+    goal, states, space, _ = numpy_bfs(start_state, **options)
+    expected, expected_states, expected_space, _ = bfs(start_state, **options)
+    assert check_path(start_state, goal) == check_path(start_state, expected)
+    assert (states, space) == (expected_states, expected_space)
+
+
+def test_classic_layout():
+    start_state = create_initial_state()
+    goal, states, _, _ = numpy_bfs(start_state, max_states=500000, canonical=True, mirror=True)
+    assert len(check_path(start_state, goal)) == 56
+    assert states == 25440
+
+
+def test_slide_metric_rejected():
+    with pytest.raises(ValueError):
+        numpy_bfs(benchmark_layout("midgame-20"), metric="slide")
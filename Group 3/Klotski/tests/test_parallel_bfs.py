@@ -0,0 +1,39 @@
+import multiprocessing as mp
+
+from bfs import bfs
+from parallel_bfs import parallel_bfs
+from solver_checks import benchmark_layout, check_path
+from telemetry import SearchMetrics
+
+
+def test_same_length_as_bfs():
+    start_state = benchmark_layout("midgame-20")
+    goal, _, _, _ = parallel_bfs(start_state, max_states=100000, workers=2)
+    assert len(check_path(start_state, goal)) == 20
+
+
+def test_canonical_slide_search():
+    start_state = benchmark_layout("midgame-20")
+    expected, _, _, _ = bfs(start_state, max_states=100000, canonical=True, mirror=True,
+                            metric="slide")
+    goal, _, _, _ = parallel_bfs(start_state, max_states=100000, workers=2, canonical=True,
+                                 mirror=True, metric="slide")
+    assert len(check_path(start_state, goal, metric="slide")) == expected.depth
+
+
+def test_reports_through_metrics(capsys):
+    metrics = SearchMetrics(sample_every=10, progress=False)
+    goal, states_explored, _, _ = parallel_bfs(benchmark_layout("midgame-20"),
+                                               max_states=100000, workers=2, metrics=metrics)
+    assert metrics.summary["solved"] and metrics.summary["depth"] == goal.depth == 20
+    assert metrics.summary["explored"] == states_explored
+    assert metrics.samples
+    assert capsys.readouterr().out == ""
+
+
+def test_limit_stops_the_workers():
+    metrics = SearchMetrics(progress=False)
+    goal, _, _, _ = parallel_bfs(benchmark_layout("midgame-20"), max_states=50, workers=2,
+                                 metrics=metrics)
+    assert goal is None and metrics.summary["limit_reached"]
+    assert not mp.active_children()
@@ -0,0 +1,32 @@
+from astar import a_star
+from main import create_initial_state
+from moves import expand_key
+from pattern_db import use_pattern_dbs
+from solver_checks import check_path
+
+
+def test_pattern_dbs_are_admissible(distance_db, pattern_dbs):
+    # Never above the true distance, over every reachable configuration
+    for db in pattern_dbs:
+        for key, distance in distance_db.items():
+            assert db.heuristic(key) <= distance
+
+
+def test_pattern_dbs_are_consistent(distance_db, pattern_dbs):
+    layout = create_initial_state().layout
+    for db in pattern_dbs:
+        for key, _ in list(distance_db.items())[::50]:
+            h = db.heuristic(key)
+            for new_key, _, _ in expand_key(layout, key):
+                assert h <= db.heuristic(new_key) + 1
+
+
+def test_astar_with_pattern_dbs_finds_56_moves(pattern_dbs):
+    start_state = create_initial_state()
+    use_pattern_dbs(start_state.layout, pattern_dbs)
+    try:
+        goal, states_explored, _, _ = a_star(start_state, max_states=500000)
+    finally:
+        use_pattern_dbs(start_state.layout, [])
+    assert len(check_path(start_state, goal)) == 56
+    assert states_explored < 245857
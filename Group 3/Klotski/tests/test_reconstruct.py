@@ -0,0 +1,43 @@
+from astar import a_star
+from bfs import ClosedLayers, bfs
+from moves import START, encode_move, expand_key
+from reconstruct import rebuild_goal
+from solver_checks import benchmark_layout, check_path
+
+
+def test_closed_layers_lookup_after_freeze():
+    closed = ClosedLayers("B")
+    closed.add({10: START})
+    closed.add({30: 1, 20: 2})
+    closed.add({40: 3})
+    closed.freeze(1)
+    assert isinstance(closed.layers[1], tuple)
+    assert closed[20] == 2 and closed[30] == 1 and closed[40] == 3
+    assert closed.find(1, 40) is None
+    closed.freeze(0)  # the start layer stays a dict
+    assert closed[10] == START
+
+
+def test_rebuild_goal_follows_move_codes():
+    start_state = benchmark_layout("midgame-20")
+    layout = start_state.layout
+    came_from = {start_state.key: START}
+    key = start_state.key
+    for _ in range(5):
+        new_key, i, d = next((n for n in expand_key(layout, key) if n[0] not in came_from))
+        came_from[new_key] = encode_move(layout, i, d)
+        key = new_key
+    goal = rebuild_goal(layout, came_from, key)
+    assert goal.key == key and goal.depth == 5
+    node = goal
+    while node.parent is not None:
+        assert came_from[node.key] != START
+        node = node.parent
+    assert node.key == start_state.key
+
+
+def test_solver_paths_are_legal():
+    start_state = benchmark_layout("midgame-20")
+    for solve in (bfs, a_star):
+        goal, _, _, _ = solve(start_state, max_states=100000)
+        assert len(check_path(start_state, goal)) == 20
@@ -0,0 +1,28 @@
+import multiprocessing as mp
+
+import runner
+from runner import run_solvers
+from solver_checks import benchmark_layout, check_path
+
+
+def test_solvers_report_legal_paths():
+    start_state = benchmark_layout("midgame-20")
+    records = {r["name"]: r for r in run_solvers(start_state, ["BFS", "A*", "BiBFS"])}
+    assert set(records) == {"BFS", "A*", "BiBFS"}
+    for record in records.values():
+        assert record["status"] == "solved"
+        assert len(check_path(start_state, record["goal"])) == 20
+    assert not mp.active_children()
+
+
+def test_time_budget_stops_workers():
+    records = list(run_solvers(benchmark_layout("start"), ["BFS", "A*"], time_budget=0))
+    assert sorted(r["status"] for r in records) == ["timeout", "timeout"]
+    assert not mp.active_children()
+
+
+def test_memory_budget_without_proc_warns(monkeypatch, capsys):
+    monkeypatch.setattr(runner, "rss_of", lambda pid: None)
+    records = list(run_solvers(benchmark_layout("midgame-20"), ["BFS"], memory_budget=1))
+    assert "not enforced" in capsys.readouterr().out
+    assert records[0]["status"] == "solved"
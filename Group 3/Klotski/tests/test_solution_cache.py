@@ -0,0 +1,56 @@
+import pytest
+
+from bfs import bfs
+from reconstruct import reconstruct_path
+from solution_cache import SolutionCache, proves_optimal
+from solver_checks import benchmark_layout, check_path
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = SolutionCache(str(tmp_path / "cache.db"))
+    yield cache
+    cache.close()
+
+
+def test_proves_optimal_needs_pdbs_and_steps():
+    layout = benchmark_layout("midgame-20").layout
+    assert proves_optimal("bfs", layout, "slide")
+    assert not proves_optimal("a_star", layout)
+    layout.pattern_dbs = [object()]
+    assert proves_optimal("a_star", layout, "step")
+    assert not proves_optimal("a_star", layout, "slide")
+    assert not proves_optimal("anytime_a_star", layout)
+
+
+def test_slide_a_star_path_answers_only_its_start(cache):
+    start_state = benchmark_layout("midgame-20")
+    goal, _, _, _ = bfs(start_state, max_states=100000, metric="slide")
+    start_state.layout.pattern_dbs = [object()]
+    cache.put(start_state, goal, "a_star", metric="slide")
+    states, _ = reconstruct_path(goal)
+    hit, _ = cache.get(start_state, "a_star", metric="slide")
+    assert len(check_path(start_state, hit, metric="slide")) == goal.depth
+    assert cache.get(states[3], "a_star", metric="slide") is None
+
+
+@pytest.mark.parametrize("evicted", ["first", "second"])
+def test_eviction_keeps_positions_of_other_entries(cache, evicted):
+    start_state = benchmark_layout("midgame-20")
+    goal, _, _, _ = bfs(start_state, max_states=100000)
+    cache.put(start_state, goal, "bfs")
+    states, _ = reconstruct_path(goal)
+    middle = states[5]
+    middle_goal, _, _, _ = bfs(middle, max_states=100000)
+    cache.put(middle, middle_goal, "bfs")
+
+    # Both paths pass through the positions from middle on; touch the
+    # entry to keep so the other one is the least recently used
+    kept = middle if evicted == "first" else start_state
+    assert cache.get(kept, "bfs") is not None
+    cache.max_bytes = cache.size() - 1
+    cache.evict()
+    assert (cache.get(start_state, "bfs") is None) == (evicted == "first")
+    for state in (middle, states[10]):
+        hit, _ = cache.get(state, "bfs")
+        assert len(check_path(state, hit)) == goal.depth - state.depth
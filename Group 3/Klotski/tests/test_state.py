@@ -0,0 +1,31 @@
+from bfs import bfs
+from main import create_initial_state
+from moves import get_neighbors
+from solver_checks import check_path
+from state import State
+
+
+def test_key_round_trip():
+    start_state = create_initial_state()
+    layout = start_state.layout
+    key = start_state.key
+    assert layout.pack(layout.positions(key)) == key
+    assert layout.board_from_key(key) == start_state.board
+    assert layout.key_from_blocks(layout.blocks_from_key(key)) == key
+    again = State.from_key(layout, key)
+    assert again.board == start_state.board
+
+
+def test_neighbors_keep_the_board_consistent():
+    start_state = create_initial_state()
+    for neighbor in get_neighbors(start_state):
+        cells = [cell for row in neighbor.board for cell in row if cell]
+        assert len(cells) == sum(b.width * b.height for b in neighbor.blocks)
+        assert State(neighbor.board, neighbor.blocks).key == neighbor.key
+
+
+def test_bfs_finds_56_moves():
+    start_state = create_initial_state()
+    goal, states_explored, _, _ = bfs(start_state, max_states=500000)
+    assert len(check_path(start_state, goal)) == 56
+    assert states_explored == 346558
@@ -0,0 +1,165 @@
+#code3_ColumnWise
+import time
+
+
+def parse_puzzle(puzzle):
+    """
+    "SEND + MORE = MONEY" -> (["SEND", "MORE"], "MONEY"). Any number of
+    addends; at most 10 distinct letters.
+    """
+    if puzzle.count("=") != 1:
+        raise ValueError("puzzle must look like WORD + WORD + ... = WORD")
+    left, result = puzzle.upper().split("=")
+    addends = [word.strip() for word in left.split("+")]
+    result = result.strip()
+    for word in addends + [result]:
+        if not word.isalpha():
+            raise ValueError(f"not a word: {word!r}")
+    if len(set("".join(addends) + result)) > 10:
+        raise ValueError("more than 10 distinct letters")
+    return addends, result
+
+
+def solve_cryptarithm(puzzle):
+    """
+    All solutions of a word addition, as a list of {letter: digit} dicts.
+
+    Columns are solved from the least significant digit with the carry
+    threaded through: the addend letters of a column are tried digit by
+    digit, after which the column's sum fixes the result letter (a clash
+    with an earlier assignment, a used digit or a leading zero cuts the
+    branch right there) and the carry into the next column. The last
+    column must leave no carry.
+    """
+    addends, result = parse_puzzle(puzzle)
+    if max(len(word) for word in addends) > len(result):
+        return []
+
+    leading = {word[0] for word in addends + [result] if len(word) > 1}
+    columns = []  # (addend letters, result letter), least significant first
+    for col in range(1, len(result) + 1):
+        columns.append(([word[-col] for word in addends if len(word) >= col], result[-col]))
+
+    order = []  # letters by first appearance, for the solution dicts
+    for letters, letter in columns:
+        for l in letters + [letter]:
+            if l not in order:
+                order.append(l)
+
+    assignment = {}
+    used = [False] * 10
+    solutions = []
+
+    def assign(letter, digit):
+        assignment[letter] = digit
+        used[digit] = True
+
+    def unassign(letter):
+        used[assignment.pop(letter)] = False
+
+    def search(col, k, total):
+        letters, letter = columns[col]
+        if k < len(letters):
+            # Next addend letter of this column
+            l = letters[k]
+            if l in assignment:
+                search(col, k + 1, total + assignment[l])
+                return
+            for digit in range(1 if l in leading else 0, 10):
+                if not used[digit]:
+                    assign(l, digit)
+                    search(col, k + 1, total + digit)
+                    unassign(l)
+            return
+
+        # Column decided: the result letter and the carry follow
+        digit, carry = total % 10, total // 10
+        if letter in assignment:
+            if assignment[letter] != digit:
+                return
+            new = False
+        elif used[digit] or (digit == 0 and letter in leading):
+            return
+        else:
+            assign(letter, digit)
+            new = True
+
+        if col + 1 < len(columns):
+            search(col + 1, 0, carry)
+        elif carry == 0:
+            solutions.append({l: assignment[l] for l in order})
+
+        if new:
+            unassign(letter)
+
+    search(0, 0, 0)
+    return solutions
+
+
+def word_value(word, solution):
+    value = 0
+    for letter in word:
+        value = value * 10 + solution[letter]
+    return value
+
+
+def check_solution(puzzle, solution):
+    """True when solution makes the addition hold"""
+    addends, result = parse_puzzle(puzzle)
+    return sum(word_value(word, solution) for word in addends) == word_value(result, solution)
+
+
+PUZZLES = [
+    "SEND + MORE = MONEY",
+    "TWO + TWO = FOUR",
+    "BASE + BALL = GAMES",
+    "CROSS + ROADS = DANGER",
+    "DONALD + GERALD = ROBERT",
+    "EAT + THAT = APPLE",
+    "SIX + SEVEN + SEVEN = TWENTY",
+    "THIS + IS + TOO = HARD",
+    "NO + NO + TOO = LATE",
+    "ODD + ODD = EVEN",
+]
+
+
+if __name__ == "__main__":
+    import contextlib
+    import importlib
+    import io
+
+    # The existing solvers run SEND + MORE = MONEY on import; import them quietly
+    with contextlib.redirect_stdout(io.StringIO()):
+        brute = importlib.import_module("code1_BruteForce")
+        backtrack = importlib.import_module("code2_BackTracking")
+
+    print(f"  {'Puzzle':<30} {'Solutions':<10} {'Time (s)':<10}")
+    for puzzle in PUZZLES:
+        start_time = time.time()
+        solutions = solve_cryptarithm(puzzle)
+        runtime = time.time() - start_time
+        assert all(check_solution(puzzle, s) for s in solutions), puzzle
+        print(f"  {puzzle:<30} {len(solutions):<10} {runtime:<10.4f}")
+
+    puzzle = "SEND + MORE = MONEY"
+    print(f"\n  {puzzle}, all three solvers:")
+    for name, solve in (("code1 brute_force", brute.brute_force),
+                        ("code2 backtracking", backtrack.backtracking),
+                        ("code3 column-wise", lambda: solve_cryptarithm(puzzle))):
+        if solve is backtrack.backtracking:
+            # Fresh module state: backtracking() keeps its assignment in globals
+            backtrack.assignment.clear()
+            backtrack.used_digits[:] = [False] * 10
+        output = io.StringIO()
+        start_time = time.time()
+        with contextlib.redirect_stdout(output):
+            solutions = solve()
+        runtime = time.time() - start_time
+        if solve is brute.brute_force:
+            solved = "Brute Force Solution:" in output.getvalue()
+        elif solve is backtrack.backtracking:
+            solved = (len(backtrack.assignment) == 8
+                      and check_solution(puzzle, backtrack.assignment))
+        else:
+            solved = len(solutions) == 1
+        print(f"  {name:<20} {runtime:.4f}s  {'solved' if solved else 'no solution found'}")
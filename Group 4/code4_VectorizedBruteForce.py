@@ -0,0 +1,128 @@
+#code4_VectorizedBruteForce
+import multiprocessing as mp
+import time
+from itertools import permutations
+
+import numpy as np
+
+from code3_ColumnWise import parse_puzzle
+
+_puzzle = {}  # per worker: letters, coefficients, leading mask, suffix index table
+
+
+def coefficients(puzzle):
+    """
+    Reduce a word addition to a linear equation: returns (letters, coef,
+    leading) where the puzzle holds exactly when digits @ coef == 0, coef
+    being the place values a letter has in the addends minus those it has
+    in the result; leading marks letters that may not be zero.
+    """
+    addends, result = parse_puzzle(puzzle)
+    letters = []
+    for word in addends + [result]:
+        for letter in word:
+            if letter not in letters:
+                letters.append(letter)
+    coef = np.zeros(len(letters), dtype=np.int64)
+    for word, sign in [(word, 1) for word in addends] + [(result, -1)]:
+        for place, letter in enumerate(reversed(word)):
+            coef[letters.index(letter)] += sign * 10**place
+    leading = np.array([any(len(w) > 1 and w[0] == letter for w in addends + [result])
+                        for letter in letters])
+    return letters, coef, leading
+
+
+def prefixes(n_letters, prefix_length):
+    """Work units: every assignment of distinct digits to the first letters"""
+    return list(permutations(range(10), min(prefix_length, n_letters)))
+
+
+def init_worker(puzzle, prefix_length):
+    """
+    Pool initializer: the puzzle's coefficient vector and the table of
+    suffix permutations as indices into the digits a prefix leaves free.
+    The same table serves every prefix.
+    """
+    letters, coef, leading = coefficients(puzzle)
+    prefix_length = min(prefix_length, len(letters))
+    _puzzle.update(letters=letters, coef=coef, leading=leading, prefix_length=prefix_length)
+    suffix = len(letters) - prefix_length
+    _puzzle["index"] = np.array(list(permutations(range(10 - prefix_length), suffix)),
+                                dtype=np.int64).reshape(-1, suffix)
+
+
+def check_prefix(prefix):
+    """
+    Check every permutation starting with `prefix` as one NumPy block:
+    one matrix-vector product gives each candidate's coefficient sum.
+    Returns (solutions, permutations checked).
+    """
+    coef = _puzzle["coef"]
+    k = _puzzle["prefix_length"]
+    free = np.array([d for d in range(10) if d not in prefix], dtype=np.int64)
+    block = np.empty((len(_puzzle["index"]), len(coef)), dtype=np.int64)
+    block[:, :k] = prefix
+    block[:, k:] = free[_puzzle["index"]]
+
+    ok = block @ coef == 0
+    ok &= ~(block[:, _puzzle["leading"]] == 0).any(axis=1)
+    solutions = [dict(zip(_puzzle["letters"], row.tolist())) for row in block[ok]]
+    return solutions, len(block)
+
+
+def vectorized_brute_force(puzzle, workers=None, prefix_length=2):
+    """
+    Exhaustive search over every assignment of distinct digits, for
+    validating other solvers. The permutation space is split by the digits
+    of the first prefix_length letters (90 units for 2); each unit is
+    checked in a single NumPy block, and units are spread over a process
+    pool (workers=1 runs in this process). Returns (solutions, checked,
+    seconds); checked counts every permutation, leading zeros included.
+    """
+    letters, _, _ = coefficients(puzzle)
+    units = prefixes(len(letters), prefix_length)
+    workers = workers or mp.cpu_count()
+
+    start_time = time.time()
+    if workers == 1:
+        init_worker(puzzle, prefix_length)
+        results = list(map(check_prefix, units))
+    else:
+        with mp.Pool(workers, initializer=init_worker, initargs=(puzzle, prefix_length)) as pool:
+            results = pool.map(check_prefix, units)
+    runtime = time.time() - start_time
+
+    solutions = [s for found, _ in results for s in found]
+    checked = sum(count for _, count in results)
+    return solutions, checked, runtime
+
+
+if __name__ == "__main__":
+    import contextlib
+    import importlib
+    import io
+    from code3_ColumnWise import PUZZLES, solve_cryptarithm
+
+    def key(solutions):
+        return sorted(tuple(sorted(s.items())) for s in solutions)
+
+    print(f"  {'Puzzle':<30} {'Solutions':<10} {'Checked':<12} {'Time (s)':<10} "
+          f"{'Perms/s':<12} {'Matches code3':<13}")
+    for puzzle in PUZZLES:
+        solutions, checked, runtime = vectorized_brute_force(puzzle)
+        same = key(solutions) == key(solve_cryptarithm(puzzle))
+        print(f"  {puzzle:<30} {len(solutions):<10} {checked:<12,} {runtime:<10.3f} "
+              f"{checked / runtime:<12,.0f} {same!s:<13}")
+
+    # The original loop: permutations(10, 8) = 1,814,400 for SEND + MORE = MONEY
+    with contextlib.redirect_stdout(io.StringIO()):
+        brute = importlib.import_module("code1_BruteForce")
+        start_time = time.time()
+        brute.brute_force()
+        runtime = time.time() - start_time
+    print(f"\n  code1 brute_force on SEND + MORE = MONEY: {runtime:.2f}s "
+          f"(stops at the first solution)")
+    for workers in sorted({1, mp.cpu_count()}):
+        _, checked, runtime = vectorized_brute_force("SEND + MORE = MONEY", workers=workers)
+        print(f"  vectorized, {workers} worker(s): {runtime:.3f}s for all {checked:,} "
+              f"permutations ({checked / runtime:,.0f}/s)")